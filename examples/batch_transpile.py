@@ -0,0 +1,139 @@
+import os
+import sys
+import json
+import time
+from urllib.parse import quote
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from omni_python_sdk import OmniAPI, ModelCatalog
+
+# Example of publishing warehouse DDL for every topic of every model in one run.
+# Topics are fetched concurrently, then validated and transpiled across a process
+# pool so the pydantic models and transpiler modules are imported once per worker
+# rather than once per topic.
+# This example assumes you have a valid API key and base URL for the OmniAPI defined in your .env file
+#
+# Output layout:
+#   <output_dir>/<model_id>/<topic_name>.<target>.sql
+#   <output_dir>/manifest.json
+# with model ids and topic names percent-encoded, so a "/" in a topic name cannot
+# leave the model's directory.
+
+TARGETS = ("snowflake", "databricks")
+
+def topic_names(client: OmniAPI, model_id: str) -> List[str]:
+    """
+    List the topics of a model from the `.topic` files of its YAML.
+    """
+    response = client.yamlr(model_id, {})
+    if response is None:
+        return []
+    return sorted(file_name[:-len(".topic")] for file_name in response.get("files", {}) if file_name.endswith(".topic"))
+
+def fetch_topics(client: OmniAPI, model_ids: List[str], max_workers: int = 16) -> List[Tuple[str, str, Optional[dict], float]]:
+    """
+    Fetch every topic of every model concurrently.
+    Returns:
+        (model_id, topic_name, topic_json, fetch_seconds) tuples; topic_json is None if the fetch failed.
+    """
+    def fetch(key):
+        model_id, topic_name = key
+        start = time.perf_counter()
+        response = client.get_topic(model_id=model_id, topic_name=topic_name)
+        return model_id, topic_name, response, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        keys = [(model_id, name) for model_id, names in zip(model_ids, executor.map(lambda model_id: topic_names(client, model_id), model_ids)) for name in names]
+        return list(executor.map(fetch, keys))
+
+def path_component(name: str) -> str:
+    # percent-encode "/" (and "." and ".." themselves) so the name is a single file name
+    quoted = quote(name, safe="")
+    return quoted if quoted.strip(".") else quoted.replace(".", "%2E")
+
+def output_path(model_id: str, topic_name: str, target: str) -> str:
+    """
+    The DDL file of a topic, relative to the output directory.
+    """
+    return os.path.join(path_component(model_id), f"{path_component(topic_name)}.{target}.sql")
+
+def transpile_topic(topic_json: dict, target: str, default_catalog: Optional[str] = None, default_schema: Optional[str] = None) -> Dict:
+    """
+    Validate a topic and transpile it to DDL for a target. Runs in a worker process.
+    Returns:
+        dict: ddl, validate_seconds, transpile_seconds and error (None on success).
+    """
+    from examples.topic import Topic
+
+    result = {"ddl": None, "validate_seconds": 0.0, "transpile_seconds": 0.0, "error": None}
+    try:
+        start = time.perf_counter()
+        topic = Topic.model_validate(topic_json)
+        result["validate_seconds"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if target == "snowflake":
+            from examples.snowflake_semantic_view import sematic_view_from_topic
+            result["ddl"] = sematic_view_from_topic(topic).generate_sql()
+        else:
+            from examples.databricks_metric_view import metric_view_from_topic
+            result["ddl"] = metric_view_from_topic(topic, default_catalog, default_schema).generate_sql()
+        result["transpile_seconds"] = time.perf_counter() - start
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+def batch_transpile(client: OmniAPI, output_dir: str, target: str, model_ids: Optional[List[str]] = None, default_catalog: Optional[str] = None, default_schema: Optional[str] = None, max_workers: Optional[int] = None) -> List[dict]:
+    """
+    Transpile every topic of the given models (all shared models by default) and write
+    one DDL file per topic plus a manifest with per-topic timing.
+    Returns:
+        List[dict]: The manifest entries.
+    """
+    if model_ids is None:
+        model_ids = [model["id"] for model in ModelCatalog(client, modelKind="SHARED")]
+    topics = fetch_topics(client, model_ids)
+
+    manifest = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(transpile_topic, topic_json, target, default_catalog, default_schema) if topic_json is not None else None
+            for _, _, topic_json, _ in topics
+        ]
+        for (model_id, topic_name, _, fetch_seconds), future in zip(topics, futures):
+            entry = {"model_id": model_id, "topic": topic_name, "target": target, "path": None, "fetch_seconds": fetch_seconds}
+            if future is None:
+                entry.update({"validate_seconds": 0.0, "transpile_seconds": 0.0, "error": "could not fetch topic"})
+            else:
+                result = future.result()
+                ddl = result.pop("ddl")
+                entry.update(result)
+                if ddl is not None:
+                    entry["path"] = output_path(model_id, topic_name, target)
+                    os.makedirs(os.path.join(output_dir, os.path.dirname(entry["path"])), exist_ok=True)
+                    with open(os.path.join(output_dir, entry["path"]), "w", encoding="utf-8") as f:
+                        f.write(ddl)
+            manifest.append(entry)
+
+    with open(os.path.join(output_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def print_report(manifest: List[dict]) -> None:
+    print(f"{'model_id':<38} {'topic':<30} {'fetch':>8} {'validate':>9} {'transpile':>10}  status")
+    for entry in manifest:
+        status = entry["error"] or entry["path"]
+        print(f"{entry['model_id']:<38} {entry['topic']:<30} {entry['fetch_seconds']:8.3f} {entry['validate_seconds']:9.3f} {entry['transpile_seconds']:10.3f}  {status}")
+
+if __name__ == "__main__":
+    num_args = len(sys.argv)
+    if num_args < 3 or sys.argv[2] not in TARGETS:
+        print("Usage: python batch_transpile.py <output_dir> <snowflake|databricks> [default_catalog] [default_schema]")
+        sys.exit(1)
+
+    output_dir = sys.argv[1]
+    target = sys.argv[2]
+    default_catalog = sys.argv[3] if num_args > 3 else None
+    default_schema = sys.argv[4] if num_args > 4 else None
+    os.makedirs(output_dir, exist_ok=True)
+    print_report(batch_transpile(OmniAPI(), output_dir, target, default_catalog=default_catalog, default_schema=default_schema))
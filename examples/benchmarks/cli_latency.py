@@ -0,0 +1,87 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Benchmark of `omni-sdk` command latency, run in a fresh process per command versus
+# forwarded to a warm daemon, against a local SCIM stub. Every new connection is delayed
+# to stand in for the TCP and TLS handshakes to a remote Omni instance.
+#
+# Usage: python -m examples.benchmarks.cli_latency [connect_delay_ms] [runs]
+
+GROUPS = {
+    "Resources": [{"id": f"group-{i}", "displayName": f"Group {i}", "members": []} for i in range(50)],
+    "totalResults": 50,
+    "itemsPerPage": 100,
+    "startIndex": 1,
+}
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connect_delay = 0.0
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        time.sleep(self.connect_delay)
+        super().setup()
+
+    def _reply(self, body: bytes):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return body
+
+    def do_HEAD(self):
+        self._reply(b"")
+
+    def do_GET(self):
+        self.wfile.write(self._reply(json.dumps(GROUPS).encode()))
+
+    def log_message(self, *args):
+        pass
+
+def cli(*args: str) -> list:
+    return [sys.executable, "-m", "omni_python_sdk.cli", *args]
+
+def timed(command: list, env: dict, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2]
+
+if __name__ == "__main__":
+    Handler.connect_delay = (float(sys.argv[1]) if len(sys.argv) > 1 else 50) / 1000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    socket_path = os.path.join(tempfile.mkdtemp(), "omni-sdk.sock")
+    env = {**os.environ, "OMNI_API_KEY": "key", "OMNI_BASE_URL": f"http://127.0.0.1:{server.server_port}"}
+    common = ["--socket", socket_path, "--env-file", os.devnull]
+
+    import_time = timed([sys.executable, "-c", "import omni_python_sdk.cli"], env, runs)
+    print(f"import omni_python_sdk.cli: {import_time * 1000:.1f} ms")
+    for command in (["group-id", "Group 7"], ["groups"]):
+        local = timed(cli(*common, "--no-daemon", *command), env, runs)
+        print(f"{' '.join(command)!r:>20} in process: {local * 1000:7.1f} ms")
+    subprocess.run(cli(*common, "daemon", "start", "--ttl", "0"), env=env, check=True)
+    try:
+        for command in (["group-id", "Group 7"], ["groups"]):
+            # the first forwarded command builds the daemon's client
+            subprocess.run(cli(*common, *command), env=env, check=True, stdout=subprocess.DEVNULL)
+            forwarded = timed(cli(*common, *command), env, runs)
+            print(f"{' '.join(command)!r:>20} via daemon: {forwarded * 1000:7.1f} ms")
+        subprocess.run(cli(*common, "daemon", "stop"), env=env, check=True)
+        subprocess.run(cli(*common, "daemon", "start", "--ttl", "60"), env=env, check=True)
+        subprocess.run(cli(*common, "groups"), env=env, check=True, stdout=subprocess.DEVNULL)
+        cached = timed(cli(*common, "groups"), env, runs)
+        print(f"{'groups'!r:>20} via daemon, cached: {cached * 1000:7.1f} ms")
+    finally:
+        subprocess.run(cli(*common, "daemon", "stop"), env=env)
+        server.shutdown()
@@ -0,0 +1,75 @@
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from omni_python_sdk import OmniAPI
+
+# Benchmark of first-call latency for a freshly constructed client against a local
+# HTTP/1.1 server. Every new connection is delayed to stand in for DNS resolution and
+# the TCP and TLS handshakes to a remote Omni instance.
+#
+# Usage: python -m examples.benchmarks.cold_start [connect_delay_ms] [runs]
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connect_delay = 0.0
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        time.sleep(self.connect_delay)
+        super().setup()
+
+    def _reply(self, body: bytes):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return body
+
+    def do_HEAD(self):
+        self._reply(b"")
+
+    def do_GET(self):
+        self.wfile.write(self._reply(b'{"id": "group", "displayName": "Group", "members": []}'))
+
+    def log_message(self, *args):
+        pass
+
+def first_call(base_url: str, eager: bool, idle: float) -> float:
+    api = OmniAPI("key", base_url, eager_connect=1 if eager else 0)
+    # time the worker spends on other start up work before its first call
+    time.sleep(idle)
+    start = time.perf_counter()
+    api.get_group("group")
+    elapsed = time.perf_counter() - start
+    api.close()
+    return elapsed
+
+def steady_state(base_url: str, calls: int = 20) -> float:
+    with OmniAPI("key", base_url) as api:
+        api.get_group("group")
+        start = time.perf_counter()
+        for _ in range(calls):
+            api.get_group("group")
+        return (time.perf_counter() - start) / calls
+
+def main(connect_delay_ms: float, runs: int):
+    Handler.connect_delay = connect_delay_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    idle = 2 * Handler.connect_delay + 0.01
+    cold = min(first_call(base_url, False, idle) for _ in range(runs))
+    warm = min(first_call(base_url, True, idle) for _ in range(runs))
+    steady = steady_state(base_url)
+    print(f"connection setup {connect_delay_ms:.0f} ms")
+    print(f"{'first call, cold':<28} {cold * 1000:8.2f} ms")
+    print(f"{'first call, eager_connect':<28} {warm * 1000:8.2f} ms")
+    print(f"{'steady state':<28} {steady * 1000:8.2f} ms")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main(
+        float(sys.argv[1]) if len(sys.argv) > 1 else 50,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    )
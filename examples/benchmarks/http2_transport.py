@@ -0,0 +1,112 @@
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from omni_python_sdk import OmniAPI, RequestsTransport, HTTP2Transport
+
+# Benchmark of concurrent SCIM reads through the HTTP/1.1 connection pool and the HTTP/2
+# transport, against local stub servers that answer every request after a fixed delay.
+# Requires the optional `httpx[http2]` dependency, which also provides `h2` for the stub.
+#
+# Usage: python -m examples.benchmarks.http2_transport [requests] [delay_ms]
+
+BODY = b'{"id": "group", "displayName": "Group", "members": []}'
+
+class Counter:
+    def __init__(self):
+        self.connections = 0
+
+class HTTP1Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    delay = 0.0
+    counter = Counter()
+
+    def setup(self):
+        self.counter.connections += 1
+        super().setup()
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+class HTTP2Protocol(asyncio.Protocol):
+    def __init__(self, delay: float, counter: Counter):
+        from h2.config import H2Configuration
+        from h2.connection import H2Connection
+        self.connection = H2Connection(H2Configuration(client_side=False))
+        self.delay = delay
+        counter.connections += 1
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.connection.initiate_connection()
+        transport.write(self.connection.data_to_send())
+
+    def data_received(self, data: bytes):
+        from h2.events import RequestReceived
+        for event in self.connection.receive_data(data):
+            if isinstance(event, RequestReceived):
+                asyncio.get_running_loop().call_later(self.delay, self.respond, event.stream_id)
+        self.transport.write(self.connection.data_to_send())
+
+    def respond(self, stream_id: int):
+        headers = [(":status", "200"), ("content-type", "application/json"), ("content-length", str(len(BODY)))]
+        self.connection.send_headers(stream_id, headers)
+        self.connection.send_data(stream_id, BODY, end_stream=True)
+        self.transport.write(self.connection.data_to_send())
+
+def serve_http1(delay: float) -> tuple:
+    HTTP1Handler.delay = delay
+    HTTP1Handler.counter = Counter()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HTTP1Handler)
+    server.request_queue_size = 1024
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", HTTP1Handler.counter, server.shutdown
+
+def serve_http2(delay: float) -> tuple:
+    loop = asyncio.new_event_loop()
+    counter = Counter()
+    server = loop.run_until_complete(loop.create_server(lambda: HTTP2Protocol(delay, counter), "127.0.0.1", 0))
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}", counter, lambda: loop.call_soon_threadsafe(loop.stop)
+
+def run(api: OmniAPI, requests: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: api.get_group("group"), range(requests)))
+    elapsed = time.perf_counter() - start
+    assert all(result is not None for result in results)
+    return elapsed
+
+def main(requests: int, delay_ms: float):
+    delay = delay_ms / 1000
+    print(f"{requests} requests, {delay_ms:.0f} ms server latency")
+    print(f"{'concurrency':>11} {'transport':>10} {'req/s':>9} {'connections':>12}")
+    for concurrency in (10, 100, 1000):
+        for name in ("HTTP/1.1", "HTTP/2"):
+            if name == "HTTP/1.1":
+                base_url, counter, stop = serve_http1(delay)
+                transport = RequestsTransport(pool_maxsize=concurrency)
+            else:
+                base_url, counter, stop = serve_http2(delay)
+                transport = HTTP2Transport(max_connections=4, prior_knowledge=True)
+            with OmniAPI("key", base_url, transport=transport) as api:
+                elapsed = run(api, requests, concurrency)
+            stop()
+            print(f"{concurrency:>11} {name:>10} {requests / elapsed:>9.0f} {counter.connections:>12}")
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 3000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    )
@@ -0,0 +1,42 @@
+import sys
+import time
+from examples.topic import Topic
+from examples.transpile_cache import ViewFragmentCache
+from examples.snowflake_semantic_view import sematic_view_from_topic
+from examples.databricks_metric_view import metric_view_from_topic
+from examples.benchmarks.synthetic import synthetic_topic_json
+
+# Benchmark of rebuilding both transpilers' output after a one-field edit, with and
+# without a ViewFragmentCache carried over from the previous build.
+#
+# Usage: python -m examples.benchmarks.incremental_transpile [total_fields]
+
+def timed(label: str, build) -> float:
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed:8.3f}s")
+    return elapsed
+
+def main(total_fields: int):
+    topic_json = synthetic_topic_json(total_fields)
+    cache = ViewFragmentCache()
+    topic = Topic.model_validate(topic_json)
+
+    def build(topic, cache):
+        sematic_view_from_topic(topic, cache=cache)
+        metric_view_from_topic(topic, None, None, enable_joins=False, cache=cache)
+
+    timed("full build (no cache)", lambda: build(topic, None))
+    timed("first build (cold cache)", lambda: build(topic, cache))
+
+    # edit the SQL of one field of the last view
+    topic_json["views"][-1]["dimensions"][0]["sql"] = "LOWER(${view_1.dimension_1})"
+    edited = Topic.model_validate(topic_json)
+    hits, misses = cache.hits, cache.misses
+    timed("rebuild after edit (no cache)", lambda: build(edited, None))
+    timed("rebuild after edit (warm cache)", lambda: build(edited, cache))
+    print(f"views reused: {cache.hits - hits}, re-rendered: {cache.misses - misses}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,51 @@
+import random
+import sys
+import time
+from omni_python_sdk import GroupMembershipIndex
+
+# Benchmark of a per-user access audit ("which groups is this user in") by scanning every
+# group's members, as done with get_all_groups, versus a GroupMembershipIndex built once.
+#
+# Usage: python -m examples.benchmarks.membership_index [users] [groups] [members_per_group]
+
+def synthetic_groups(users: int, groups: int, members: int) -> list:
+    random.seed(0)
+    return [
+        {"id": f"g{i}", "displayName": f"group {i}", "members": [{"value": f"u{u}"} for u in random.sample(range(users), members)]}
+        for i in range(groups)
+    ]
+
+def scan(groups: list, user_ids: list) -> dict:
+    return {user_id: [group["id"] for group in groups if any(member["value"] == user_id for member in group["members"])] for user_id in user_ids}
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    group_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    members = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    groups = synthetic_groups(users, group_count, members)
+    user_ids = [f"u{u}" for u in range(users)]
+
+    start = time.perf_counter()
+    scanned = scan(groups, user_ids)
+    scan_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = GroupMembershipIndex()
+    for group in groups:
+        index.set_group(group)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = {user_id: index.groups_of(user_id) for user_id in user_ids}
+    lookup_seconds = time.perf_counter() - start
+    assert all(set(scanned[user_id]) == indexed[user_id] for user_id in user_ids)
+
+    # the first pyarrow conversion in a process pays a one-off initialization
+    GroupMembershipIndex().to_arrow()
+    start = time.perf_counter()
+    table = index.to_arrow()
+    arrow_seconds = time.perf_counter() - start
+    print(f"{users} users, {group_count} groups, {members} members each")
+    print(f"scan every group per user {scan_seconds * 1000:9.1f} ms")
+    print(f"build index               {build_seconds * 1000:9.1f} ms")
+    print(f"index lookups             {lookup_seconds * 1000:9.1f} ms")
+    print(f"to_arrow ({table.num_rows} rows)   {arrow_seconds * 1000:9.1f} ms")
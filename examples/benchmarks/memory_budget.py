@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from omni_python_sdk import OmniAPI
+from examples.benchmarks.result_decode import encoded_result
+
+# Benchmark of resident memory held by several large results decoded at once, without
+# a memory budget and with one that spills to memory-mapped files. Each configuration
+# runs in its own process. Linux only, resident memory is read from /proc.
+#
+# Usage: python -m examples.benchmarks.memory_budget [rows] [queries] [budget_mb]
+
+def resident_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+def child(rows: int, queries: int, budget_mb: int):
+    payload = encoded_result(rows)
+    baseline = resident_bytes()
+    api = OmniAPI("key", "https://example.omniapp.co", memory_budget=budget_mb << 20 if budget_mb else None)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=queries) as executor:
+        tables = list(executor.map(lambda _: api._decode_result(payload), range(queries)))
+    elapsed = time.perf_counter() - start
+    resident = resident_bytes()
+    spills = api.memory_budget.spills if api.memory_budget else 0
+    label = f"budget {budget_mb} MB" if budget_mb else "no budget"
+    print(f"{label:<16} {elapsed:8.2f}s {(resident - baseline) / 1e6:10.0f} MB {spills:>7} {sum(t.num_rows for t in tables):>12}")
+
+def main(rows: int, queries: int, budget_mb: int):
+    print(f"{queries} results of {rows} rows decoded concurrently")
+    print(f"{'':<16} {'time':>9} {'resident +':>13} {'spills':>7} {'rows':>12}")
+    for budget in (0, budget_mb):
+        subprocess.run([sys.executable, "-m", __spec__.name, "--child", str(rows), str(queries), str(budget)], check=True)
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(*map(int, sys.argv[2:5]))
+    else:
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+            int(sys.argv[3]) if len(sys.argv) > 3 else 256,
+        )
@@ -0,0 +1,50 @@
+import re
+import sys
+import time
+from examples.sql_references import ReferenceRewriter
+from examples.databricks_metric_view import transform_name
+from examples.benchmarks.synthetic import synthetic_topic
+
+# Benchmark of the shared ${...} reference rewriter against the per-call regex
+# callback (Databricks) and double str.replace (Snowflake) it replaced.
+#
+# Usage: python -m examples.benchmarks.reference_rewrite [total_fields]
+
+def legacy_databricks(topic, sql: str) -> str:
+    pattern = r"\$\{([^}]+)\}"
+
+    def replace_field(match):
+        field = topic.find_field(match.group(1))
+        if field.is_dimension != True:
+            return f"Measure({transform_name(field.fully_qualified_field_name)})"
+        return transform_name(field.fully_qualified_field_name)
+    return re.sub(pattern, replace_field, sql)
+
+def legacy_snowflake(sql: str) -> str:
+    return sql.replace("${", "").replace("}", "")
+
+def timed(label: str, rewrite, expressions) -> float:
+    start = time.perf_counter()
+    for sql in expressions:
+        rewrite(sql)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed:8.3f}s  {elapsed / len(expressions) * 1e6:8.2f}us/expression")
+    return elapsed
+
+def main(total_fields: int):
+    topic = synthetic_topic(total_fields)
+    expressions = [field.sql for view in topic.views for field in view.dimensions + view.measures]
+    print(f"{len(expressions)} SQL expressions")
+
+    def render_field(field):
+        name = transform_name(field.fully_qualified_field_name)
+        return name if field.is_dimension == True else f"Measure({name})"
+
+    legacy = timed("databricks legacy", lambda sql: legacy_databricks(topic, sql), expressions)
+    shared = timed("databricks rewriter", ReferenceRewriter.for_topic(topic, render_field), expressions)
+    print(f"speedup                {legacy / shared:.1f}x")
+    timed("snowflake legacy", legacy_snowflake, expressions)
+    timed("snowflake rewriter", ReferenceRewriter(), expressions)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
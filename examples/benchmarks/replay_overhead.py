@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+import time
+from omni_python_sdk import OmniAPI, RecordingTransport, ReplayTransport
+from examples.tests.stub_transport import BASE_URL, QUERY, StubTransport
+
+# Offline benchmark of the SDK's own overhead (NDJSON parsing, result decoding, SCIM
+# pagination). Responses of a stub server are recorded to a cassette once and replayed
+# from memory, so the timings do not include any network time.
+#
+# Usage: python -m examples.benchmarks.replay_overhead [rows] [groups] [iterations]
+
+def timed(function, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations
+
+def main(rows: int, groups: int, iterations: int):
+    with tempfile.TemporaryDirectory() as directory:
+        cassette = os.path.join(directory, "omni.jsonl")
+        with OmniAPI("key", BASE_URL, transport=RecordingTransport(StubTransport(rows, groups), cassette)) as api:
+            api.run_query_blocking(QUERY)
+            api.get_all_groups()
+        print(f"cassette {os.path.getsize(cassette) / 1e6:.1f} MB, {rows} rows, {groups} groups")
+        replay = ReplayTransport(cassette)
+        api = OmniAPI("key", BASE_URL, transport=replay)
+        results = {
+            "run_query_blocking": timed(lambda: api.run_query_blocking(QUERY), iterations),
+            "run_query (labels, cast)": timed(lambda: api.run_query(QUERY, labels=True, cast=True), iterations),
+            # get_all_groups is memoized per client
+            "get_all_groups": timed(lambda: OmniAPI("key", BASE_URL, transport=replay).get_all_groups(), iterations),
+        }
+    for name, seconds in results.items():
+        print(f"{name:<26} {seconds * 1000:8.2f} ms")
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 400_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5_000,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 10,
+    )
@@ -0,0 +1,50 @@
+import base64
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pyarrow as pa
+import pyarrow.ipc as ipc
+from omni_python_sdk import OmniAPI
+
+# Benchmark of decoding many query results concurrently from threads, in the calling
+# threads versus in a worker process pool with memory-mapped handoff.
+#
+# Usage: python -m examples.benchmarks.result_decode [rows] [queries] [processes]
+
+def encoded_result(rows: int) -> str:
+    table = pa.table({
+        "order_items.id": pa.array(range(rows), pa.int64()),
+        "order_items.status": pa.array(["Complete", "Shipped", "Processing", "Cancelled"] * (rows // 4)),
+        "order_items.sale_price": pa.array([i * 0.25 for i in range(rows)]),
+    })
+    sink = io.BytesIO()
+    with ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=64_000)
+    return base64.b64encode(sink.getvalue()).decode()
+
+def run(api: OmniAPI, payload: str, queries: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=queries) as executor:
+        tables = list(executor.map(lambda _: api._decode_result(payload), range(queries)))
+    elapsed = time.perf_counter() - start
+    assert all(table.num_rows == tables[0].num_rows for table in tables)
+    return elapsed
+
+def main(rows: int, queries: int, processes: int):
+    payload = encoded_result(rows)
+    print(f"{queries} concurrent results of {len(payload) / 1e6:.0f} MB base64")
+    in_thread = run(OmniAPI("key", "https://example.omniapp.co"), payload, queries)
+    print(f"{'calling threads':<24} {in_thread:8.3f}s")
+    with OmniAPI("key", "https://example.omniapp.co", decode_processes=processes) as api:
+        # start the workers outside of the measurement
+        run(api, encoded_result(4), processes)
+        pooled = run(api, payload, queries)
+    print(f"{f'{processes} worker processes':<24} {pooled:8.3f}s")
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 4_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 4,
+    )
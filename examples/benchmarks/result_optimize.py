@@ -0,0 +1,46 @@
+import sys
+import time
+import pyarrow as pa
+from omni_python_sdk import QueryResult
+
+# Benchmark of QueryResult.optimize on a result shaped like a typical query: low
+# cardinality dimensions, an id, small counts, prices and timestamps sent as strings.
+#
+# Usage: python -m examples.benchmarks.result_optimize [rows]
+
+def synthetic_result(rows: int) -> QueryResult:
+    statuses = ["Complete", "Shipped", "Processing", "Cancelled", "Returned"]
+    table = pa.table({
+        "order_items.status": pa.array([statuses[i % 5] for i in range(rows)]),
+        "products.brand": pa.array([f"Brand {i % 300}" for i in range(rows)]),
+        "order_items.id": pa.array(range(rows), pa.int64()),
+        "order_items.count": pa.array([i % 40 for i in range(rows)], pa.int64()),
+        "order_items.sale_price": pa.array([(i % 4000) * 0.25 for i in range(rows)]),
+        "order_items.created_at": pa.array([f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d} 10:00:00" for i in range(rows)]),
+    })
+    fields = {
+        "order_items.status": {"is_dimension": True, "data_type": "STRING"},
+        "products.brand": {"is_dimension": True, "data_type": "STRING"},
+        "order_items.id": {"is_dimension": True, "data_type": "NUMBER"},
+        "order_items.count": {"is_dimension": False, "data_type": "NUMBER"},
+        "order_items.sale_price": {"is_dimension": False, "data_type": "NUMBER"},
+        "order_items.created_at": {"is_dimension": True, "data_type": "TIMESTAMP"},
+    }
+    return QueryResult(table, fields)
+
+def pandas_bytes(result: QueryResult) -> int:
+    return int(result.to_pandas().memory_usage(deep=True).sum())
+
+def main(rows: int):
+    result = synthetic_result(rows)
+    start = time.perf_counter()
+    optimized = result.optimize()
+    elapsed = time.perf_counter() - start
+    print(f"{rows} rows optimized in {elapsed:.3f}s")
+    for name, saving in optimized.savings.items():
+        print(f"  {name:<26} {saving['from']:>14} -> {saving['to']:<48} {saving['bytes_saved'] / 1e6:8.1f} MB saved")
+    print(f"{'arrow':<8} {result.table.nbytes / 1e6:8.1f} MB -> {optimized.table.nbytes / 1e6:8.1f} MB")
+    print(f"{'pandas':<8} {pandas_bytes(result) / 1e6:8.1f} MB -> {pandas_bytes(optimized) / 1e6:8.1f} MB")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
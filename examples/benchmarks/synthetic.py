@@ -0,0 +1,80 @@
+from typing import List
+from examples.topic import Topic
+
+# Builders for large synthetic topics used by the benchmarks in this package.
+# Every field references another field of its own view and one field of the base
+# view so the transpilers have `${...}` references to resolve.
+
+def synthetic_view(view_index: int, fields_per_view: int, base_view_name: str) -> dict:
+    name = base_view_name if view_index == 0 else f"view_{view_index}"
+    half = fields_per_view // 2
+    dimensions = [
+        {
+            "fully_qualified_name": f"{name}.dimension_{i}",
+            "field_name": f"dimension_{i}",
+            "view_name": name,
+            "data_type": "STRING",
+            "is_dimension": True,
+            "sql": f"UPPER(${{{name}.dimension_{max(i - 1, 0)}}}) || ${{{base_view_name}.dimension_0}}",
+            "description": f"Dimension {i} of {name}",
+        }
+        for i in range(half)
+    ]
+    measures = [
+        {
+            "fully_qualified_name": f"{name}.measure_{i}",
+            "field_name": f"measure_{i}",
+            "view_name": name,
+            "data_type": "NUMBER",
+            "aggregate_type": "SUM",
+            "is_dimension": False,
+            "sql": f"SUM(${{{name}.dimension_{i % max(half, 1)}}}) / NULLIF(${{{name}.measure_0}}, 0)",
+            "description": f"Measure {i} of {name}",
+        }
+        for i in range(fields_per_view - half)
+    ]
+    return {
+        "name": name,
+        "table_name": name,
+        "schema": "public",
+        "dimensions": dimensions,
+        "measures": measures,
+        "primary_key": [{"type": "field", "field_name": f"{name}.dimension_0"}],
+    }
+
+def synthetic_relationships(view_names: List[str], base_view_name: str) -> List[dict]:
+    return [
+        {
+            "id": f"{base_view_name}_{name}",
+            "left_view_name": base_view_name,
+            "right_view_name": name,
+            "on": {
+                "type": "call",
+                "operator": "SqlStdOperatorTable.EQUALS",
+                "operands": [
+                    {"type": "field", "field_name": f"{base_view_name}.dimension_1"},
+                    {"type": "field", "field_name": f"{name}.dimension_0"},
+                ],
+            },
+            "sql": f"${{{base_view_name}.dimension_1}} = ${{{name}.dimension_0}}",
+            "join_type": "ALWAYS_LEFT",
+            "type": "ASSUMED_MANY_TO_ONE",
+        }
+        for name in view_names if name != base_view_name
+    ]
+
+def synthetic_topic_json(total_fields: int = 10_000, views: int = 100, base_view_name: str = "base") -> dict:
+    """
+    Build topic JSON with `total_fields` fields spread evenly over `views` views.
+    """
+    fields_per_view = total_fields // views
+    view_json = [synthetic_view(i, fields_per_view, base_view_name) for i in range(views)]
+    return {
+        "name": "synthetic",
+        "base_view_name": base_view_name,
+        "relationships": synthetic_relationships([view["name"] for view in view_json], base_view_name),
+        "views": view_json,
+    }
+
+def synthetic_topic(total_fields: int = 10_000, views: int = 100, base_view_name: str = "base") -> Topic:
+    return Topic.model_validate(synthetic_topic_json(total_fields, views, base_view_name))
@@ -0,0 +1,39 @@
+import sys
+import time
+from typing import Optional
+from examples.topic import OmniField, Topic
+from examples.benchmarks.synthetic import synthetic_topic
+
+# Benchmark of Topic.find_field on a synthetic topic, compared with the linear scan
+# the lookup used before the lazy indexes were added.
+#
+# Usage: python -m examples.benchmarks.topic_lookup [total_fields]
+
+def linear_find_field(topic: Topic, name: str) -> Optional[OmniField]:
+    view_name, field_name = name.split(".")
+    for view in topic.views:
+        if view.name == view_name:
+            for field in view.dimensions + view.measures:
+                if field.field_name == field_name:
+                    return field
+            return None
+    return None
+
+def timed(label: str, lookup, topic: Topic, names) -> float:
+    start = time.perf_counter()
+    for name in names:
+        lookup(topic, name)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {len(names):>8} lookups  {elapsed:8.3f}s  {elapsed / len(names) * 1e6:8.2f}us/lookup")
+    return elapsed
+
+def main(total_fields: int):
+    topic = synthetic_topic(total_fields)
+    names = [f"{view.name}.{field.field_name}" for view in topic.views for field in view.dimensions + view.measures]
+    print(f"topic with {len(topic.views)} views and {len(names)} fields")
+    linear = timed("linear", linear_find_field, topic, names)
+    indexed = timed("indexed", Topic.find_field, topic, names)
+    print(f"speedup    {linear / indexed:.1f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
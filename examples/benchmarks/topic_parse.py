@@ -0,0 +1,51 @@
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from examples.topic import Topic
+
+# Benchmark of Topic parsing on the order_items fixture scaled up by duplicating
+# its views and relationships: the current json.loads + model_validate path, pydantic's
+# model_validate_json, and the lazy path that validates views on first access.
+#
+# Usage: python -m examples.benchmarks.topic_parse [scale]
+
+FIXTURE = "examples/tests/data/order_items.topic.json"
+
+def scaled_topic_json(scale: int) -> bytes:
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        topic = json.load(f)
+    views, relationships = [], []
+    for i in range(scale):
+        suffix = f"_{i}" if i else ""
+        for view in topic["views"]:
+            views.append({**view, "name": view["name"] + suffix})
+        for relationship in topic["relationships"]:
+            relationships.append({**relationship, "id": relationship["id"] + suffix, "right_view_name": relationship["right_view_name"] + suffix})
+    return json.dumps({**topic, "views": views, "relationships": relationships}).encode("utf-8")
+
+def measure(label: str, parse, data: bytes):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    topic = parse(data)
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:8.3f}s  retained {retained / 1e6:8.1f} MB  peak {peak / 1e6:8.1f} MB")
+    return topic
+
+def main(scale: int):
+    data = scaled_topic_json(scale)
+    print(f"{len(data) / 1e6:.1f} MB of topic JSON")
+    measure("json.loads + model_validate", lambda data: Topic.model_validate(json.loads(data)), data)
+    measure("model_validate_json", Topic.model_validate_json, data)
+    topic = measure("model_validate_json_lazy", Topic.model_validate_json_lazy, data)
+
+    start = time.perf_counter()
+    topic.find_field("order_items.sale_price")
+    print(f"{'first lookup (lazy)':<28} {time.perf_counter() - start:8.3f}s  {len(topic.views.loaded())} of {len(topic.views)} views validated")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -1,8 +1,9 @@
-import re
 from typing import Optional
 import yaml
 import sys
+from examples.sql_references import ReferenceRewriter
 from examples.topic import Topic
+from examples.transpile_cache import ViewFragmentCache, topic_interface_key, view_key
 from omni_python_sdk import OmniAPI
 
 
@@ -203,9 +204,10 @@ def transform_name(name: str) -> str:
     # Example transformation: replace . with underscores and convert to lowercase
     return name.replace(".", "__").lower()
 
-def metric_view_from_topic(topic: Topic, default_catalog: Optional[str], default_schema: Optional[str], enable_joins: bool = False) -> DatabricksMetricView:
+def metric_view_from_topic(topic: Topic, default_catalog: Optional[str], default_schema: Optional[str], enable_joins: bool = False, cache: Optional[ViewFragmentCache] = None) -> DatabricksMetricView:
     """
     Convert a Topic object to a DatabricksMetricView object.
+    Pass the same ViewFragmentCache across calls to only re-render the views that changed.
     """
     metric_view = DatabricksMetricView(name=topic.name, default_catalog=default_catalog, default_schema=default_schema)
 
@@ -218,36 +220,43 @@ def metric_view_from_topic(topic: Topic, default_catalog: Optional[str], default
         raise ValueError(f"Base view {base_view_name} not found in topic {topic.name}")
     metric_view.set_comment(topic.description)
 
-    def transform_sql_references(sql: str) -> str:
-        # Example transformation: replace ${field_name} and ${view_name.field_name}
-        # with Measure(fully_qualified_field_name) if a measure
-        # Pattern to match ${field_name}
-        pattern = r"\$\{([^}]+)\}"
-        
-        def replace_field(match):
-            field_name = match.group(1)
-            # Check if the field is a measure or dimension
-            field = topic.find_field(field_name)
-            if field.is_dimension != True:
-                return f"Measure({transform_name(field.fully_qualified_field_name)})"
-            else:
-                # Remove the ${} from the SQL
-                return transform_name(field.fully_qualified_field_name)
-        return re.sub(pattern, replace_field, sql)
-
-    
-    for view in topic.views:
-        # skip views that are not the base view if joins are not enabled
-        if not enable_joins and view.name != base_view_name:
-            continue
+    # replace ${field_name} and ${view_name.field_name} with
+    # Measure(fully_qualified_field_name) if a measure
+    def render_field(field) -> str:
+        if field.is_dimension != True:
+            return f"Measure({transform_name(field.fully_qualified_field_name)})"
+        else:
+            # Remove the ${} from the SQL
+            return transform_name(field.fully_qualified_field_name)
+    transform_sql_references = ReferenceRewriter.for_topic(topic, render_field)
+
+    def render_view(view):
+        dimensions = []
         for dimension in view.dimensions:
             # skip parameterized dates
             if dimension.date_type:
                 continue
-            metric_view.add_dimension(transform_name(dimension.fully_qualified_field_name), dimension.transform_sql_references(transform_sql_references, base_view_name=base_view_name), dimension.description)
-
-        for measure in view.measures:
-            metric_view.add_measure(transform_name(measure.fully_qualified_field_name), measure.transform_sql_references(transform_sql_references), measure.description)
+            dimensions.append((transform_name(dimension.fully_qualified_field_name), dimension.transform_sql_references(transform_sql_references, base_view_name=base_view_name), dimension.description))
+        measures = [
+            (transform_name(measure.fully_qualified_field_name), measure.transform_sql_references(transform_sql_references), measure.description)
+            for measure in view.measures
+        ]
+        return dimensions, measures
+
+    interface_key = topic_interface_key(topic) if cache is not None else None
+    for view in topic.views:
+        # skip views that are not the base view if joins are not enabled
+        if not enable_joins and view.name != base_view_name:
+            continue
+        if cache is not None:
+            key = view_key(view, interface_key, ("databricks", base_view_name))
+            dimensions, measures = cache.fragment(("databricks", topic.name, view.name), key, lambda: render_view(view))
+        else:
+            dimensions, measures = render_view(view)
+        for dimension in dimensions:
+            metric_view.add_dimension(*dimension)
+        for measure in measures:
+            metric_view.add_measure(*measure)
 
     if enable_joins:
         for relationship in topic.relationships:
@@ -1,4 +1,4 @@
-from omni_python_sdk import OmniAPI
+from omni_python_sdk import OmniAPI, IncrementalQuery
 import pandas as pd
 import matplotlib.pyplot as plt
 from statsmodels.tsa.statespace.sarimax import SARIMAX
@@ -59,6 +59,8 @@ if __name__ == "__main__":
     }
 
     api = OmniAPI(api_key)
-    table = api.run_query_blocking(query)
+    # keep the fetched history in a local file and only query the days since the last run
+    daily_sales = IncrementalQuery(api, query, 'order_items.created_at[date]', overlap=2, path='daily_sales.arrow')
+    table = daily_sales.refresh()
     df = table.to_pandas()
     plot_and_forecast(df)
@@ -1,4 +1,4 @@
-from omni_python_sdk import OmniAPI
+from omni_python_sdk import OmniAPI, EmbedUrlCache
 
 api = OmniAPI('<<your api key>>','https://<<your omni host>>')
 
@@ -13,3 +13,21 @@ response = api.generate_embed_url(
     }   
 )
 print(response.json()["url"])
+
+# Generate URLs for many page views at once, reusing URLs generated in the last 30 seconds
+# for the same user, content and attributes
+cache = EmbedUrlCache(ttl=30)
+urls = api.generate_embed_urls(
+    [
+        {
+        'contentPath': path,
+        'externalId': 'user@example.com',
+        'name': 'Example (embed test user)',
+        'secret': '<<your embed secret>>',
+        'email':'user@example.com',
+        }
+        for path in ['/dashboards/example_metrics', '/dashboards/example_orders']
+    ],
+    cache=cache,
+)
+print(urls)
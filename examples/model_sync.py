@@ -0,0 +1,142 @@
+import os
+import sys
+import difflib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from omni_python_sdk import OmniAPI
+from omni_python_sdk.catalog import model_records
+
+# Example of keeping every model's YAML in a local directory (e.g. a git checkout)
+# in sync with Omni. This example assumes you have a valid API key and base URL
+# for the OmniAPI defined in your .env file
+#
+# Layout of the local directory:
+#   <directory>/<model_id>/<file_name>
+#
+# pull: fetch every model's YAML concurrently and write it to the directory
+# push: fetch every model's YAML concurrently, diff it against the directory and
+#       only post the files that changed through yamlw
+
+def fetch_model_files(client: OmniAPI, model_id: str, mode: str = "combined") -> Optional[Dict[str, str]]:
+    """
+    Fetch the YAML files of a single model as a file name -> YAML mapping.
+    """
+    response = client.yamlr(model_id, {"mode": mode})
+    if response is None:
+        return None
+    return response.get("files", {})
+
+def pull_all(client: OmniAPI, model_ids: List[str], mode: str = "combined", max_workers: int = 8) -> Dict[str, Dict[str, str]]:
+    """
+    Fetch the YAML of every model concurrently.
+    Models that fail to load are left out of the result.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(lambda model_id: fetch_model_files(client, model_id, mode), model_ids)
+        return {model_id: files for model_id, files in zip(model_ids, results) if files is not None}
+
+def read_local_files(directory: str, model_id: str) -> Dict[str, str]:
+    """
+    Read the local YAML files of a model as a file name -> YAML mapping.
+    """
+    model_dir = os.path.join(directory, model_id)
+    files = {}
+    for root, _, names in os.walk(model_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            file_name = os.path.relpath(path, model_dir).replace(os.sep, "/")
+            with open(path, "r", encoding="utf-8") as f:
+                files[file_name] = f.read()
+    return files
+
+def write_local_files(directory: str, model_id: str, files: Dict[str, str]) -> None:
+    """
+    Write the YAML files of a model to the local directory.
+    """
+    for file_name, content in files.items():
+        path = os.path.join(directory, model_id, *file_name.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+def diff_files(local: Dict[str, str], remote: Dict[str, str]) -> Dict[str, str]:
+    """
+    Return the local files whose content differs from the remote copy.
+    Files only present remotely are left alone.
+    """
+    return {file_name: content for file_name, content in local.items() if remote.get(file_name) != content}
+
+def unified_diff(file_name: str, local: str, remote: Optional[str]) -> str:
+    """
+    Render a unified diff of a single file for display.
+    """
+    return "".join(difflib.unified_diff(
+        (remote or "").splitlines(keepends=True),
+        local.splitlines(keepends=True),
+        fromfile=f"omni/{file_name}",
+        tofile=f"local/{file_name}",
+    ))
+
+def push_changes(client: OmniAPI, changes: List[Tuple[str, str, str]], mode: str = "combined", commit_message: Optional[str] = None, max_workers: int = 4) -> List[Tuple[str, str, bool]]:
+    """
+    Post changed files through yamlw with bounded parallelism.
+    Args:
+        changes: (model_id, file_name, yaml) tuples to write.
+    Returns:
+        (model_id, file_name, succeeded) tuples in the order of `changes`.
+    """
+    def write(change):
+        model_id, file_name, content = change
+        body = {"fileName": file_name, "yaml": content, "mode": mode}
+        if commit_message:
+            body["commitMessage"] = commit_message
+        return model_id, file_name, client.yamlw(model_id, body) is not None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(write, changes))
+
+def pull(client: OmniAPI, directory: str, model_kind: str = "SHARED", max_workers: int = 8) -> None:
+    """
+    Write the YAML of every model to the local directory.
+    """
+    model_ids = [model["id"] for model in model_records(client.list_models(modelKind=model_kind))]
+    for model_id, files in pull_all(client, model_ids, max_workers=max_workers).items():
+        write_local_files(directory, model_id, files)
+        print(f"pulled {len(files)} files for model {model_id}")
+
+def push(client: OmniAPI, directory: str, dry_run: bool = False, commit_message: Optional[str] = None, max_workers: int = 8) -> None:
+    """
+    Push only the local files that differ from Omni.
+    An unchanged directory costs a single concurrent pull.
+    """
+    model_ids = sorted(name for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name)))
+    remote = pull_all(client, model_ids, max_workers=max_workers)
+    changes = []
+    for model_id in model_ids:
+        if model_id not in remote:
+            print(f"skipping model {model_id}: could not fetch remote YAML")
+            continue
+        local = read_local_files(directory, model_id)
+        for file_name, content in diff_files(local, remote[model_id]).items():
+            print(unified_diff(f"{model_id}/{file_name}", content, remote[model_id].get(file_name)), end="")
+            changes.append((model_id, file_name, content))
+
+    if not changes:
+        print("no changes")
+        return
+    if dry_run:
+        print(f"{len(changes)} files would be pushed")
+        return
+    for model_id, file_name, succeeded in push_changes(client, changes, commit_message=commit_message, max_workers=max_workers):
+        print(f"{'pushed' if succeeded else 'failed to push'} {model_id}/{file_name}")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("pull", "push"):
+        print("Usage: python model_sync.py <pull|push> <directory> [--dry-run]")
+        sys.exit(1)
+
+    client = OmniAPI()
+    if sys.argv[1] == "pull":
+        pull(client, sys.argv[2])
+    else:
+        push(client, sys.argv[2], dry_run="--dry-run" in sys.argv[3:])
@@ -1,5 +1,8 @@
 import sys
+from typing import Optional
+from examples.sql_references import ReferenceRewriter
 from examples.topic import Topic
+from examples.transpile_cache import ViewFragmentCache, view_key
 from omni_python_sdk import OmniAPI
 
 # Example of using the OmniAPI to get a topic definition and convert to a Snowflake semantic view
@@ -115,82 +118,122 @@ class SnowflakeSemanticView:
     def set_comment(self, comment):
         self.comment = comment
 
-    def generate_sql(self):
-        sql = f"CREATE OR REPLACE SEMANTIC VIEW OMNI__{self.name}\n\n"
-
-        if self.tables:
-            sql += "TABLES (\n"
-            for table in self.tables:
-                sql += f"  {table['name']} AS {table['table_name']}\n"
-                primary_key = table.get("primary_key").split(".")[1]
-                if primary_key:
-                    sql += f"    PRIMARY KEY ({primary_key})"
-                if table.get("synonyms"):
-                    sql += f"    WITH SYNONYMS ({', '.join(table['synonyms'])})"
-                if table.get("comment"):
-                    sql += f"    COMMENT = '{table['comment']}'"
-                sql += ",\n"
-            sql = sql[:-2] + "\n)\n\n"
-
-        if self.relationships:
-            sql += "RELATIONSHIPS (\n"
-            for relationship in self.relationships:
-                key = relationship.get("source_column").split(".")[1]
-                sql += f"  {relationship['name']} AS\n"
-                sql += f"    {relationship['source_table']} ({key}) REFERENCES {relationship['target_table']},\n"
-            sql = sql[:-2] + "\n)\n\n"
-        if self.facts:
-            sql += "FACTS (\n"
-            for fact in self.facts:
-                sql += f"  {fact['name']} AS {fact['expression']}"
-                if fact.get("comment"):
-                    sql += f" COMMENT = '{fact['comment']}'"
-                sql += ",\n"
-            sql = sql[:-2] + "\n)\n\n"
-        if self.dimensions:
-            sql += "DIMENSIONS (\n"
-            for dimension in self.dimensions:
-                sql += f"  {dimension['name']} AS {dimension['expression']}"
-                if dimension.get("synonyms"):
-                    sql += f" WITH SYNONYMS ({', '.join(dimension['synonyms'])})"
-                if dimension.get("comment"):
-                    sql += f" COMMENT = '{dimension['comment']}'"
-                sql += ",\n"
-            sql = sql[:-2] + "\n)\n\n"
-        if self.metrics:
-            sql += "METRICS (\n"
-            for metric in self.metrics:
-                sql += f"  {metric['name']} AS {metric['expression']}"
-                if metric.get("comment"):
-                    sql += f" COMMENT = '{metric['comment']}'"
-                sql += ",\n"
-            sql = sql[:-2] + "\n)\n\n"
-        if self.comment:
-            sql += f"COMMENT = '{self.comment}';\n"
+    def table_sql(self, table):
+        sql = f"  {table['name']} AS {table['table_name']}\n"
+        primary_key = table.get("primary_key").split(".")[1]
+        if primary_key:
+            sql += f"    PRIMARY KEY ({primary_key})"
+        if table.get("synonyms"):
+            sql += f"    WITH SYNONYMS ({', '.join(table['synonyms'])})"
+        if table.get("comment"):
+            sql += f"    COMMENT = '{table['comment']}'"
+        return sql
+
+    def relationship_sql(self, relationship):
+        key = relationship.get("source_column").split(".")[1]
+        return f"  {relationship['name']} AS\n    {relationship['source_table']} ({key}) REFERENCES {relationship['target_table']}"
+
+    def fact_sql(self, fact):
+        sql = f"  {fact['name']} AS {fact['expression']}"
+        if fact.get("comment"):
+            sql += f" COMMENT = '{fact['comment']}'"
+        return sql
+
+    def dimension_sql(self, dimension):
+        sql = f"  {dimension['name']} AS {dimension['expression']}"
+        if dimension.get("synonyms"):
+            sql += f" WITH SYNONYMS ({', '.join(dimension['synonyms'])})"
+        if dimension.get("comment"):
+            sql += f" COMMENT = '{dimension['comment']}'"
+        return sql
+
+    def metric_sql(self, metric):
+        sql = f"  {metric['name']} AS {metric['expression']}"
+        if metric.get("comment"):
+            sql += f" COMMENT = '{metric['comment']}'"
         return sql
 
-# remove ${}
-def remove_braces(s: str) -> str:
-    return s.replace("${", "").replace("}", "")
+    def section_sql(self, title, items, item_sql):
+        # yields "TITLE (\n" + items separated by ",\n" + "\n)\n\n" without re-copying the output
+        if not items:
+            return
+        yield f"{title} (\n"
+        separator = ""
+        for item in items:
+            yield separator
+            yield item_sql(item)
+            separator = ",\n"
+        yield "\n)\n\n"
+
+    def iter_sql(self):
+        """
+        Generate the DDL as a stream of string chunks, in linear time in the size of the view.
+        """
+        yield f"CREATE OR REPLACE SEMANTIC VIEW OMNI__{self.name}\n\n"
+        yield from self.section_sql("TABLES", self.tables, self.table_sql)
+        yield from self.section_sql("RELATIONSHIPS", self.relationships, self.relationship_sql)
+        yield from self.section_sql("FACTS", self.facts, self.fact_sql)
+        yield from self.section_sql("DIMENSIONS", self.dimensions, self.dimension_sql)
+        yield from self.section_sql("METRICS", self.metrics, self.metric_sql)
+        if self.comment:
+            yield f"COMMENT = '{self.comment}';\n"
+
+    def write_sql(self, out):
+        """
+        Write the DDL to a text stream (an open file, io.StringIO, socket.makefile("w"), ...)
+        without building the whole statement in memory.
+        """
+        for chunk in self.iter_sql():
+            out.write(chunk)
+
+    def generate_sql(self):
+        return "".join(self.iter_sql())
+
+# remove ${} around field references in a single pass
+remove_braces = ReferenceRewriter()
 
 def transform_sql(s: str) -> str:
     return remove_braces(s)
 
-def sematic_view_from_topic(topic):
+def view_fragments(view):
+    # skip views without primary keys
+    if not view.primary_key[0].field_name:
+        return None
+    table = (view.name, view.fully_scoped_table_name(), ', '.join([k.field_name for k in view.primary_key]), view.aliases, view.description)
+    dimensions = []
+    for dimension in view.dimensions:
+        # skip parameterized dates
+        if dimension.date_type:
+            continue
+        dimensions.append((dimension.fully_qualified_field_name, dimension.transform_sql_references(transform_sql), dimension.synonyms, dimension.description))
+    metrics = [
+        (measure.fully_qualified_field_name, measure.transform_sql_references(transform_sql), measure.synonyms, measure.description)
+        for measure in view.measures
+    ]
+    return table, dimensions, metrics
+
+def sematic_view_from_topic(topic, cache: Optional[ViewFragmentCache] = None):
+    """
+    Convert a Topic object to a SnowflakeSemanticView object.
+    Pass the same ViewFragmentCache across calls to only re-render the views that changed.
+    """
     semantic_view = SnowflakeSemanticView(topic.name)
     
     for view in topic.views:
-        # skip views without primary keys
-        if not view.primary_key[0].field_name:
+        if cache is not None:
+            # references render as their bare names, so fragments only depend on the view itself
+            key = view_key(view, (), ("snowflake",))
+            fragments = cache.fragment(("snowflake", topic.name, view.name), key, lambda: view_fragments(view))
+        else:
+            fragments = view_fragments(view)
+        if fragments is None:
             continue
-        semantic_view.add_table(view.name, table_name=view.fully_scoped_table_name(), primary_key=', '.join([k.field_name for k in view.primary_key]), synonyms=view.aliases, comment=view.description)
-        for dimension in view.dimensions:
-            # skip parameterized dates
-            if dimension.date_type:
-                continue
-            semantic_view.add_dimension(dimension.fully_qualified_field_name, dimension.transform_sql_references(transform_sql), synonyms=dimension.synonyms, comment=dimension.description)
-        for measure in view.measures:
-            semantic_view.add_metric(measure.fully_qualified_field_name, measure.transform_sql_references(transform_sql), synonyms=measure.synonyms, comment=measure.description)
+        table, dimensions, metrics = fragments
+        semantic_view.add_table(table[0], table_name=table[1], primary_key=table[2], synonyms=table[3], comment=table[4])
+        for dimension in dimensions:
+            semantic_view.add_dimension(*dimension)
+        for metric in metrics:
+            semantic_view.add_metric(*metric)
     
     for relationship in topic.relationships:
         # skip relationships without foreign key to primary key
@@ -0,0 +1,39 @@
+import re
+from typing import Callable, Dict, Optional
+from examples.topic import OmniField, Topic
+
+# Matches ${field_name} and ${view_name.field_name}
+REFERENCE_PATTERN = re.compile(r"\$\{([^}]+)\}")
+
+class ReferenceRewriter:
+    """
+    Rewrites `${...}` field references in SQL strings in a single pass.
+
+    Every distinct reference is resolved once and memoized, so build one rewriter
+    per topic and reuse it for all of the topic's SQL expressions.
+    Without a resolve function the references are replaced by their bare names.
+    """
+
+    def __init__(self, resolve: Optional[Callable[[str], str]] = None):
+        self.resolve = resolve
+        self.resolved: Dict[str, str] = {}
+
+    @classmethod
+    def for_topic(cls, topic: Topic, render_field: Callable[[OmniField], str]) -> "ReferenceRewriter":
+        """
+        Build a rewriter that resolves references to fields of the topic and renders them with `render_field`.
+        """
+        return cls(lambda reference: render_field(topic.find_field(reference)))
+
+    def __call__(self, sql: str) -> str:
+        # split() alternates literal SQL and captured reference names
+        parts = REFERENCE_PATTERN.split(sql)
+        if self.resolve is not None:
+            resolved = self.resolved
+            for i in range(1, len(parts), 2):
+                reference = parts[i]
+                value = resolved.get(reference)
+                if value is None:
+                    value = resolved[reference] = self.resolve(reference)
+                parts[i] = value
+        return "".join(parts)
@@ -0,0 +1,115 @@
+import base64
+import io
+import json
+import threading
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+from typing import Callable, Dict, List
+from omni_python_sdk import Transport
+from omni_python_sdk.transport import TransportResponse
+
+# A stub Omni server for the tests (and the offline benchmarks): query runs, SCIM group
+# listings and embed URLs answered from memory.
+
+BASE_URL = "https://example.omniapp.co"
+QUERY = {"query": {"modelId": "model", "table": "order_items", "fields": ["order_items.id", "order_items.status", "order_items.sale_price"]}}
+
+def encoded_table(table: pa.Table) -> str:
+    sink = io.BytesIO()
+    with ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return base64.b64encode(sink.getvalue()).decode()
+
+def encoded_result(rows: int) -> str:
+    return encoded_table(pa.table({
+        "order_items.id": pa.array(range(rows), pa.int64()),
+        "order_items.status": pa.array(["Complete", "Shipped", "Processing", "Cancelled"] * (rows // 4)),
+        "order_items.sale_price": pa.array([i * 0.25 for i in range(rows)]),
+    }))
+
+class StubTransport(Transport):
+    """
+    Answers query runs with one poll before the result, SCIM group listings in pages and embed URL requests.
+    """
+
+    def __init__(self, rows: int, groups: int):
+        fields = {field: {"label": field.split(".")[1]} for field in QUERY["query"]["fields"]}
+        self.pending = json.dumps({"timed_out": "true", "remaining_job_ids": ["job"]}) + "\n"
+        self.done = "\n".join([
+            json.dumps({"job_id": "job", "result": encoded_result(rows), "summary": {"fields": fields}}),
+            json.dumps({"timed_out": "false", "remaining_job_ids": []}),
+        ]) + "\n"
+        self.groups = [{"id": str(i), "displayName": f"group {i}", "members": []} for i in range(groups)]
+
+    def request(self, method, url, params=None, **kwargs):
+        if url.endswith("/query/run"):
+            body = self.pending
+        elif "/query/wait" in url:
+            body = self.done
+        elif url.endswith("/generate-url"):
+            body = json.dumps({"url": f"{BASE_URL}/embed/login?signature=stub"})
+        else:
+            start = params["startIndex"]
+            page = self.groups[start - 1:start - 1 + params["count"]]
+            body = json.dumps({"totalResults": len(self.groups), "Resources": page})
+        return TransportResponse(200, body.encode("utf-8"), {"Content-Type": "application/json"}, url)
+
+def _bound(column: pa.ChunkedArray, value):
+    return pa.scalar(value).cast(column.type) if not pa.types.is_string(column.type) else str(value)
+
+def filter_mask(column: pa.ChunkedArray, filter: dict) -> pa.ChunkedArray:
+    """
+    Evaluate an EQUALS or range filter on a column like the server would.
+    """
+    kind = filter["kind"]
+    if kind == "EQUALS":
+        mask = pc.is_in(column, value_set=pa.array(filter["values"]).cast(column.type))
+    elif kind == "BETWEEN":
+        mask = pc.and_(pc.greater_equal(column, _bound(column, filter["left_side"])), pc.less_equal(column, _bound(column, filter["right_side"])))
+    else:
+        compare = {
+            "GREATER_THAN_OR_EQUAL": pc.greater_equal, "ON_OR_AFTER": pc.greater_equal, "GREATER_THAN": pc.greater,
+            "LESS_THAN_OR_EQUAL": pc.less_equal, "LESS_THAN": pc.less, "BEFORE": pc.less,
+        }[kind]
+        mask = compare(column, _bound(column, filter["left_side"]))
+    mask = pc.fill_null(mask, False)
+    return pc.invert(mask) if filter.get("is_negative") else mask
+
+def run_query(table: pa.Table, query: dict) -> pa.Table:
+    """
+    Apply a query's filters, sorts and limit to a table.
+    """
+    for field, filter in (query.get("filters") or {}).items():
+        table = table.filter(filter_mask(table.column(field), filter))
+    keys = [(sort["column_name"], "descending" if sort.get("sort_descending") else "ascending") for sort in query.get("sorts") or []]
+    if keys:
+        table = table.sort_by(keys)
+    if query.get("limit") is not None:
+        table = table.slice(0, int(query["limit"]))
+    return table
+
+class QueryTransport(Transport):
+    """
+    Answers query runs at once with `result(query)` (by default the query run against
+    `table`), recording every query body it receives. `result` may also return the
+    encoded result as a string.
+    """
+
+    def __init__(self, table: pa.Table, fields: Dict[str, dict] = None, result: Callable[[dict], pa.Table] = None):
+        self.table = table
+        self.fields = fields if fields is not None else {name: {"is_dimension": True} for name in table.column_names}
+        self.result = result or (lambda query: run_query(self.table, query))
+        self.bodies: List[dict] = []
+        self.lock = threading.Lock()
+
+    def request(self, method, url, params=None, **kwargs):
+        body = kwargs["json"]
+        with self.lock:
+            self.bodies.append(body)
+        result = self.result(body.get("query", body))
+        lines = [
+            json.dumps({"job_id": "job", "result": result if isinstance(result, str) else encoded_table(result), "summary": {"fields": self.fields}}),
+            json.dumps({"timed_out": "false", "remaining_job_ids": []}),
+        ]
+        return TransportResponse(200, ("\n".join(lines) + "\n").encode("utf-8"), {"Content-Type": "application/json"}, url)
@@ -0,0 +1,102 @@
+import unittest
+from unittest import mock
+from omni_python_sdk import ModelCatalog
+
+class StubModels:
+    """
+    Stands in for OmniAPI.list_models, counting the calls. A response of None is a failed request.
+    """
+
+    def __init__(self, models):
+        self.models = models
+        self.calls = 0
+
+    def list_models(self, **filters):
+        self.calls += 1
+        if self.models is None:
+            return None
+        return {"records": [dict(model) for model in self.models]}
+
+MODELS = [
+    {"id": "shared", "name": "Sales", "modelKind": "SHARED", "connectionId": "c1"},
+    {"id": "branch", "name": "Sales", "modelKind": "BRANCH", "connectionId": "c1", "baseModelId": "shared"},
+    {"id": "extension", "name": "Sales Ext", "modelKind": "SHARED_EXTENSION", "connectionId": "c1", "baseModelId": "shared"},
+    {"id": "workbook", "name": "Workbook", "modelKind": "WORKBOOK", "connectionId": "c1", "baseModelId": "extension"},
+    {"id": "other", "name": "Marketing", "modelKind": "SHARED", "connectionId": "c2"},
+]
+
+class TestModelCatalog(unittest.TestCase):
+    def setUp(self):
+        self.api = StubModels(MODELS)
+        self.catalog = ModelCatalog(self.api, ttl=300)
+
+    def test_lookups(self):
+        self.assertEqual(len(self.catalog), 5)
+        self.assertEqual(self.catalog.get_by_name("Sales", modelKind="SHARED")["id"], "shared")
+        self.assertIsNone(self.catalog.get_by_name("Sales"))
+        self.assertEqual([model["id"] for model in self.catalog.by_connection("c2")], ["other"])
+        self.assertEqual([model["id"] for model in self.catalog.branches("shared")], ["branch"])
+        self.assertEqual([model["id"] for model in self.catalog.extensions("shared")], ["extension"])
+        self.assertEqual([model["id"] for model in self.catalog.ancestors("workbook")], ["extension", "shared"])
+        self.assertEqual(self.api.calls, 1)
+
+    def test_descendants(self):
+        self.assertEqual([model["id"] for model in self.catalog.descendants("shared")], ["branch", "extension", "workbook"])
+        self.assertEqual(self.catalog.descendants("other"), [])
+
+    def test_descendants_of_a_cycle(self):
+        self.api.models = [
+            {"id": "a", "name": "A", "baseModelId": "b"},
+            {"id": "b", "name": "B", "baseModelId": "a"},
+        ]
+        self.assertEqual([model["id"] for model in self.catalog.descendants("a")], ["b"])
+
+    def test_ttl_refresh(self):
+        with mock.patch("omni_python_sdk.catalog.time.monotonic", return_value=1000.0):
+            self.catalog.get("shared")
+        self.api.models = MODELS + [{"id": "new", "name": "New", "modelKind": "SHARED"}]
+        with mock.patch("omni_python_sdk.catalog.time.monotonic", return_value=1299.0):
+            self.assertNotIn("new", self.catalog)
+        with mock.patch("omni_python_sdk.catalog.time.monotonic", return_value=1300.0):
+            self.assertIn("new", self.catalog)
+        self.assertEqual(self.api.calls, 2)
+
+    def test_invalidate(self):
+        len(self.catalog)
+        self.api.models = MODELS[:1]
+        self.catalog.invalidate()
+        self.assertEqual(len(self.catalog), 1)
+        self.assertEqual(self.catalog.children("shared"), [])
+
+    def test_refresh_reindexes_only_changed_records(self):
+        len(self.catalog)
+        renamed = dict(MODELS[4], name="Growth")
+        self.api.models = MODELS[1:4] + [renamed]
+        with mock.patch.object(self.catalog, "_index", wraps=self.catalog._index) as index, \
+                mock.patch.object(self.catalog, "_unindex", wraps=self.catalog._unindex) as unindex:
+            self.assertTrue(self.catalog.refresh())
+        self.assertEqual([call.args[0]["id"] for call in index.call_args_list], ["other"])
+        self.assertEqual(sorted(call.args[0]["id"] for call in unindex.call_args_list), ["other", "shared"])
+        self.assertEqual(self.catalog.find_by_name("Marketing"), [])
+        self.assertEqual(self.catalog.find_by_name("Growth"), [renamed])
+        self.assertEqual(self.catalog.by_kind("SHARED"), [renamed])
+
+    def test_failed_refresh_backs_off(self):
+        with mock.patch("omni_python_sdk.catalog.time.monotonic", return_value=1000.0):
+            len(self.catalog)
+        self.api.models = None
+        with mock.patch("omni_python_sdk.catalog.time.monotonic", return_value=1300.0):
+            # the failed listing keeps the previous models
+            self.assertEqual(len(self.catalog), 5)
+            self.assertEqual(len(self.catalog), 5)
+        self.assertEqual(self.api.calls, 2)
+        with mock.patch("omni_python_sdk.catalog.time.monotonic", return_value=1599.0):
+            self.catalog.get("shared")
+        self.assertEqual(self.api.calls, 2)
+        self.api.models = MODELS[:1]
+        with mock.patch("omni_python_sdk.catalog.time.monotonic", return_value=1600.0):
+            self.assertEqual(len(self.catalog), 1)
+        self.assertEqual(self.api.calls, 3)
+
+if __name__ == "__main__":
+    unittest.main()
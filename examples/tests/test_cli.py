@@ -0,0 +1,148 @@
+import io
+import json
+import os
+import stat
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from omni_python_sdk import OmniAPI
+from omni_python_sdk.cli import run_command
+from omni_python_sdk.daemon import CommandContext, DaemonServer, forward
+from examples.tests.stub_transport import BASE_URL, QUERY, StubTransport
+
+class CountingStub(StubTransport):
+    def __init__(self):
+        super().__init__(rows=8, groups=3)
+        self.runs = 0
+
+    def request(self, method, url, params=None, **kwargs):
+        if url.endswith("/query/run"):
+            self.runs += 1
+        return super().request(method, url, params, **kwargs)
+
+class TestCommandLine(unittest.TestCase):
+    def setUp(self):
+        self.transport = CountingStub()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_query_in_process(self):
+        out = io.BytesIO()
+        api = OmniAPI("key", BASE_URL, transport=self.transport)
+        self.assertEqual(run_command(["query", json.dumps(QUERY)], CommandContext(api), out), 0)
+        self.assertFalse(out.closed)
+        lines = out.getvalue().decode("utf-8").splitlines()
+        self.assertEqual(lines[0], '"order_items.id","order_items.status","order_items.sale_price"')
+        self.assertEqual(len(lines), 9)
+
+    def test_query_through_daemon(self):
+        socket_path = os.path.join(self.directory.name, "omni-sdk.sock")
+        server = DaemonServer(socket_path, run_command, ttl=60, client=lambda key, url: OmniAPI(key, url, transport=self.transport))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            credentials = {"api_key": "key", "base_url": BASE_URL}
+            outputs = []
+            for _ in range(2):
+                out = io.BytesIO()
+                self.assertEqual(forward(["query", json.dumps(QUERY), "--format", "ndjson"], credentials, socket_path, out, timeout=10), (0, None))
+                outputs.append(out.getvalue())
+            self.assertEqual(len(outputs[0].splitlines()), 8)
+            self.assertEqual(outputs[0], outputs[1])
+            # the second query is served from the daemon's cache
+            self.assertEqual(self.transport.runs, 1)
+
+            output = os.path.join(self.directory.name, "result.csv")
+            self.assertEqual(forward(["query", json.dumps(QUERY), "--output", output], credentials, socket_path, io.BytesIO(), timeout=10), (0, None))
+            with open(output, encoding="utf-8") as f:
+                self.assertEqual(len(f.read().splitlines()), 9)
+
+            status, error = forward(["group-id", "missing"], credentials, socket_path, io.BytesIO(), timeout=10)
+            self.assertEqual((status, error), (1, "No group named 'missing'."))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_daemon_socket_and_credentials(self):
+        socket_path = os.path.join(self.directory.name, "omni-sdk.sock")
+        umask = os.umask(0o022)
+        try:
+            server = DaemonServer(socket_path, run_command, client=lambda key, url: OmniAPI(key, url, transport=self.transport))
+            self.assertEqual(os.umask(0o022), 0o022)
+        finally:
+            os.umask(umask)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            self.assertEqual(stat.S_IMODE(os.stat(socket_path).st_mode), 0o600)
+            for credentials in ({}, {"api_key": "", "base_url": BASE_URL}, {"api_key": "key"}):
+                status, error = forward(["groups"], credentials, socket_path, io.BytesIO(), timeout=10)
+                self.assertEqual(status, 1)
+                self.assertIn("No Omni API key or base URL", error)
+            self.assertEqual(server.contexts, {})
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_socket_is_private_before_the_chmod(self):
+        socket_path = os.path.join(self.directory.name, "omni-sdk.sock")
+        umask = os.umask(0o022)
+        try:
+            with mock.patch("omni_python_sdk.daemon.os.chmod"):
+                server = DaemonServer(socket_path, run_command)
+        finally:
+            os.umask(umask)
+        try:
+            self.assertEqual(stat.S_IMODE(os.stat(socket_path).st_mode) & 0o077, 0)
+        finally:
+            server.server_close()
+
+class TestCommandContext(unittest.TestCase):
+    def test_without_ttl_nothing_is_cached(self):
+        context = CommandContext(None)
+        self.assertEqual([context.cached("a", lambda: 1), context.cached("a", lambda: 2)], [1, 2])
+        self.assertEqual(len(context), 0)
+
+    def test_failures_are_not_cached(self):
+        context = CommandContext(None, ttl=60)
+        self.assertIsNone(context.cached("a", lambda: None))
+        self.assertEqual(context.cached("a", lambda: 1), 1)
+
+    def test_entry_limit(self):
+        context = CommandContext(None, ttl=60, maxsize=2)
+        context.cached("a", lambda: 1)
+        context.cached("b", lambda: 2)
+        # reading "a" makes "b" the least recently used
+        self.assertEqual(context.cached("a", lambda: 0), 1)
+        context.cached("c", lambda: 3)
+        self.assertEqual(len(context), 2)
+        self.assertEqual(context.cached("b", lambda: 0), 0)
+        self.assertEqual(context.cached("c", lambda: -1), 3)
+
+    def test_byte_limit(self):
+        context = CommandContext(None, ttl=60, max_bytes=100)
+        size = len
+        context.cached("a", lambda: b"x" * 60, size)
+        context.cached("b", lambda: b"x" * 30, size)
+        self.assertEqual(context.cached_bytes, 90)
+        context.cached("c", lambda: b"x" * 40, size)
+        # "a" was evicted to make room
+        self.assertEqual((len(context), context.cached_bytes), (2, 70))
+        self.assertEqual(context.cached("a", lambda: b"new", size), b"new")
+        # values larger than the limit are returned but not kept
+        self.assertEqual(len(context.cached("big", lambda: b"x" * 101, size)), 101)
+        self.assertEqual(context.cached("big", lambda: b"", size), b"")
+        context.clear()
+        self.assertEqual((len(context), context.cached_bytes), (0, 0))
+
+    def test_query_results_are_sized(self):
+        transport = CountingStub()
+        context = CommandContext(OmniAPI("key", BASE_URL, transport=transport), ttl=60, max_bytes=1)
+        for _ in range(2):
+            self.assertEqual(run_command(["query", json.dumps(QUERY)], context, io.BytesIO()), 0)
+        # the result does not fit, every run queries again
+        self.assertEqual((transport.runs, len(context), context.cached_bytes), (2, 0, 0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import base64
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import pyarrow as pa
+from omni_python_sdk import OmniAPI
+from unittest import mock
+from omni_python_sdk.decode import MemoryBudget, decode_to_buffer, decode_to_file, default_decode_dir, map_table
+from examples.tests.stub_transport import BASE_URL, QueryTransport, encoded_table
+
+TABLE = pa.table({
+    "order_items.id": pa.array(range(1000), pa.int64()),
+    "order_items.status": pa.array(["Complete", "Shipped"] * 500),
+})
+
+class TestDecodeToFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        for directory in (default_decode_dir(), self.directory.name):
+            path = decode_to_file(encoded_table(TABLE), directory)
+            self.assertEqual(os.path.dirname(path), directory or tempfile.gettempdir())
+            table = map_table(path)
+            self.assertFalse(os.path.exists(path))
+            # the mapping outlives the file name
+            self.assertEqual(table, TABLE)
+
+    def test_failure_leaves_no_file(self):
+        with self.assertRaises(pa.ArrowInvalid):
+            decode_to_file(base64.b64encode(b"not an arrow stream").decode(), self.directory.name)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+class TestDecodePool(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.transport = QueryTransport(TABLE)
+        self.api = OmniAPI("key", BASE_URL, transport=self.transport, decode_processes=1, decode_dir=self.directory.name)
+
+    def tearDown(self):
+        self.api.close()
+        self.directory.cleanup()
+
+    def test_worker_decodes(self):
+        table, _ = self.api.run_query_blocking({"query": {}})
+        self.assertEqual(table, TABLE)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_worker_failure_propagates(self):
+        corrupt = base64.b64encode(b"not an arrow stream").decode()
+        # the worker's exception is raised in the caller
+        with self.assertRaises(pa.ArrowInvalid):
+            self.api._decode_result(corrupt)
+        self.transport.result = lambda query: corrupt
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertIsNone(self.api.run_query_blocking({"query": {}}))
+        self.assertIn("Request Failed", out.getvalue())
+        self.assertEqual(os.listdir(self.directory.name), [])
+        # the pool keeps working after a failed decode
+        self.transport.result = lambda query: TABLE
+        self.assertEqual(self.api.run_query_blocking({"query": {}})[0], TABLE)
+
+class TestMemoryBudget(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_query(self, budget: MemoryBudget, result=TABLE):
+        transport = QueryTransport(TABLE, result=lambda query: result)
+        api = OmniAPI("key", BASE_URL, transport=transport, memory_budget=budget, spill_dir=self.directory.name)
+        with mock.patch("omni_python_sdk.api.decode_to_file", wraps=decode_to_file) as spill:
+            response = api.run_query_blocking({"query": {}})
+        return response, spill.call_count
+
+    def test_over_budget_spills_to_file(self):
+        budget = MemoryBudget(0)
+        (table, _), spilled = self.run_query(budget)
+        self.assertEqual(table, TABLE)
+        self.assertEqual((spilled, budget.spills, budget.reserved), (1, 1, 0))
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_within_budget_decodes_in_memory(self):
+        budget = MemoryBudget(1 << 40)
+        (table, _), spilled = self.run_query(budget)
+        self.assertEqual(table, TABLE)
+        self.assertEqual((spilled, budget.spills, budget.reserved), (0, 0, 0))
+
+    def test_reservation_released_on_exception(self):
+        budget = MemoryBudget(1 << 40)
+        with self.assertRaises(RuntimeError):
+            with budget.reserve(100) as fits:
+                self.assertTrue(fits)
+                self.assertEqual(budget.reserved, 100)
+                raise RuntimeError
+        self.assertEqual(budget.reserved, 0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            response, _ = self.run_query(budget, base64.b64encode(b"not an arrow stream").decode())
+        self.assertIsNone(response)
+        self.assertEqual(budget.reserved, 0)
+
+    def test_reservations_add_up(self):
+        budget = MemoryBudget(pa.total_allocated_bytes() + 100)
+        with budget.reserve(60) as first, budget.reserve(60) as second:
+            self.assertEqual((first, second, budget.reserved), (True, False, 60))
+        self.assertEqual((budget.reserved, budget.spills), (0, 1))
+
+    def test_decode_to_buffer_padding(self):
+        # sizes spanning several chunks of the base64 reader too
+        for size in list(range(8)) + [(1 << 20) + 1, (1 << 20) + 2]:
+            data = os.urandom(size)
+            encoded = base64.b64encode(data).decode()
+            self.assertEqual(decode_to_buffer(encoded).to_pybytes(), data, size)
+        # every padding length: none, "=" and "=="
+        self.assertEqual({base64.b64encode(bytes(size)).decode().count("=") for size in range(3)}, {0, 1, 2})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import itertools
+import json
+import threading
+import unittest
+from omni_python_sdk import EmbedUrlCache, OmniAPI, Transport
+from omni_python_sdk.embed import embed_url_key
+from omni_python_sdk.transport import TransportResponse
+
+BASE_URL = "https://example.omniapp.co"
+
+class EmbedTransport(Transport):
+    """
+    Answers embed URL requests with a new URL every time, failing for content paths in `failing`.
+    """
+
+    def __init__(self, failing=()):
+        self.requests = []
+        self.failing = set(failing)
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def request(self, method, url, params=None, json=None, **kwargs):
+        with self.lock:
+            self.requests.append(json)
+            number = next(self.counter)
+        if json["contentPath"] in self.failing:
+            return TransportResponse(500, b"{}", {}, url)
+        body = {"url": f"{BASE_URL}/embed/login?path={json['contentPath']}&n={number}"}
+        return TransportResponse(200, _dumps(body), {"Content-Type": "application/json"}, url)
+
+def _dumps(value) -> bytes:
+    return json.dumps(value).encode("utf-8")
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def body(path: str, **options) -> dict:
+    return {"contentPath": path, "externalId": "user-1", "name": "User", "secret": "s", **options}
+
+class TestEmbedUrlCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_ttl_expiry(self):
+        cache = EmbedUrlCache(ttl=30, clock=self.clock)
+        cache.put("a", "url")
+        self.clock.now = 29.9
+        self.assertEqual(cache.get("a"), "url")
+        self.clock.now = 30
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_lru_eviction(self):
+        cache = EmbedUrlCache(maxsize=2, clock=self.clock)
+        cache.put("a", "url a")
+        cache.put("b", "url b")
+        # reading "a" makes "b" the least recently used
+        self.assertEqual(cache.get("a"), "url a")
+        cache.put("c", "url c")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), ("url a", "url c"))
+        cache.put("a", "new url a")
+        cache.put("d", "url d")
+        self.assertIsNone(cache.get("c"))
+        self.assertEqual(cache.get("a"), "new url a")
+
+    def test_key_ignores_option_order(self):
+        first = body("/dashboards/a", theme="dark", userAttributes={"region": "EU", "tier": "gold"})
+        second = dict(reversed(list(first.items())))
+        second["userAttributes"] = {"tier": "gold", "region": "EU"}
+        self.assertEqual(embed_url_key(first), embed_url_key(second))
+        self.assertNotEqual(embed_url_key(first), embed_url_key({**first, "theme": "light"}))
+
+class TestGenerateEmbedUrls(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.transport = EmbedTransport(failing=["/dashboards/broken"])
+        self.api = OmniAPI("key", BASE_URL, transport=self.transport)
+
+    def test_duplicates_are_sent_once(self):
+        bodies = [body("/dashboards/a"), body("/dashboards/b"), dict(reversed(list(body("/dashboards/a").items())))]
+        urls = self.api.generate_embed_urls(bodies)
+        self.assertEqual(len(self.transport.requests), 2)
+        self.assertEqual(urls[0], urls[2])
+        self.assertNotEqual(urls[0], urls[1])
+
+    def test_cache_reuses_urls_until_they_expire(self):
+        cache = EmbedUrlCache(ttl=30, clock=self.clock)
+        first = self.api.generate_embed_urls([body("/dashboards/a")], cache=cache)
+        self.clock.now = 10
+        self.assertEqual(self.api.generate_embed_urls([body("/dashboards/a")], cache=cache), first)
+        self.assertEqual(len(self.transport.requests), 1)
+        self.clock.now = 30
+        self.assertNotEqual(self.api.generate_embed_urls([body("/dashboards/a")], cache=cache), first)
+        self.assertEqual(len(self.transport.requests), 2)
+
+    def test_failures_are_none_and_not_cached(self):
+        cache = EmbedUrlCache(clock=self.clock)
+        urls = self.api.generate_embed_urls([body("/dashboards/broken"), body("/dashboards/a")], cache=cache)
+        self.assertIsNone(urls[0])
+        self.assertIsNotNone(urls[1])
+        self.assertEqual(len(cache), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import pyarrow as pa
+import pyarrow.csv as csv
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from omni_python_sdk.export import FORMATS, write_batches
+
+TABLE = pa.table({"order_items.id": [1, 2, 3], "order_items.status": ["Complete", "Shipped", "Returned"]})
+
+def read(data: bytes, format: str) -> pa.Table:
+    if format == "csv":
+        return csv.read_csv(io.BytesIO(data))
+    if format == "parquet":
+        return pq.read_table(io.BytesIO(data))
+    if format == "arrow":
+        return ipc.open_file(io.BytesIO(data)).read_all()
+    return pa.Table.from_pylist([json.loads(line) for line in data.decode("utf-8").splitlines()])
+
+class TestWriteBatches(unittest.TestCase):
+    def test_path(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for format in FORMATS:
+                path = os.path.join(directory, f"result.{format}")
+                self.assertEqual(write_batches(iter(TABLE.to_batches(max_chunksize=2)), TABLE.schema, path, format), 3)
+                with open(path, "rb") as f:
+                    self.assertEqual(read(f.read(), format).to_pylist(), TABLE.to_pylist(), format)
+
+    def test_file_object_is_left_open(self):
+        for format in FORMATS:
+            sink = io.BytesIO()
+            self.assertEqual(write_batches(iter(TABLE.to_batches(max_chunksize=2)), TABLE.schema, sink, format), 3)
+            self.assertFalse(sink.closed, format)
+            self.assertEqual(read(sink.getvalue(), format).to_pylist(), TABLE.to_pylist(), format)
+
+    def test_compressed_file_object(self):
+        sink = io.BytesIO()
+        write_batches(iter(TABLE.to_batches()), TABLE.schema, sink, "csv", compression="gzip")
+        self.assertFalse(sink.closed)
+        with pa.input_stream(pa.BufferReader(sink.getvalue()), compression="gzip") as source:
+            self.assertEqual(csv.read_csv(source).to_pylist(), TABLE.to_pylist())
+
+if __name__ == "__main__":
+    unittest.main()
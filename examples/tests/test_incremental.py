@@ -0,0 +1,130 @@
+import datetime
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pyarrow as pa
+from omni_python_sdk import IncrementalQuery, OmniAPI
+from examples.tests.stub_transport import BASE_URL, QueryTransport
+
+DATE = "order_items.created_at[date]"
+QUERY = {"query": {
+    "modelId": "model",
+    "table": "order_items",
+    "fields": [DATE, "order_items.status", "order_items.count"],
+    "sorts": [{"column_name": DATE, "sort_descending": False}, {"column_name": "order_items.status", "sort_descending": False}],
+}}
+
+def day(n: int) -> datetime.date:
+    return datetime.date(2024, 1, 1) + datetime.timedelta(days=n)
+
+def daily(rows) -> pa.Table:
+    return pa.table({
+        DATE: pa.array([day(n) for n, _, _ in rows], pa.date32()),
+        "order_items.status": [status for _, status, _ in rows],
+        "order_items.count": pa.array([count for _, _, count in rows], pa.int64()),
+    })
+
+class TestIncrementalQuery(unittest.TestCase):
+    def setUp(self):
+        self.transport = QueryTransport(daily([(0, "Complete", 3), (0, "Shipped", 1), (1, "Complete", 2), (2, "Complete", 5)]))
+        self.api = OmniAPI("key", BASE_URL, transport=self.transport)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "daily.arrow")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def window(self, body: dict) -> dict:
+        return body["query"]["filters"][DATE]
+
+    def test_first_run(self):
+        query = IncrementalQuery(self.api, QUERY, DATE, path=self.path)
+        self.assertIsNone(query.watermark)
+        table = query.refresh()
+        self.assertTrue(table.equals(self.transport.table))
+        self.assertEqual(query.fetched_rows, 4)
+        self.assertEqual(query.watermark, day(2))
+        self.assertNotIn("filters", self.transport.bodies[0]["query"])
+        # a new run starts from the saved table
+        self.assertTrue(IncrementalQuery(self.api, QUERY, DATE, path=self.path).table.equals(table))
+
+    def test_overlap_is_queried_again(self):
+        query = IncrementalQuery(self.api, QUERY, DATE, overlap=1, path=self.path)
+        query.refresh()
+        # the count of day 1 changed and day 3 is new
+        self.transport.table = daily([(0, "Complete", 3), (0, "Shipped", 1), (1, "Complete", 4), (2, "Complete", 5), (3, "Shipped", 7)])
+        table = query.refresh()
+        self.assertEqual(self.window(self.transport.bodies[-1]), {"kind": "ON_OR_AFTER", "type": "date", "is_negative": False, "left_side": "2024-01-02"})
+        self.assertEqual(query.fetched_rows, 3)
+        self.assertTrue(table.equals(self.transport.table), table.to_pylist())
+        self.assertEqual(query.watermark, day(3))
+
+    def test_late_arriving_row(self):
+        query = IncrementalQuery(self.api, QUERY, DATE, overlap=1)
+        query.refresh()
+        # a row for day 1 arrives after day 2 was fetched, and a day 0 row outside the overlap
+        self.transport.table = daily([(0, "Complete", 3), (0, "Shipped", 1), (0, "Cancelled", 9), (1, "Complete", 2), (1, "Shipped", 6), (2, "Complete", 5)])
+        table = query.refresh()
+        rows = [(row[DATE], row["order_items.status"]) for row in table.to_pylist()]
+        self.assertIn((day(1), "Shipped"), rows)
+        self.assertNotIn((day(0), "Cancelled"), rows)
+        self.assertEqual(len(rows), len(set(rows)))
+        self.assertEqual(rows, sorted(rows))
+
+    def test_rows_deleted_in_the_window_are_dropped(self):
+        query = IncrementalQuery(self.api, QUERY, DATE, overlap=1)
+        query.refresh()
+        self.transport.table = daily([(0, "Complete", 3), (0, "Shipped", 1), (2, "Complete", 5)])
+        self.assertTrue(query.refresh().equals(self.transport.table))
+
+    def test_query_filter_is_intersected_with_the_window(self):
+        body = {"query": {**QUERY["query"], "filters": {DATE: {"kind": "BETWEEN", "type": "date", "is_negative": False, "left_side": "2024-01-01", "right_side": "2024-01-02"}}}}
+        query = IncrementalQuery(self.api, body, DATE, overlap=0)
+        self.assertEqual(query.refresh().column(DATE).to_pylist(), [day(0), day(0), day(1)])
+        query.refresh()
+        self.assertEqual(self.window(self.transport.bodies[-1]), {"kind": "BETWEEN", "type": "date", "is_negative": False, "left_side": "2024-01-02", "right_side": "2024-01-02"})
+        # the query's filter ends before the window: nothing to query
+        body["query"]["filters"][DATE]["right_side"] = "2024-01-01"
+        query = IncrementalQuery(self.api, body, DATE, overlap=0)
+        query.table = daily([(1, "Complete", 2)])
+        requests = len(self.transport.bodies)
+        self.assertEqual(query.refresh().num_rows, 0)
+        self.assertEqual(len(self.transport.bodies), requests)
+
+    def test_string_dates(self):
+        self.transport.table = self.transport.table.set_column(0, DATE, self.transport.table.column(DATE).cast(pa.string()))
+        query = IncrementalQuery(self.api, QUERY, DATE, overlap=1)
+        query.refresh()
+        self.assertEqual(query.watermark, "2024-01-03")
+        self.assertEqual(query.refresh().num_rows, 4)
+        self.assertEqual(self.window(self.transport.bodies[-1])["left_side"], "2024-01-02")
+
+    def test_non_date_watermark(self):
+        for values in (pa.array([1, 2], pa.int64()), pa.array([datetime.datetime(2024, 1, 1)] * 2, pa.timestamp("us"))):
+            self.transport.table = pa.table({DATE: values, "order_items.status": ["a", "b"]})
+            query = IncrementalQuery(self.api, QUERY, DATE)
+            with self.assertRaisesRegex(ValueError, r"not a date"):
+                query.refresh()
+            self.assertIsNone(query.table)
+        self.transport.table = pa.table({DATE: ["yesterday"], "order_items.status": ["a"]})
+        with self.assertRaisesRegex(ValueError, r"not ISO dates"):
+            IncrementalQuery(self.api, QUERY, DATE).refresh()
+        with self.assertRaisesRegex(ValueError, r"no 'missing' column"):
+            IncrementalQuery(self.api, QUERY, "missing").refresh()
+
+    def test_crash_before_replace_keeps_the_saved_table(self):
+        query = IncrementalQuery(self.api, QUERY, DATE, path=self.path)
+        saved = query.refresh()
+        self.transport.table = daily([(2, "Complete", 6), (3, "Complete", 1)])
+        with mock.patch("omni_python_sdk.incremental.os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                query.refresh()
+        self.assertEqual(os.listdir(self.directory.name), ["daily.arrow"])
+        restarted = IncrementalQuery(self.api, QUERY, DATE, path=self.path)
+        self.assertTrue(restarted.table.equals(saved))
+        # the next run replaces the window from day 1 of the saved table
+        self.assertEqual(restarted.refresh().column("order_items.count").to_pylist(), [3, 1, 6, 1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import importlib.util
+import sys
+import unittest
+from unittest import mock
+import pyarrow as pa
+import pyarrow.compute as pc
+from omni_python_sdk import LocalQueryEngine, OmniAPI
+from omni_python_sdk.local import query_hash
+from examples.tests.stub_transport import BASE_URL, QUERY, QueryTransport
+
+ORDERS = pa.table({
+    "order_items.id": pa.array([1, 2, 3, 4, 5], pa.int64()),
+    "order_items.status": ["Complete", "Shipped", "Complete", None, "Complete"],
+    "order_items.user_id": pa.array([10, 10, 20, 30, 40], pa.int64()),
+    "order_items.sale_price": [1.5, 2.0, 3.5, 4.0, 5.0],
+})
+USERS = pa.table({
+    "users.id": pa.array([10, 20, 50], pa.int64()),
+    "users.name": ["Ann", "Bob", "Eve"],
+})
+
+def engine_with_tables() -> LocalQueryEngine:
+    engine = LocalQueryEngine()
+    engine.register("orders", ORDERS)
+    engine.register("users", USERS)
+    return engine
+
+class TestAcero(unittest.TestCase):
+    def setUp(self):
+        self.engine = engine_with_tables()
+
+    def test_filter(self):
+        complete = self.engine.filter("orders", pc.field("order_items.status") == "Complete")
+        self.assertEqual(complete.column("order_items.id").to_pylist(), [1, 3, 5])
+        # nulls do not match
+        expensive = self.engine.filter("orders", pc.field("order_items.sale_price") > 3, columns=["order_items.id"])
+        self.assertEqual(expensive.column_names, ["order_items.id"])
+        self.assertEqual(expensive.column("order_items.id").to_pylist(), [3, 4, 5])
+
+    def test_group_by(self):
+        grouped = self.engine.group_by("orders", ["order_items.status"], [("order_items.sale_price", "sum"), ("order_items.user_id", "count_distinct")])
+        rows = {row["order_items.status"]: row for row in grouped.to_pylist()}
+        self.assertEqual(set(rows), {"Complete", "Shipped", None})
+        self.assertEqual(rows["Complete"]["order_items.sale_price_sum"], 10.0)
+        self.assertEqual(rows["Complete"]["order_items.user_id_count_distinct"], 3)
+        self.assertEqual(rows[None]["order_items.sale_price_sum"], 4.0)
+        # a single key may be passed as a string
+        self.assertEqual(self.engine.group_by("orders", "order_items.user_id", [("order_items.id", "count")]).num_rows, 4)
+
+    def test_join(self):
+        inner = self.engine.join("orders", "users", "order_items.user_id", "users.id")
+        self.assertEqual(sorted(inner.column("order_items.id").to_pylist()), [1, 2, 3])
+        self.assertEqual(dict(zip(inner.column("order_items.id").to_pylist(), inner.column("users.name").to_pylist())), {1: "Ann", 2: "Ann", 3: "Bob"})
+        left = self.engine.join("orders", "users", "order_items.user_id", "users.id", join_type="left outer")
+        self.assertEqual(left.num_rows, ORDERS.num_rows)
+        self.assertEqual(left.filter(pc.field("order_items.id") == 5).column("users.name").to_pylist(), [None])
+
+    def test_unknown_table(self):
+        with self.assertRaises(KeyError):
+            self.engine.filter("missing", pc.field("a") == 1)
+
+class TestRegistry(unittest.TestCase):
+    def test_fetch_registers_the_result_once(self):
+        transport = QueryTransport(ORDERS)
+        engine = LocalQueryEngine(OmniAPI("key", BASE_URL, transport=transport))
+        name = engine.fetch(QUERY)
+        self.assertEqual(name, query_hash(QUERY))
+        self.assertIn(name, engine)
+        self.assertTrue(engine.table(name).equals(ORDERS))
+        self.assertEqual(engine.fetch(QUERY), name)
+        self.assertEqual(len(transport.bodies), 1)
+        engine.fetch(QUERY, refresh=True)
+        self.assertEqual(len(transport.bodies), 2)
+        self.assertEqual(engine.fetch(QUERY, name="orders"), "orders")
+
+    def test_query_hash_ignores_key_order(self):
+        self.assertEqual(query_hash({"a": 1, "b": [1, 2]}), query_hash({"b": [1, 2], "a": 1}))
+        self.assertNotEqual(query_hash({"a": 1}), query_hash({"a": 2}))
+
+    def test_fetch_needs_a_client(self):
+        with self.assertRaisesRegex(ValueError, "OmniAPI client"):
+            LocalQueryEngine().fetch(QUERY)
+
+    def test_drop(self):
+        engine = engine_with_tables()
+        engine.drop("users")
+        engine.drop("users")
+        self.assertNotIn("users", engine)
+
+    def test_sql_without_duckdb(self):
+        engine = engine_with_tables()
+        with mock.patch.dict(sys.modules, {"duckdb": None}):
+            with self.assertRaisesRegex(ImportError, r"omni_python_sdk\[local\]"):
+                engine.sql("SELECT 1")
+        # the Acero paths do not need it
+        self.assertEqual(engine.group_by("orders", "order_items.status", [("order_items.id", "count")]).num_rows, 3)
+
+@unittest.skipUnless(importlib.util.find_spec("duckdb"), "duckdb is not installed")
+class TestSQL(unittest.TestCase):
+    def setUp(self):
+        self.engine = engine_with_tables()
+
+    def tearDown(self):
+        self.engine.close()
+
+    def test_group_by(self):
+        result = self.engine.sql('SELECT "order_items.status", SUM("order_items.sale_price") AS total FROM orders GROUP BY 1 ORDER BY 1 NULLS LAST')
+        self.assertIsInstance(result, pa.Table)
+        self.assertEqual(result.to_pylist(), [
+            {"order_items.status": "Complete", "total": 10.0},
+            {"order_items.status": "Shipped", "total": 2.0},
+            {"order_items.status": None, "total": 4.0},
+        ])
+
+    def test_join(self):
+        result = self.engine.sql('SELECT "order_items.id", "users.name" FROM orders JOIN users ON "order_items.user_id" = "users.id" ORDER BY 1')
+        self.assertEqual(result.column("users.name").to_pylist(), ["Ann", "Ann", "Bob"])
+
+    def test_tables_registered_after_connecting(self):
+        self.engine.sql("SELECT 1")
+        self.engine.register("more", pa.table({"n": [1, 2, 3]}))
+        self.assertEqual(self.engine.sql("SELECT SUM(n) AS n FROM more").column("n").to_pylist(), [6])
+        # registering again replaces the table
+        self.engine.register("more", pa.table({"n": [4]}))
+        self.assertEqual(self.engine.sql("SELECT SUM(n) AS n FROM more").column("n").to_pylist(), [4])
+        self.engine.drop("more")
+        import duckdb
+        with self.assertRaises(duckdb.Error):
+            self.engine.sql("SELECT * FROM more")
+
+    def test_reconnect_after_close(self):
+        self.engine.sql("SELECT 1")
+        self.engine.close()
+        self.assertEqual(self.engine.sql("SELECT COUNT(*) AS n FROM users").column("n").to_pylist(), [3])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import unittest
+from omni_python_sdk import OmniAPI, Transport
+from omni_python_sdk.transport import TransportResponse
+
+BASE_URL = "https://example.omniapp.co"
+
+class GroupsTransport(Transport):
+    """
+    Lists groups (with or without their members), gets and updates single groups and
+    deletes users.
+    """
+
+    def __init__(self, groups, list_members=False):
+        self.groups = groups
+        self.list_members = list_members
+
+    def request(self, method, url, params=None, **kwargs):
+        if method == "DELETE":
+            return TransportResponse(204, b"", {}, url)
+        if url.endswith("/groups"):
+            listed = [group if self.list_members else {"id": group["id"], "displayName": group["displayName"]} for group in self.groups.values()]
+            body = {"totalResults": len(listed), "Resources": listed[params["startIndex"] - 1:][:params["count"]]}
+        else:
+            group_id = url.rsplit("/", 1)[1]
+            if method == "PUT":
+                self.groups[group_id] = kwargs["json"]
+            body = self.groups[group_id]
+        return TransportResponse(200, json.dumps(body).encode("utf-8"), {"Content-Type": "application/json"}, url)
+
+class TestGroupMembershipIndex(unittest.TestCase):
+    def setUp(self):
+        groups = {
+            "g1": {"id": "g1", "displayName": "Admins", "members": [{"value": "u1"}, {"value": "u2"}]},
+            "g2": {"id": "g2", "displayName": "Analysts", "members": [{"value": "u2"}]},
+            "g3": {"id": "g3", "displayName": "Empty", "members": []},
+        }
+        self.api = OmniAPI("key", BASE_URL, transport=GroupsTransport(groups))
+        self.index = self.api.build_membership_index()
+
+    def test_both_directions(self):
+        self.assertEqual(self.index.groups_of("u2"), {"g1", "g2"})
+        self.assertEqual(self.index.members_of("g1"), {"u1", "u2"})
+        self.assertEqual(self.index.group_names_of("u2"), ["Admins", "Analysts"])
+        self.assertEqual(self.index.groups_of("nobody"), set())
+
+    def test_client_updates_index(self):
+        self.api.add_user_to_group("Empty", "u1")
+        self.api.remove_user_from_group("Admins", "u1")
+        self.assertEqual(self.index.groups_of("u1"), {"g3"})
+        self.assertEqual(self.index.members_of("g1"), {"u2"})
+
+    def test_rebuild_lists_groups_again(self):
+        for list_members in (False, True):
+            self.api.transport.list_members = list_members
+            self.api.build_membership_index()
+            self.api.transport.groups["g3"] = {"id": "g3", "displayName": "Empty", "members": [{"value": "u3"}]}
+            self.assertEqual(self.api.build_membership_index().groups_of("u3"), {"g3"})
+            self.api.transport.groups["g3"] = {"id": "g3", "displayName": "Empty", "members": []}
+
+    def test_deleted_user_is_removed(self):
+        self.api.delete_user_by_id("u2")
+        self.assertEqual(self.index.groups_of("u2"), set())
+        self.assertEqual(self.index.members_of("g1"), {"u1"})
+        self.assertEqual(self.index.members_of("g2"), set())
+
+    def test_to_arrow(self):
+        table = self.index.to_arrow()
+        self.assertEqual(table.column_names, ["group_id", "group_name", "user_id"])
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(set(zip(*table.to_pydict().values())), {("g1", "Admins", "u1"), ("g1", "Admins", "u2"), ("g2", "Analysts", "u2")})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import datetime
+import math
+import unittest
+import pyarrow as pa
+from omni_python_sdk.optimize import optimize_column, optimize_table
+
+def column(values, type=None) -> pa.ChunkedArray:
+    return pa.chunked_array([pa.array(values, type)])
+
+def comparable(table: pa.Table) -> dict:
+    # NaN never equals itself in Arrow's equality, compare it (and the sign of zeros) by name
+    def value(v):
+        if isinstance(v, float) and (math.isnan(v) or v == 0):
+            return repr(v)
+        return v
+    return {name: [value(v) for v in table.column(name).to_pylist()] for name in table.column_names}
+
+class TestOptimize(unittest.TestCase):
+    def assertRoundTrips(self, original: pa.Table, fields=None) -> pa.Table:
+        table, report = optimize_table(original, fields or {})
+        self.assertEqual(table.num_rows, original.num_rows)
+        restored = table.cast(original.schema)
+        self.assertEqual(restored.schema, original.schema)
+        self.assertEqual(comparable(restored), comparable(original), report)
+        return table
+
+    def test_boundary_integers(self):
+        cases = [
+            ([-128, 127], pa.int8()),
+            ([-129, 127], pa.int16()),
+            ([0, 128], pa.int16()),
+            ([-32768, 32767], pa.int16()),
+            ([0, 32768], pa.int32()),
+            ([-(1 << 31), (1 << 31) - 1], pa.int32()),
+            ([0, 1 << 31], pa.int64()),
+            ([-(1 << 63), (1 << 63) - 1], pa.int64()),
+        ]
+        for values, expected in cases:
+            optimized = self.assertRoundTrips(pa.table({"n": pa.array(values + [None], pa.int64())}))
+            self.assertEqual(optimized.column("n").type, expected, values)
+        # narrower inputs are never widened
+        self.assertIsNone(optimize_column(column([1, 2], pa.int8()), {}))
+
+    def test_floats(self):
+        exact = self.assertRoundTrips(pa.table({"f": [0.5, 1.25, -0.0, float("nan"), None, float("inf")]}))
+        self.assertEqual(exact.column("f").type, pa.float32())
+        for values in ([0.1], [16777217.0], [1e40], [1e-50], [0.5, 2.0 ** -149 / 3]):
+            kept = self.assertRoundTrips(pa.table({"f": values}))
+            self.assertEqual(kept.column("f").type, pa.float64(), values)
+
+    def test_null_heavy_columns(self):
+        original = pa.table({
+            "ints": pa.array([None] * 99 + [5], pa.int64()),
+            "all_null_ints": pa.array([None] * 100, pa.int64()),
+            "strings": pa.array([None] * 98 + ["a", "b"]),
+            "all_null_strings": pa.array([None] * 100, pa.string()),
+            "floats": pa.array([None] * 99 + [0.1]),
+        })
+        optimized = self.assertRoundTrips(original)
+        self.assertEqual(optimized.column("ints").type, pa.int8())
+        self.assertEqual(optimized.column("all_null_ints").type, pa.int64())
+        self.assertEqual(optimized.column("strings").null_count, 98)
+
+    def test_dictionary_encoding(self):
+        original = pa.table({
+            "status": ["Complete", "Shipped", "Complete", None] * 50,
+            "id": [str(i) for i in range(200)],
+        })
+        optimized = self.assertRoundTrips(original, {"status": {"is_dimension": True}})
+        self.assertEqual(optimized.column("status").type, pa.dictionary(pa.int8(), pa.string()))
+        # almost every value is distinct
+        self.assertEqual(optimized.column("id").type, pa.string())
+        measures = self.assertRoundTrips(original, {"status": {"is_dimension": False}})
+        self.assertEqual(measures.column("status").type, pa.string())
+
+    def test_timestamps_with_time_zones(self):
+        moments = [datetime.datetime(2024, 3, 31, 1, 30, tzinfo=datetime.timezone.utc), None]
+        original = pa.table({
+            "utc_ns": pa.array(moments, pa.timestamp("ns", "UTC")),
+            "local_s": pa.array(moments, pa.timestamp("s", "Europe/Amsterdam")),
+            "naive_ms": pa.array([datetime.datetime(2024, 1, 1, 12), None], pa.timestamp("ms")),
+            "sub_us": pa.array([1_000_000_001, None], pa.timestamp("ns", "UTC")),
+            "days": pa.array([datetime.date(2024, 2, 29), None], pa.date64()),
+        })
+        optimized = self.assertRoundTrips(original)
+        self.assertEqual(optimized.column("utc_ns").type, pa.timestamp("us", "UTC"))
+        self.assertEqual(optimized.column("local_s").type, pa.timestamp("us", "Europe/Amsterdam"))
+        self.assertEqual(optimized.column("naive_ms").type, pa.timestamp("us"))
+        # nanoseconds that do not fit microseconds are kept
+        self.assertEqual(optimized.column("sub_us").type, pa.timestamp("ns", "UTC"))
+        self.assertEqual(optimized.column("days").type, pa.date32())
+
+    def test_temporal_strings(self):
+        original = pa.table({
+            "created_at": ["2024-01-02 03:04:05.123456", None],
+            "day": ["2024-02-29", None],
+            "not_a_date": ["yesterday", None],
+        })
+        fields = {"created_at": {"data_type": "TIMESTAMP"}, "day": {"data_type": "DATE"}, "not_a_date": {"data_type": "DATE", "is_dimension": False}}
+        optimized, _ = optimize_table(original, fields)
+        self.assertEqual(optimized.column("created_at").to_pylist(), [datetime.datetime(2024, 1, 2, 3, 4, 5, 123456), None])
+        self.assertEqual(optimized.column("day").to_pylist(), [datetime.date(2024, 2, 29), None])
+        self.assertEqual(optimized.column("not_a_date"), original.column("not_a_date"))
+
+    def test_empty_table(self):
+        original = pa.table({"n": pa.array([], pa.int64()), "s": pa.array([], pa.string()), "f": pa.array([], pa.float64())})
+        self.assertRoundTrips(original)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import datetime
+import threading
+import unittest
+import pyarrow as pa
+from omni_python_sdk import OmniAPI
+from omni_python_sdk.partition import combine_filters, date_partitions, equals_filter, on_or_after_filter, partition_body, range_filter, range_partitions, value_partitions
+from examples.tests.stub_transport import BASE_URL, QUERY, QueryTransport, StubTransport, run_query
+
+STATUS = "order_items.status"
+
+class RecordingStub(StubTransport):
+    def __init__(self, rows):
+        super().__init__(rows, groups=0)
+        self.bodies = []
+        self.lock = threading.Lock()
+
+    def request(self, method, url, params=None, **kwargs):
+        if url.endswith("/query/run"):
+            with self.lock:
+                self.bodies.append(kwargs["json"])
+        return super().request(method, url, params, **kwargs)
+
+class TestPartition(unittest.TestCase):
+    def filtered_query(self, filter):
+        return {"query": {**QUERY["query"], "filters": {STATUS: filter}}}
+
+    def test_partitions_never_widen_the_query(self):
+        body = self.filtered_query(equals_filter(["Complete", "Shipped"]))
+        partitions = value_partitions(STATUS, ["Complete", "Returned", "Shipped"], 3)
+        filters = [partition_body(body, partition) for partition in partitions]
+        values = [f["query"]["filters"][STATUS]["values"] if f else None for f in filters]
+        # Returned and the catch-all partition cannot match any row of the query
+        self.assertEqual(values, [["Complete"], None, ["Shipped"], None])
+        self.assertNotIn("filters", QUERY["query"])
+
+    def test_negated_filters(self):
+        excluded = {**equals_filter(["Cancelled"]), "is_negative": True}
+        self.assertEqual(combine_filters(excluded, equals_filter(["Cancelled", "Complete"]))["values"], ["Complete"])
+        others = {**equals_filter(["Complete"]), "is_negative": True}
+        combined = combine_filters(excluded, others)
+        self.assertTrue(combined["is_negative"])
+        self.assertEqual(combined["values"], ["Cancelled", "Complete"])
+
+    def test_incompatible_filters(self):
+        body = self.filtered_query({"kind": "CONTAINS", "type": "string", "values": ["Comp"], "is_negative": False})
+        with self.assertRaises(ValueError):
+            partition_body(body, {STATUS: equals_filter(["Complete"])})
+
+    def test_run_query_partitioned(self):
+        transport = RecordingStub(rows=100)
+        api = OmniAPI("key", BASE_URL, transport=transport)
+        body = {"query": {**self.filtered_query(equals_filter(["Complete", "Shipped"]))["query"], "limit": 150}}
+        table, _ = api.run_query_partitioned(body, value_partitions(STATUS, ["Complete", "Returned", "Shipped"], 3))
+        self.assertEqual(len(transport.bodies), 2)
+        # two partitions of 100 rows, cut to the query's limit
+        self.assertEqual(table.num_rows, 150)
+
+    def test_range_partitions(self):
+        partitions = range_partitions("order_items.id", 0, 9, 3)
+        self.assertEqual([partition["order_items.id"]["kind"] for partition in partitions], ["LESS_THAN", "BETWEEN", "BETWEEN", "BETWEEN", "GREATER_THAN"])
+        self.assertEqual([(f["left_side"], f["right_side"]) for f in (p["order_items.id"] for p in partitions[1:-1])], [(0, 3), (4, 6), (7, 9)])
+        table = pa.table({"order_items.id": pa.array(range(-5, 15), pa.int64())})
+        ids = [run_query(table, {"filters": partition})["order_items.id"].to_pylist() for partition in partitions]
+        # every row is in exactly one partition
+        self.assertEqual(sorted(sum(ids, [])), list(range(-5, 15)))
+
+    def test_date_partitions(self):
+        field = "order_items.created_at[date]"
+        partitions = date_partitions(field, "2024-01-30", datetime.date(2024, 2, 4), 2)
+        self.assertEqual([partition[field] for partition in partitions], [
+            {"kind": "BEFORE", "type": "date", "left_side": "2024-01-30", "is_negative": False},
+            {"kind": "BETWEEN", "type": "date", "left_side": "2024-01-30", "right_side": "2024-02-01", "is_negative": False},
+            {"kind": "BETWEEN", "type": "date", "left_side": "2024-02-02", "right_side": "2024-02-04", "is_negative": False},
+            {"kind": "ON_OR_AFTER", "type": "date", "left_side": "2024-02-05", "is_negative": False},
+        ])
+        days = [datetime.date(2024, 1, 20) + datetime.timedelta(days=i) for i in range(30)]
+        table = pa.table({field: pa.array(days, pa.date32())})
+        found = [run_query(table, {"filters": partition})[field].to_pylist() for partition in partitions]
+        self.assertEqual(sorted(sum(found, [])), days)
+
+    def test_combine_ranges(self):
+        window = on_or_after_filter("2024-03-01")
+        year = range_filter(("2024-01-01", True), ("2024-12-31", True), "date")
+        self.assertEqual(combine_filters(year, window), {**year, "left_side": "2024-03-01"})
+        before = range_filter(None, ("2024-03-01", False), "date")
+        self.assertIsNone(combine_filters(before, window))
+        # an exclusive upper bound becomes the day before in BETWEEN
+        self.assertEqual(combine_filters(range_filter(None, ("2024-04-01", False), "date"), window)["right_side"], "2024-03-31")
+        numbers = combine_filters({"kind": "GREATER_THAN", "type": "number", "left_side": "10", "is_negative": False}, range_filter((0, True), (20, True)))
+        self.assertEqual((numbers["left_side"], numbers["right_side"]), (11, 20))
+        with self.assertRaises(ValueError):
+            combine_filters({"kind": "GREATER_THAN", "type": "number", "left_side": 0.5, "is_negative": False}, range_filter((0, True), (20, True)))
+        with self.assertRaises(ValueError):
+            combine_filters({"kind": "TIME_FOR_INTERVAL_DURATION", "type": "date", "left_side": "7 days ago", "right_side": "7 days"}, window)
+
+    def test_partitioned_sort_and_limit(self):
+        table = pa.table({
+            "order_items.id": pa.array(range(100), pa.int64()),
+            "order_items.sale_price": pa.array([(i * 37) % 100 * 1.0 for i in range(100)]),
+        })
+        transport = QueryTransport(table)
+        api = OmniAPI("key", BASE_URL, transport=transport)
+        body = {"query": {"fields": table.column_names, "sorts": [{"column_name": "order_items.sale_price", "sort_descending": True}], "limit": 25}}
+        partitioned, fields = api.run_query_partitioned(body, range_partitions("order_items.id", 0, 99, 4))
+        self.assertEqual(len(transport.bodies), 6)
+        self.assertEqual(partitioned, run_query(table, body["query"]))
+        self.assertEqual(fields, transport.fields)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import re
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+import pyarrow as pa
+from omni_python_sdk import OmniAPI
+from omni_python_sdk.profiling import PROFILE_ENV, Profiler, SamplingProfiler
+from examples.tests.stub_transport import BASE_URL, QueryTransport
+
+class TestProfiler(unittest.TestCase):
+    def test_phase_accounting(self):
+        profiler = Profiler()
+        with profiler.phase("outer"):
+            for _ in range(3):
+                with profiler.phase("inner"):
+                    time.sleep(0.01)
+        report = profiler.report()
+        self.assertEqual(list(report), ["outer", "inner"])
+        self.assertEqual((report["outer"]["calls"], report["inner"]["calls"]), (1, 3))
+        # nested phases are included in the phase around them
+        self.assertGreaterEqual(report["inner"]["wall"], 0.03)
+        self.assertGreaterEqual(report["outer"]["wall"], report["inner"]["wall"])
+        # sleeping takes no CPU time
+        self.assertLess(report["inner"]["cpu"], report["inner"]["wall"])
+        self.assertEqual(profiler.format().splitlines()[0].split(), ["phase", "calls", "wall", "s", "cpu", "s"])
+        profiler.reset()
+        self.assertEqual(profiler.report(), {})
+
+    def test_phase_counts_failures(self):
+        profiler = Profiler()
+        with self.assertRaises(ValueError):
+            with profiler.phase("failing"):
+                raise ValueError
+        self.assertEqual(profiler.report()["failing"]["calls"], 1)
+
+    def test_phases_across_threads(self):
+        profiler = Profiler()
+
+        def work():
+            for _ in range(100):
+                with profiler.phase("work"):
+                    pass
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(profiler.report()["work"]["calls"], 400)
+
+    def test_disabled(self):
+        profiler = Profiler(enabled=False)
+        with profiler.phase("ignored"):
+            pass
+        self.assertEqual(profiler.report(), {})
+
+    def test_client_phases(self):
+        transport = QueryTransport(pa.table({"n": [1, 2, 3]}))
+        api = OmniAPI("key", BASE_URL, transport=transport, profile=True)
+        self.assertIs(transport.profiler, api.profiler)
+        api.run_query_blocking({"query": {}})
+        report = api.profiler.report()
+        self.assertTrue({"ndjson_parse", "base64_decode", "arrow_decode"} <= set(report), report)
+        self.assertTrue(all(stats["calls"] == 1 for stats in report.values()))
+
+    def test_enabled_from_env(self):
+        with mock.patch.dict(os.environ, {PROFILE_ENV: "1"}):
+            self.assertTrue(OmniAPI("key", BASE_URL, transport=QueryTransport(pa.table({}))).profiler.enabled)
+        with mock.patch.dict(os.environ, {PROFILE_ENV: "0"}):
+            transport = QueryTransport(pa.table({}))
+            api = OmniAPI("key", BASE_URL, transport=transport)
+            self.assertFalse(api.profiler.enabled)
+            self.assertIsNot(transport.profiler, api.profiler)
+
+def busy_until(event: threading.Event) -> None:
+    while not event.is_set():
+        sum(range(1000))
+
+class TestSamplingProfiler(unittest.TestCase):
+    def test_collapsed_stacks(self):
+        done = threading.Event()
+        worker = threading.Thread(target=busy_until, args=(done,), name="busy-worker")
+        worker.start()
+        try:
+            with SamplingProfiler(interval=0.001) as sampler:
+                time.sleep(0.1)
+        finally:
+            done.set()
+            worker.join()
+        self.assertGreater(sampler.samples, 0)
+        lines = sampler.collapsed().splitlines()
+        self.assertEqual(lines, sorted(lines))
+        line = re.compile(r"^(?P<stack>[^;]+(;[^;]+)*) (?P<count>\d+)$")
+        stacks = {}
+        for text in lines:
+            match = line.match(text)
+            self.assertIsNotNone(match, text)
+            stacks[match["stack"]] = int(match["count"])
+        self.assertEqual(stacks, dict(sampler.stacks))
+        busy = [stack for stack in stacks if stack.startswith("busy-worker;")]
+        self.assertTrue(busy)
+        # root first: the thread name, then the outermost frame down to the sampled one
+        frames = busy[0].split(";")
+        self.assertTrue(any(re.fullmatch(r"busy_until \(test_profiling\.py:\d+\)", frame) for frame in frames[1:]), frames)
+        self.assertTrue(frames[1].startswith("_bootstrap "))
+        # the sampler does not sample itself
+        self.assertFalse(any(stack.startswith("omni-sampler;") for stack in stacks))
+
+    def test_only_the_calling_thread(self):
+        done = threading.Event()
+        worker = threading.Thread(target=busy_until, args=(done,), name="busy-worker")
+        worker.start()
+        try:
+            with SamplingProfiler(interval=0.001, all_threads=False) as sampler:
+                time.sleep(0.05)
+        finally:
+            done.set()
+            worker.join()
+        self.assertTrue(sampler.stacks)
+        self.assertEqual({stack.split(";")[0] for stack in sampler.stacks}, {threading.current_thread().name})
+
+    def test_write(self):
+        sampler = SamplingProfiler()
+        sampler.stacks.update({"main;f (a.py:1)": 2, "main;g (a.py:5)": 1})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "out.collapsed")
+            sampler.write(path)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "main;f (a.py:1) 2\nmain;g (a.py:5) 1\n")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import decimal
+import importlib.util
+import unittest
+import pyarrow as pa
+from omni_python_sdk import QueryResult
+
+FIELDS = {
+    "order_items.id": {"label": "ID", "data_type": "NUMBER"},
+    "order_items.status": {"label": "Status", "data_type": "STRING"},
+    "order_items.sale_price": {"label": "Sale Price", "data_type": "NUMBER"},
+}
+
+def result() -> QueryResult:
+    return QueryResult(pa.table({
+        "order_items.status": ["Complete", "Shipped", None],
+        "order_items.id": pa.array([1, 2, 3], pa.int64()),
+        "order_items.sale_price": pa.array([0.5, 1.25, None]),
+    }), FIELDS)
+
+class TestQueryResult(unittest.TestCase):
+    def test_select(self):
+        selected = result().select(["order_items.id", "missing", "order_items.status"])
+        self.assertEqual(selected.column_names, ["order_items.id", "order_items.status"])
+        self.assertIs(selected.fields, FIELDS)
+        unchanged = result()
+        self.assertIs(unchanged.select([]), unchanged)
+        self.assertIs(unchanged.select(unchanged.column_names), unchanged)
+
+    def test_with_labels(self):
+        labeled = QueryResult(result().table.append_column("other", pa.array([1, 2, 3])), FIELDS).with_labels()
+        self.assertEqual(labeled.column_names, ["Status", "ID", "Sale Price", "other"])
+        self.assertEqual(labeled.fields["Sale Price"], FIELDS["order_items.sale_price"])
+        self.assertNotIn("other", labeled.fields)
+
+    def cast(self, array: pa.Array, data_type: str = "NUMBER") -> pa.ChunkedArray:
+        return QueryResult(pa.table({"c": array}), {"c": {"data_type": data_type}}).cast_types().table.column("c")
+
+    def test_cast_numbers_stays_exact(self):
+        big = 2 ** 63 - 1
+        integers = self.cast(pa.array([str(big), "-3", None]))
+        self.assertEqual(integers.type, pa.int64())
+        self.assertEqual(integers.to_pylist(), [big, -3, None])
+
+        decimals = self.cast(pa.array(["0.1", "12345678901234567.89", "-2", None]))
+        self.assertEqual(decimals.type, pa.decimal128(38, 2))
+        self.assertEqual(decimals.to_pylist(), [decimal.Decimal("0.10"), decimal.Decimal("12345678901234567.89"), decimal.Decimal("-2.00"), None])
+
+        whole = self.cast(pa.array([decimal.Decimal(10 ** 18 - 1), None], pa.decimal128(18, 0)))
+        self.assertEqual(whole.type, pa.int64())
+        self.assertEqual(whole.to_pylist(), [10 ** 18 - 1, None])
+
+        for type in (pa.decimal128(38, 0), pa.decimal128(10, 2)):
+            self.assertEqual(self.cast(pa.array([decimal.Decimal(1)], type)).type, type)
+        self.assertEqual(self.cast(pa.array([2 ** 62])).type, pa.int64())
+
+        floats = self.cast(pa.array(["NaN", "1.5"]))
+        self.assertEqual(floats.type, pa.float64())
+        self.assertEqual(floats.to_pylist()[1], 1.5)
+
+    def test_cast_other_types(self):
+        self.assertEqual(self.cast(pa.array(["2024-01-02 03:04:05", None]), "TIMESTAMP").type, pa.timestamp("us"))
+        self.assertEqual(self.cast(pa.array(["true", "false"]), "BOOLEAN").to_pylist(), [True, False])
+        self.assertEqual(self.cast(pa.array(["not a number"])).type, pa.string())
+        unchanged = result()
+        self.assertIs(unchanged.cast_types(), unchanged)
+
+    def test_to_pandas(self):
+        df = result().to_pandas()
+        self.assertEqual(list(df.columns), result().column_names)
+        self.assertEqual(df["order_items.id"].tolist(), [1, 2, 3])
+
+    def test_to_numpy(self):
+        arrays = result().to_numpy()
+        self.assertEqual(arrays["order_items.id"].tolist(), [1, 2, 3])
+        self.assertEqual(arrays["order_items.status"].tolist(), ["Complete", "Shipped", None])
+        self.assertEqual(result().select(["order_items.id"]).to_numpy(zero_copy_only=True)["order_items.id"].tolist(), [1, 2, 3])
+        with self.assertRaises(pa.ArrowInvalid):
+            # a column with nulls cannot be viewed without a copy
+            result().select(["order_items.sale_price"]).to_numpy(zero_copy_only=True)
+        chunked = QueryResult(pa.Table.from_batches(result().table.to_batches() * 2), FIELDS)
+        with self.assertRaises(pa.ArrowInvalid):
+            chunked.select(["order_items.id"]).to_numpy(zero_copy_only=True)
+
+    @unittest.skipUnless(importlib.util.find_spec("polars"), "polars is not installed")
+    def test_to_polars(self):
+        df = result().to_polars()
+        self.assertEqual(df.columns, result().column_names)
+        self.assertEqual(df["order_items.id"].to_list(), [1, 2, 3])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from omni_python_sdk import OmniAPI, Transport
+from omni_python_sdk.singleflight import SingleFlight
+from omni_python_sdk.transport import TransportResponse
+
+BASE_URL = "https://example.omniapp.co"
+
+class SlowGroupTransport(Transport):
+    def __init__(self):
+        self.requests = 0
+
+    def request(self, method, url, **kwargs):
+        self.requests += 1
+        time.sleep(0.2)
+        body = json.dumps({"id": "g1", "displayName": "Group", "members": [{"value": "u1"}]})
+        return TransportResponse(200, body.encode("utf-8"), {"Content-Type": "application/json"}, url)
+
+class TestSingleFlight(unittest.TestCase):
+    def slow_call(self):
+        self.calls += 1
+        time.sleep(0.2)
+        return {"members": [1, 2]}
+
+    def setUp(self):
+        self.calls = 0
+
+    def test_threads(self):
+        flight = SingleFlight()
+        with ThreadPoolExecutor(5) as executor:
+            results = list(executor.map(lambda _: flight.do("key", self.slow_call), range(5)))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(flight.coalesced, 4)
+        self.assertEqual(len({id(result) for result in results}), 5)
+        results[0]["members"].append(3)
+        self.assertEqual(results[1], {"members": [1, 2]})
+
+    def test_asyncio(self):
+        flight = SingleFlight()
+
+        async def main():
+            return await asyncio.gather(*(flight.do_async("key", self.slow_call) for _ in range(5)))
+
+        results = asyncio.run(main())
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len({id(result) for result in results}), 5)
+        self.assertEqual(flight.in_flight, 0)
+
+    def test_unshared_result_is_not_copied(self):
+        flight = SingleFlight()
+        result = {"members": []}
+        self.assertIs(flight.do("key", lambda: result), result)
+
+    def test_client_get_group(self):
+        transport = SlowGroupTransport()
+        api = OmniAPI("key", BASE_URL, coalesce=True, transport=transport)
+        barrier = threading.Barrier(5)
+
+        def get_group(_):
+            barrier.wait()
+            return api.get_group("g1")
+
+        with ThreadPoolExecutor(5) as executor:
+            groups = list(executor.map(get_group, range(5)))
+        self.assertEqual(transport.requests, 1)
+        groups[0]["members"].append({"value": "u2"})
+        self.assertEqual(groups[1]["members"], [{"value": "u1"}])
+
+if __name__ == "__main__":
+    unittest.main()
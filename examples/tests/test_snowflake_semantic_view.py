@@ -1,8 +1,64 @@
 import unittest
+import io
 import json
 from examples.snowflake_semantic_view import sematic_view_from_topic
 from examples.topic import Topic
 
+def string_built_sql(view) -> str:
+    # the `sql +=` builder generate_sql used before it streamed through iter_sql
+    sql = f"CREATE OR REPLACE SEMANTIC VIEW OMNI__{view.name}\n\n"
+
+    if view.tables:
+        sql += "TABLES (\n"
+        for table in view.tables:
+            sql += f"  {table['name']} AS {table['table_name']}\n"
+            primary_key = table.get("primary_key").split(".")[1]
+            if primary_key:
+                sql += f"    PRIMARY KEY ({primary_key})"
+            if table.get("synonyms"):
+                sql += f"    WITH SYNONYMS ({', '.join(table['synonyms'])})"
+            if table.get("comment"):
+                sql += f"    COMMENT = '{table['comment']}'"
+            sql += ",\n"
+        sql = sql[:-2] + "\n)\n\n"
+
+    if view.relationships:
+        sql += "RELATIONSHIPS (\n"
+        for relationship in view.relationships:
+            key = relationship.get("source_column").split(".")[1]
+            sql += f"  {relationship['name']} AS\n"
+            sql += f"    {relationship['source_table']} ({key}) REFERENCES {relationship['target_table']},\n"
+        sql = sql[:-2] + "\n)\n\n"
+    if view.facts:
+        sql += "FACTS (\n"
+        for fact in view.facts:
+            sql += f"  {fact['name']} AS {fact['expression']}"
+            if fact.get("comment"):
+                sql += f" COMMENT = '{fact['comment']}'"
+            sql += ",\n"
+        sql = sql[:-2] + "\n)\n\n"
+    if view.dimensions:
+        sql += "DIMENSIONS (\n"
+        for dimension in view.dimensions:
+            sql += f"  {dimension['name']} AS {dimension['expression']}"
+            if dimension.get("synonyms"):
+                sql += f" WITH SYNONYMS ({', '.join(dimension['synonyms'])})"
+            if dimension.get("comment"):
+                sql += f" COMMENT = '{dimension['comment']}'"
+            sql += ",\n"
+        sql = sql[:-2] + "\n)\n\n"
+    if view.metrics:
+        sql += "METRICS (\n"
+        for metric in view.metrics:
+            sql += f"  {metric['name']} AS {metric['expression']}"
+            if metric.get("comment"):
+                sql += f" COMMENT = '{metric['comment']}'"
+            sql += ",\n"
+        sql = sql[:-2] + "\n)\n\n"
+    if view.comment:
+        sql += f"COMMENT = '{view.comment}';\n"
+    return sql
+
 class TestTopicToSemanticView(unittest.TestCase):    
     file_path = "examples/tests/data/order_items.topic.json"
 
@@ -38,5 +94,28 @@ class TestSnowflakeSemanticView(unittest.TestCase):
 
         self.assertEqual(sql.strip(), expected_sql_content.strip())
 
+    def test_streamed_sql_matches_string_built_sql(self):
+        semantic_view = sematic_view_from_topic(Topic.model_validate(self.json))
+        views = [semantic_view]
+        # every optional clause, which the fixture topic does not use
+        full = sematic_view_from_topic(Topic.model_validate(self.json))
+        full.tables[0]["synonyms"] = ["items", "lines"]
+        full.tables[0]["comment"] = "order lines"
+        full.add_fact("order_items.margin", "order_items.sale_price - order_items.cost", comment="margin")
+        full.add_fact("order_items.discount", "order_items.list_price - order_items.sale_price")
+        full.dimensions[0]["synonyms"] = ["key"]
+        full.dimensions[0]["comment"] = "a dimension"
+        full.metrics[0]["comment"] = "a metric"
+        full.set_comment("all clauses")
+        views.append(full)
+        views.append(sematic_view_from_topic(Topic.model_validate({**self.json, "views": self.json["views"][:1], "relationships": []})))
+        for view in views:
+            expected = string_built_sql(view)
+            self.assertEqual("".join(view.iter_sql()), expected)
+            self.assertEqual(view.generate_sql(), expected)
+            out = io.StringIO()
+            view.write_sql(out)
+            self.assertEqual(out.getvalue(), expected)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
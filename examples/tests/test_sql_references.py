@@ -0,0 +1,32 @@
+import unittest
+import json
+from examples.sql_references import ReferenceRewriter
+from examples.topic import Topic
+
+class TestReferenceRewriter(unittest.TestCase):
+    file_path = "examples/tests/data/order_items.topic.json"
+    # --- read straight into a dict ---
+    with open(file_path, "r", encoding="utf-8") as f:
+        json: dict = json.load(f)
+
+    def test_strip_references(self):
+        rewrite = ReferenceRewriter()
+        self.assertEqual(rewrite("${order_items.user_id} = ${users.id}"), "order_items.user_id = users.id")
+        self.assertEqual(rewrite("COUNT(*)"), "COUNT(*)")
+        # braces outside of references are left alone
+        self.assertEqual(rewrite("'{}' || ${users.id}"), "'{}' || users.id")
+
+    def test_resolves_each_reference_once(self):
+        topic = Topic.model_validate(self.json)
+        calls = []
+
+        def render_field(field):
+            calls.append(field.field_name)
+            return field.field_name.upper()
+        rewrite = ReferenceRewriter.for_topic(topic, render_field)
+        self.assertEqual(rewrite("${order_items.user_id} = ${users.id}"), "USER_ID = ID")
+        self.assertEqual(rewrite("${users.id} + ${users.id}"), "ID + ID")
+        self.assertEqual(calls, ["user_id", "id"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 import json
 
-from examples.topic import Topic
+from examples.topic import LazyViews, Topic
 
 class TestTopic(unittest.TestCase):
     file_path = "examples/tests/data/order_items.topic.json"
@@ -16,6 +16,81 @@ class TestTopic(unittest.TestCase):
         topic = Topic.model_validate(self.json)
         self.assertIsInstance(topic, Topic)
         self.assertEqual(topic.name, "order_items")
-        
+
+    def test_find_field_matches_linear_scan(self):
+        topic = Topic.model_validate(self.json)
+        for view in topic.views:
+            self.assertIs(topic.find_view(view.name), view)
+            for field in view.dimensions + view.measures:
+                self.assertIs(topic.find_field(f"{view.name}.{field.field_name}"), field)
+                first_match = next(
+                    f for v in topic.views for f in v.dimensions + v.measures if f.field_name == field.field_name
+                )
+                self.assertIs(topic.find_field(f".{field.field_name}"), first_match)
+        self.assertIsNone(topic.find_view("missing"))
+        self.assertIsNone(topic.find_field("order_items.missing"))
+        self.assertIsNone(topic.find_field("missing.id"))
+
+    def test_indexes_follow_mutation(self):
+        topic = Topic.model_validate(self.json)
+        view = topic.find_view("order_items")
+        self.assertIsNone(view.find_field("added"))
+        added = view.dimensions[0].model_copy(update={"field_name": "added"})
+        view.dimensions.append(added)
+        self.assertIs(topic.find_field("order_items.added"), added)
+        view.dimensions = [added]
+        self.assertIsNone(view.find_field("id"))
+
+        topic.views = [v for v in topic.views if v is not view]
+        self.assertIsNone(topic.find_view(view.name))
+        topic.views.append(view)
+        self.assertIs(topic.find_view(view.name), view)
+
+    def test_indexes_follow_in_place_changes(self):
+        topic = Topic.model_validate(self.json)
+        view = topic.find_view("order_items")
+        old_name = view.dimensions[0].field_name
+        renamed = view.dimensions[0].model_copy(update={"field_name": "renamed"})
+        view.dimensions[0] = renamed
+        self.assertIs(view.find_field("renamed"), renamed)
+        self.assertIs(topic.find_field(".renamed"), renamed)
+        expected = next((f for f in view.dimensions + view.measures if f.field_name == old_name), None)
+        self.assertIs(view.find_field(old_name), expected)
+        renamed.field_name = "renamed_again"
+        self.assertIsNone(view.find_field("renamed"))
+        self.assertIs(topic.find_field("order_items.renamed_again"), renamed)
+
+    def test_lazy_find_field_without_view(self):
+        with open(self.file_path, "rb") as f:
+            topic = Topic.model_validate_json_lazy(f.read())
+        self.assertEqual(topic.find_field(".age").field_name, "age")
+        self.assertEqual(len(topic.views.loaded()), 1)
+        self.assertIsNone(topic.find_field(".missing"))
+        self.assertEqual(len(topic.views.loaded()), 1)
+
+    def test_lazy_parse(self):
+        with open(self.file_path, "rb") as f:
+            data = f.read()
+        topic = Topic.model_validate_json_lazy(data)
+        self.assertIsInstance(topic.views, LazyViews)
+        self.assertEqual(topic.name, "order_items")
+        self.assertEqual(len(topic.relationships), 5)
+        self.assertEqual(topic.find_field("users.age").field_name, "age")
+        self.assertEqual([view.name for view in topic.views.loaded()], ["users"])
+
+        topic.views = list(topic.views)
+        self.assertEqual(topic.model_dump(), Topic.model_validate(self.json).model_dump())
+
+    def test_lazy_dump(self):
+        with open(self.file_path, "rb") as f:
+            data = f.read()
+        eager = Topic.model_validate(self.json)
+        topic = Topic.model_validate_json_lazy(data)
+        topic.find_view("users")
+        self.assertEqual(topic.model_dump(), eager.model_dump())
+        self.assertEqual(topic.model_dump(by_alias=True), eager.model_dump(by_alias=True))
+        self.assertEqual(Topic.model_validate_json_lazy(data).model_dump_json(), eager.model_dump_json())
+        self.assertIsInstance(topic.views, LazyViews)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
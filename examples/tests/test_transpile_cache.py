@@ -0,0 +1,42 @@
+import unittest
+import json
+from examples.snowflake_semantic_view import sematic_view_from_topic
+from examples.topic import Topic
+from examples.transpile_cache import ViewFragmentCache
+
+class TestViewFragmentCache(unittest.TestCase):
+    file_path = "examples/tests/data/order_items.topic.json"
+    # --- read straight into a dict ---
+    with open(file_path, "r", encoding="utf-8") as f:
+        json: dict = json.load(f)
+
+    def test_rebuild_only_changed_views(self):
+        cache = ViewFragmentCache()
+        topic = Topic.model_validate(self.json)
+        expected = sematic_view_from_topic(topic).generate_sql()
+        self.assertEqual(sematic_view_from_topic(topic, cache=cache).generate_sql(), expected)
+        self.assertEqual(cache.hits, 0)
+
+        # an identical topic parsed again reuses every view
+        self.assertEqual(sematic_view_from_topic(Topic.model_validate(self.json), cache=cache).generate_sql(), expected)
+        self.assertEqual(cache.hits, cache.misses)
+
+        edited = Topic.model_validate(self.json)
+        edited.find_view("users").find_field("age").sql = "${users.age} + 1"
+        hits, misses = cache.hits, cache.misses
+        sql = sematic_view_from_topic(edited, cache=cache).generate_sql()
+        self.assertEqual(cache.misses - misses, 1)
+        self.assertEqual(cache.hits - hits, len(edited.views) - 1)
+        self.assertIn("users.age AS users.age + 1", sql)
+        self.assertEqual(sql, sematic_view_from_topic(edited).generate_sql())
+
+    def test_in_place_edit_after_build(self):
+        cache = ViewFragmentCache()
+        topic = Topic.model_validate(self.json)
+        sematic_view_from_topic(topic, cache=cache).generate_sql()
+        view = next(view for view in topic.views if view.primary_key)
+        view.primary_key[0].field_name = f"{view.name}.email"
+        self.assertEqual(sematic_view_from_topic(topic, cache=cache).generate_sql(), sematic_view_from_topic(topic).generate_sql())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import importlib.util
+import json
+import sys
+import threading
+import unittest
+from unittest import mock
+import requests
+from requests.adapters import HTTPAdapter
+from omni_python_sdk import OmniAPI, Transport
+from omni_python_sdk.transport import HTTP2Transport, RequestsTransport
+
+BASE_URL = "https://example.omniapp.co"
+
+class CountingAdapter(HTTPAdapter):
+    """
+    Answers every request without a network, counting HEAD requests. Requests wait for
+    `release` and the ones to `fail_after` HEAD requests raise a connection error.
+    """
+
+    def __init__(self, fail_after=None):
+        super().__init__()
+        self.heads = 0
+        self.fail_after = fail_after
+        self.release = threading.Event()
+        self.release.set()
+        self.lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        self.release.wait()
+        if request.method == "HEAD":
+            with self.lock:
+                self.heads += 1
+                if self.fail_after is not None and self.heads > self.fail_after:
+                    raise requests.ConnectionError("refused")
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b""
+        response.request = request
+        response.url = request.url
+        return response
+
+def transport_with(adapter: CountingAdapter, pool_maxsize: int = 10) -> RequestsTransport:
+    transport = RequestsTransport(pool_maxsize)
+    transport.session.mount("https://", adapter)
+    return transport
+
+class TestWarmup(unittest.TestCase):
+    def test_warmup_opens_connections(self):
+        adapter = CountingAdapter()
+        api = OmniAPI("key", BASE_URL, transport=transport_with(adapter))
+        self.assertEqual(api.warmup(3), 3)
+        self.assertEqual(adapter.heads, 3)
+
+    def test_warmup_is_capped_by_the_pool(self):
+        adapter = CountingAdapter()
+        api = OmniAPI("key", BASE_URL, pool_maxsize=2, transport=transport_with(adapter, 2))
+        self.assertEqual(api.warmup(5), 2)
+        self.assertEqual(adapter.heads, 2)
+
+    def test_failed_connections_are_not_counted(self):
+        adapter = CountingAdapter(fail_after=1)
+        api = OmniAPI("key", BASE_URL, transport=transport_with(adapter))
+        self.assertEqual(api.warmup(3), 1)
+        self.assertEqual(adapter.heads, 3)
+
+    def test_eager_connect_and_wait_warm(self):
+        adapter = CountingAdapter()
+        adapter.release.clear()
+        api = OmniAPI("key", BASE_URL, eager_connect=2, transport=transport_with(adapter))
+        # construction does not wait for the connections
+        api.wait_warm(timeout=0.05)
+        self.assertTrue(api._warmup_thread.is_alive())
+        self.assertEqual(adapter.heads, 0)
+        adapter.release.set()
+        api.wait_warm()
+        self.assertFalse(api._warmup_thread.is_alive())
+        self.assertEqual(adapter.heads, 2)
+
+    def test_wait_warm_without_eager_connect(self):
+        adapter = CountingAdapter()
+        api = OmniAPI("key", BASE_URL, transport=transport_with(adapter))
+        api.wait_warm()
+        self.assertEqual(adapter.heads, 0)
+
+class TestTransport(unittest.TestCase):
+    def test_request_is_abstract(self):
+        class Incomplete(Transport):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_http2_requires_httpx(self):
+        with mock.patch.dict(sys.modules, {"httpx": None}):
+            with self.assertRaisesRegex(ImportError, r"omni_python_sdk\[http2\]"):
+                HTTP2Transport()
+
+@unittest.skipUnless(importlib.util.find_spec("httpx") and importlib.util.find_spec("h2"), "httpx[http2] is not installed")
+class TestHTTP2Transport(unittest.TestCase):
+    def setUp(self):
+        import httpx
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request)
+            if request.url.path.endswith("/moved"):
+                return httpx.Response(302, headers={"Location": f"{BASE_URL}/elsewhere"})
+            if request.url.path.endswith("/groups"):
+                return httpx.Response(200, json={"totalResults": 1, "Resources": [{"id": "g1", "displayName": "Admins"}]})
+            return httpx.Response(200, json={"ok": True})
+
+        self.transport = HTTP2Transport()
+        self.transport.client.close()
+        self.transport.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    def tearDown(self):
+        self.transport.close()
+
+    def test_request_encoding(self):
+        response = self.transport.post(f"{BASE_URL}/api", headers={"Authorization": "Bearer key"}, params={"a": 1, "skip": None, "flag": True}, json={"b": [1, 2]})
+        self.assertEqual(response.json(), {"ok": True})
+        request = self.requests[0]
+        self.assertEqual(request.method, "POST")
+        self.assertEqual(dict(request.url.params), {"a": "1", "flag": "True"})
+        self.assertEqual(request.headers["Authorization"], "Bearer key")
+        self.assertEqual(json.loads(request.content), {"b": [1, 2]})
+
+    def test_head_does_not_follow_redirects(self):
+        self.assertEqual(self.transport.head(f"{BASE_URL}/moved").status_code, 302)
+        self.assertEqual(self.transport.get(f"{BASE_URL}/moved").status_code, 200)
+        self.assertEqual([request.method for request in self.requests], ["HEAD", "GET", "GET"])
+
+    def test_profiled_request(self):
+        api = OmniAPI("key", BASE_URL, transport=self.transport, profile=True)
+        response = self.transport.post(f"{BASE_URL}/api", json={"b": 1})
+        self.assertEqual(response.json(), {"ok": True})
+        self.assertEqual(json.loads(self.requests[0].content), {"b": 1})
+        self.assertEqual(self.requests[0].headers["Content-Type"], "application/json")
+        self.assertTrue({"http_wait", "body_read", "json_serialize"} <= set(api.profiler.report()))
+
+    def test_client(self):
+        api = OmniAPI("key", BASE_URL, transport=self.transport)
+        self.assertEqual(api.get_all_groups(), [{"id": "g1", "displayName": "Admins"}])
+        self.assertEqual(self.requests[0].headers["Authorization"], "Bearer key")
+
+if __name__ == "__main__":
+    unittest.main()
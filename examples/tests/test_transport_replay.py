@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+from omni_python_sdk import OmniAPI, RecordingTransport, ReplayTransport
+from examples.tests.stub_transport import BASE_URL, QUERY, StubTransport
+
+class TestRecordReplay(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cassette = os.path.join(self.directory.name, "omni.jsonl")
+        self.stub = StubTransport(rows=1000, groups=250)
+        with OmniAPI("secret-key", BASE_URL, transport=RecordingTransport(self.stub, self.cassette)) as api:
+            self.table, self.fields = api.run_query_blocking(QUERY)
+            self.groups = api.get_all_groups()
+            self.assertIsNotNone(api.generate_embed_url({"contentPath": "/dashboards/a", "secret": "embed-secret"}))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_replays_recorded_responses(self):
+        replay = ReplayTransport(self.cassette)
+        api = OmniAPI("key", BASE_URL, transport=replay)
+        table, fields = api.run_query_blocking(QUERY)
+        self.assertTrue(table.equals(self.table))
+        self.assertEqual(fields, self.fields)
+        self.assertEqual(api.get_all_groups(), self.groups)
+        # run, one poll and four pages of groups, the last one empty
+        self.assertEqual(replay.requests, 6)
+        # the last recorded poll is repeated
+        self.assertTrue(api.run_query_blocking(QUERY)[0].equals(self.table))
+
+    def test_unknown_request(self):
+        api = OmniAPI("key", BASE_URL, transport=ReplayTransport(self.cassette))
+        self.assertIsNone(api.get_group("missing"))
+
+    def test_cassette_has_no_secrets(self):
+        with open(self.cassette, encoding="utf-8") as f:
+            cassette = f.read()
+        self.assertNotIn("secret-key", cassette)
+        self.assertNotIn("embed-secret", cassette)
+
+if __name__ == "__main__":
+    unittest.main()
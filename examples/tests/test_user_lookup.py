@@ -0,0 +1,53 @@
+import json
+import re
+import threading
+import unittest
+from omni_python_sdk import OmniAPI, Transport
+from omni_python_sdk.transport import TransportResponse
+
+BASE_URL = "https://example.omniapp.co"
+
+class UsersTransport(Transport):
+    """
+    Answers SCIM user listings by evaluating `userName eq` filters, one user per page.
+    """
+
+    def __init__(self, users):
+        self.users = users
+        self.filters = []
+        self.lock = threading.Lock()
+
+    def request(self, method, url, params=None, **kwargs):
+        emails = {email.lower() for email in re.findall(r'userName eq "([^"]*)"', params["filter"])}
+        with self.lock:
+            self.filters.append(params["filter"])
+        matched = [user for user in self.users if user["userName"].lower() in emails]
+        start = params["startIndex"]
+        body = json.dumps({"totalResults": len(matched), "Resources": matched[start - 1:start]})
+        return TransportResponse(200, body.encode("utf-8"), {"Content-Type": "application/json"}, url)
+
+class TestFindUsersByEmails(unittest.TestCase):
+    def setUp(self):
+        users = [{"id": str(i), "userName": f"user{i}@example.com"} for i in range(120)]
+        users += [{"id": "a", "userName": "twin@example.com"}, {"id": "b", "userName": "Twin@example.com"}]
+        self.transport = UsersTransport(users)
+        self.api = OmniAPI("key", BASE_URL, transport=self.transport)
+
+    def test_chunks_and_matches(self):
+        emails = [f"USER{i}@example.com" for i in range(100)] + ["missing@example.com", "twin@example.com"]
+        found = self.api.find_users_by_emails(emails, max_emails=30)
+        self.assertEqual(len(found), 100)
+        self.assertEqual(found["USER42@example.com"]["id"], "42")
+        self.assertNotIn("missing@example.com", found)
+        self.assertNotIn("twin@example.com", found)
+        # four filters, their pages fetched one user at a time
+        self.assertEqual(len(set(self.transport.filters)), 4)
+
+    def test_filter_length(self):
+        emails = [f"user{i}@example.com" for i in range(100)]
+        chunks = OmniAPI.user_filters(emails, max_filter_length=200)
+        self.assertTrue(all(len(filter) <= 200 for _, filter in chunks))
+        self.assertEqual([email for chunk, _ in chunks for email in chunk], emails)
+
+if __name__ == "__main__":
+    unittest.main()
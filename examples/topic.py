@@ -1,5 +1,8 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Callable, List, Optional, Literal
+from collections.abc import Sequence
+from functools import cached_property
+from pydantic import BaseModel, Field, ConfigDict, field_serializer
+from pydantic_core import from_json
+from typing import Callable, Dict, List, Optional, Literal, Tuple, Union
 from enum import Enum
 
 class FieldExpression(BaseModel):
@@ -120,6 +123,39 @@ class View(BaseModel):
     # let View(**{"schema": "sales"}) work, and dump back as {"schema": ...}
     model_config = ConfigDict(populate_by_name=True)
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in ("dimensions", "measures"):
+            self.invalidate_indexes()
+
+    def invalidate_indexes(self):
+        """
+        Drop the lazily built field index.
+        """
+        self.__dict__.pop("_field_index", None)
+
+    def _index_key(self) -> Tuple[int, int, int, int]:
+        # appending to or replacing the field lists changes the key
+        return (id(self.dimensions), len(self.dimensions), id(self.measures), len(self.measures))
+
+    @cached_property
+    def _field_index(self) -> Tuple[Tuple[int, int, int, int], Dict[str, int]]:
+        # field_name -> position in dimensions, or -1 - position in measures; first match
+        # wins like the original linear scan
+        index = {}
+        for position, field in enumerate(self.dimensions):
+            index.setdefault(field.field_name, position)
+        for position, field in enumerate(self.measures):
+            index.setdefault(field.field_name, -1 - position)
+        return self._index_key(), index
+
+    def _scan_field(self, field_name: str) -> Optional[OmniField]:
+        for fields in (self.dimensions, self.measures):
+            for field in fields:
+                if field.field_name == field_name:
+                    return field
+        return None
+
     def fully_scoped_table_name(self, default_catalog: Optional[str] = None, default_schema: Optional[str] = None):
         catalog_str = f"{self.catalog}." if self.catalog else f"{default_catalog}." if default_catalog else ""
         schema_label_str = f"{self.schema_}." if self.schema_ else f"{default_schema}." if default_schema else ""
@@ -129,11 +165,71 @@ class View(BaseModel):
     def find_field(self, field_name: str) -> Optional[OmniField]:
         """
         Find a field by name in the view.
+        Lookups go through an index. A hit is checked against the field at the indexed
+        position, and a miss falls back to a scan, so replacing or renaming fields in
+        place (`view.dimensions[0] = field`, `field.field_name = name`) is seen too;
+        only a miss costs as much as the scan.
         """
-        for field in self.dimensions + self.measures:
-            if field.field_name == field_name:
-                return field
-        return None
+        key, index = self._field_index
+        if key != self._index_key():
+            self.invalidate_indexes()
+            key, index = self._field_index
+        hit = index.get(field_name)
+        if hit is not None:
+            fields, position = (self.dimensions, hit) if hit >= 0 else (self.measures, -1 - hit)
+            if position < len(fields) and fields[position].field_name == field_name:
+                return fields[position]
+        field = self._scan_field(field_name)
+        if field is not None or hit is not None:
+            # an item changed in place, index it again on the next lookup
+            self.invalidate_indexes()
+        return field
+
+class LazyViews(Sequence):
+    """
+    Sequence of views that keeps each view's raw JSON and only validates a view
+    the first time it is accessed. Used by `Topic.model_validate_json_lazy`.
+    """
+
+    def __init__(self, raw_views: List[dict]):
+        self._raw = raw_views
+        self._views: List[Optional[View]] = [None] * len(raw_views)
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        view = self._views[index]
+        if view is None:
+            view = self._views[index] = View.model_validate(self._raw[index])
+            # the validated view replaces the raw JSON
+            self._raw[index] = None
+        return view
+
+    def names(self) -> List[str]:
+        """
+        View names, read from the raw JSON of views that were not validated yet.
+        """
+        return [view.name if view is not None else raw["name"] for view, raw in zip(self._views, self._raw)]
+
+    def field_names(self) -> List[List[str]]:
+        """
+        Field names of every view, dimensions first, read from the raw JSON of views that
+        were not validated yet.
+        """
+        return [
+            [field.field_name for field in view.dimensions + view.measures] if view is not None
+            else [field["field_name"] for field in raw.get("dimensions", []) + raw.get("measures", [])]
+            for view, raw in zip(self._views, self._raw)
+        ]
+
+    def loaded(self) -> List[View]:
+        """
+        The views that were validated so far.
+        """
+        return [view for view in self._views if view is not None]
 
 class Topic(BaseModel):
     name: str
@@ -146,27 +242,111 @@ class Topic(BaseModel):
     # ignore unknown keys rather than error
     model_config = {"extra": "ignore"}
 
+    @classmethod
+    def model_validate_json_lazy(cls, data: Union[str, bytes]) -> "Topic":
+        """
+        Parse topic JSON, validating the topic and its relationships eagerly but each
+        view only when it is first accessed. Views that are never touched are never
+        turned into View/OmniField objects until the topic is dumped, which validates
+        the remaining views.
+        """
+        raw = from_json(data)
+        raw_views = raw.pop("views", None) if isinstance(raw, dict) else None
+        if not isinstance(raw_views, list):
+            # let the eager path report the validation error
+            return cls.model_validate_json(data)
+        topic = cls.model_validate({**raw, "views": []})
+        topic.views = LazyViews(raw_views)
+        return topic
+
+    @field_serializer("views", mode="wrap")
+    def _serialize_views(self, views, handler):
+        # a lazily parsed topic holds LazyViews, dump it like the list of its views
+        return handler(list(views) if isinstance(views, LazyViews) else views)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name == "views":
+            self.invalidate_indexes()
+
+    def invalidate_indexes(self):
+        """
+        Drop the lazily built view and field indexes of the topic and every view.
+        """
+        self.__dict__.pop("_view_index", None)
+        self.__dict__.pop("_field_views", None)
+        for view in self._loaded_views():
+            view.invalidate_indexes()
+
+    def _loaded_views(self) -> List[View]:
+        return self.views.loaded() if isinstance(self.views, LazyViews) else self.views
+
+    def _index_key(self) -> Tuple[int, int]:
+        # appending to or replacing the view list changes the key
+        return (id(self.views), len(self.views))
+
+    def _fresh(self, name: str):
+        value = self.__dict__.get(name)
+        if value is not None and value[0] != self._index_key():
+            self.__dict__.pop(name, None)
+        return getattr(self, name)[1]
+
+    @cached_property
+    def _view_index(self) -> Tuple[Tuple[int, int], Dict[str, int]]:
+        # view name -> position, first match wins like the original linear scan
+        names = self.views.names() if isinstance(self.views, LazyViews) else [view.name for view in self.views]
+        index = {}
+        for position, name in enumerate(names):
+            index.setdefault(name, position)
+        return self._index_key(), index
+
+    @cached_property
+    def _field_views(self) -> Tuple[Tuple[int, int], Dict[str, List[int]]]:
+        # field_name -> positions of the views with a field of that name, in view order;
+        # read from the raw JSON of lazily parsed views, so they are not validated
+        if isinstance(self.views, LazyViews):
+            names = self.views.field_names()
+        else:
+            names = [[field.field_name for field in view.dimensions + view.measures] for view in self.views]
+        index = {}
+        for position, field_names in enumerate(names):
+            for field_name in field_names:
+                positions = index.setdefault(field_name, [])
+                if not positions or positions[-1] != position:
+                    positions.append(position)
+        return self._index_key(), index
+
     def find_view(self, name: str) -> Optional[View]:
         """
         Find a view by name in the topic.
         """
-        for view in self.views:
-            if view.name == name:
-                return view
-        return None
-    
+        position = self._fresh("_view_index").get(name)
+        if position is not None and self.views[position].name == name:
+            return self.views[position]
+        # a view was replaced or renamed in place, fall back to a scan
+        names = self.views.names() if isinstance(self.views, LazyViews) else [view.name for view in self.views]
+        if name in names or position is not None:
+            self.__dict__.pop("_view_index", None)
+        return self.views[names.index(name)] if name in names else None
+
     def find_field(self, name: str) -> Optional[OmniField]:
         """
-        Find a field by name in the topic.
+        Find a field by name in the topic: "view.field", or ".field" for the first view
+        with a field of that name. Both are index lookups; only a lazily parsed view
+        holding the field is validated.
         """
         view_name, field_name = name.split(".")
         if view_name:
             view = self.find_view(view_name)
-            if view:
-                return view.find_field(field_name)
-        else:
-            for view in self.views:
-                field = view.find_field(field_name)
-                if field:
-                    return field
-        return None
\ No newline at end of file
+            return view.find_field(field_name) if view else None
+        for position in self._fresh("_field_views").get(field_name, []):
+            field = self.views[position].find_field(field_name)
+            if field is not None:
+                return field
+        # fields changed in place are only in validated views
+        for view in self._loaded_views():
+            field = view.find_field(field_name)
+            if field is not None:
+                self.__dict__.pop("_field_views", None)
+                return field
+        return None
@@ -0,0 +1,68 @@
+import copy
+from typing import Any, Callable, Dict, Tuple
+from examples.topic import Topic, View
+
+# Per-view output cache shared by the topic transpilers.
+#
+# A view's fragments (its dimensions, measures and table entry) only depend on:
+#   - the view's own definition
+#   - how the fields it references render, which only depends on each field's
+#     name, view and whether it is a dimension (the topic "interface")
+#   - the transpile options
+# so they are keyed by a snapshot of those three things. Editing the SQL of one field
+# re-renders only that field's view; adding, removing or re-typing a field changes
+# the interface and re-renders every view.
+#
+# Keys are plain tuples of the models' attribute values compared by equality, which
+# is exact and much cheaper than serializing and hashing every view. A fresh key still
+# refers to the view's lists and nested models, so the cache stores a deep copy of it:
+# a view edited in place after a build then no longer matches its cached fragments.
+
+def topic_interface_key(topic: Topic) -> Tuple:
+    """
+    Every field's name, view and dimension flag, which is all that reference resolution looks at.
+    """
+    return tuple(
+        (view.name, tuple((field.field_name, field.view_name, field.is_dimension) for field in view.dimensions + view.measures))
+        for view in topic.views
+    )
+
+def view_key(view: View, interface_key: Tuple, options: Tuple) -> Tuple:
+    """
+    A view's attributes and fields, the topic interface and the transpile options.
+    """
+    state = tuple(
+        tuple(tuple(field.__dict__.values()) for field in value) if name in ("dimensions", "measures") else value
+        # skip cached indexes stored on the instance
+        for name, value in view.__dict__.items() if not name.startswith("_")
+    )
+    return options, interface_key, state
+
+class ViewFragmentCache:
+    """
+    Keeps the last rendered fragments of every (transpiler, topic, view) slot and
+    reuses them while the view's key is unchanged.
+    Fragments are shared between builds and must not be mutated.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str, str], Tuple[Tuple, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def fragment(self, slot: Tuple[str, str, str], key: Tuple, render: Callable[[], Any]) -> Any:
+        """
+        Return the cached fragment for `slot` if it was rendered with the same key, otherwise render it.
+        """
+        entry = self._entries.get(slot)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        fragment = render()
+        # copied so that later in-place edits of the view cannot change the stored key
+        self._entries[slot] = (copy.deepcopy(key), fragment)
+        return fragment
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -9,20 +9,26 @@ base_url = 'https://<<your omni host>>'
 api = OmniAPI(api_key, base_url)
 
 with open('user_groups.csv', newline='') as csvfile:
-    user_groups = csv.DictReader(csvfile)
-    for row in user_groups:
-        time.sleep(2)
-        email = row.pop('email')
-        op = row.pop('op')
-        if op == '+':
-            user = api.return_user_by_email(email)
-            api.add_user_to_group(
-                row['group_name'],
-                user['id']
-            )
-        elif op == '-':
-            user = api.return_user_by_email(email)
-            api.remove_user_from_group(
-                row['group_name'],
-                user['id']
-            )
\ No newline at end of file
+    user_groups = list(csv.DictReader(csvfile))
+
+# Look up every user up front, many emails per request
+users = api.find_users_by_emails([row['email'] for row in user_groups])
+
+for row in user_groups:
+    time.sleep(2)
+    email = row.pop('email')
+    op = row.pop('op')
+    user = users.get(email)
+    if user is None:
+        print(f"No user found for {email}")
+        continue
+    if op == '+':
+        api.add_user_to_group(
+            row['group_name'],
+            user['id']
+        )
+    elif op == '-':
+        api.remove_user_from_group(
+            row['group_name'],
+            user['id']
+        )
\ No newline at end of file
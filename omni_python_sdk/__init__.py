@@ -1,3 +1,46 @@
-from .api import OmniAPI
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ['OmniAPI']
+# Exports are imported on first use (PEP 562), so that importing the package, e.g. for the
+# thin `omni-sdk` command line client, does not load pyarrow and requests.
+_EXPORTS = {
+    'OmniAPI': '.api',
+    'ModelCatalog': '.catalog',
+    'QueryResult': '.result',
+    'EmbedUrlCache': '.embed',
+    'Transport': '.transport',
+    'RequestsTransport': '.transport',
+    'HTTP2Transport': '.transport',
+    'RecordingTransport': '.transport',
+    'ReplayTransport': '.transport',
+    'Profiler': '.profiling',
+    'SamplingProfiler': '.profiling',
+    'LocalQueryEngine': '.local',
+    'IncrementalQuery': '.incremental',
+    'GroupMembershipIndex': '.membership',
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .api import OmniAPI
+    from .catalog import ModelCatalog
+    from .result import QueryResult
+    from .embed import EmbedUrlCache
+    from .local import LocalQueryEngine
+    from .incremental import IncrementalQuery
+    from .membership import GroupMembershipIndex
+    from .profiling import Profiler, SamplingProfiler
+    from .transport import Transport, RequestsTransport, HTTP2Transport, RecordingTransport, ReplayTransport
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -6,8 +6,19 @@ import pyarrow as pa
 import pyarrow.ipc as ipc
 import io
 import json, ndjson, base64
-from typing import List, Tuple, Any, Union
+from typing import List, Tuple, Any, Union, Optional, BinaryIO, Dict, Iterator, Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import threading
 import functools, collections
+from .result import QueryResult
+from .export import export_result
+from .partition import partition_body, sort_table
+from .decode import MemoryBudget, decode_to_buffer, decode_to_file, default_decode_dir, estimated_size, map_table
+from .singleflight import SingleFlight, coalesced
+from .embed import EmbedUrlCache, embed_url_key
+from .membership import GroupMembershipIndex
+from .transport import Transport, RequestsTransport
+from .profiling import Profiler, profile_from_env
 
 
 def requests_error_handler(func):
@@ -64,7 +75,28 @@ class memoized(object):
       return functools.partial(self.__call__, obj)
   
 class OmniAPI:
-    def __init__(self, api_key: str = '', base_url: str = '',env_file: str = '.env'):
+    def __init__(self, api_key: str = '', base_url: str = '',env_file: str = '.env', decode_processes: int = 0, decode_dir: Optional[str] = None, coalesce: bool = False, pool_maxsize: int = 10, eager_connect: int = 0, transport: Optional[Transport] = None, profile: Optional[bool] = None, memory_budget: Union[int, MemoryBudget, None] = None, spill_dir: Optional[str] = None):
+        '''
+        api_key: str - the Omni API key, read from OMNI_API_KEY in env_file if not given
+        base_url: str - the Omni instance URL, read from OMNI_BASE_URL in env_file if not given
+        decode_processes: int - decode query results in a pool of this many worker processes
+            and hand them back through memory-mapped Arrow files (0 decodes in the calling thread)
+        decode_dir: str - directory for the handoff files, shared memory (/dev/shm) when available
+        coalesce: bool - share the result of identical in-flight run_query_blocking, find_user_by_email
+            and get_group calls between threads and asyncio tasks, each caller getting its own copy
+            of dict results; counters are on `self.flight`
+        pool_maxsize: int - keep-alive connections kept open to the Omni instance by the default transport
+        eager_connect: int - open this many connections in a background thread during construction,
+            see `warmup`
+        transport: Transport - sends the HTTP requests, a RequestsTransport (HTTP/1.1) by default;
+            pass an HTTP2Transport to multiplex concurrent requests over a few connections
+        profile: bool - time the SDK's phases (HTTP wait, body read, parsing, decoding, pagination)
+            on `self.profiler`; defaults to the OMNI_SDK_PROFILE environment variable
+        memory_budget: int | MemoryBudget - bytes of Arrow memory for decoded results; results that
+            would exceed it are written to a temp Arrow IPC file as they are decoded and returned
+            as memory-mapped tables. Pass a MemoryBudget to share one budget between clients
+        spill_dir: str - directory for spilled results, the system temp directory by default
+        '''
         
         if api_key and base_url:
             self.api_key = api_key
@@ -86,6 +118,75 @@ class OmniAPI:
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
         }
+        self.decode_processes = decode_processes
+        self.decode_dir = decode_dir if decode_dir is not None else default_decode_dir()
+        self.memory_budget = MemoryBudget(memory_budget) if isinstance(memory_budget, int) else memory_budget
+        self.spill_dir = spill_dir
+        self._decode_executor = None
+        self._lock = threading.Lock()
+        self.flight = SingleFlight() if coalesce else None
+        # kept up to date by add_user_to_group, remove_user_from_group and delete_user_by_id once built
+        self.membership: Optional[GroupMembershipIndex] = None
+        self.pool_maxsize = pool_maxsize
+        self.transport = transport if transport is not None else RequestsTransport(pool_maxsize)
+        self.profiler = Profiler(enabled=profile_from_env() if profile is None else profile)
+        if self.profiler.enabled:
+            self.transport.set_profiler(self.profiler)
+        self._warmup_thread = None
+        if eager_connect:
+            self._warmup_thread = threading.Thread(target=self.warmup, args=(eager_connect,), name='omni-warmup', daemon=True)
+            self._warmup_thread.start()
+
+    def warmup(self, connections: int = 1, timeout: float = 10.0) -> int:
+        '''
+        Open keep-alive connections to the Omni instance so the first API calls skip DNS
+        resolution and the TCP and TLS handshakes. Each connection is opened with a HEAD
+        request to the base URL and returned to the transport's pool.
+        connections: int - connections to open concurrently, at most pool_maxsize
+        timeout: float - seconds to wait for each connection
+        Returns the number of connections opened.
+        '''
+        connections = max(1, min(connections, self.pool_maxsize))
+        def connect(_) -> bool:
+            try:
+                self.transport.head(self.base_url, timeout=timeout)
+                return True
+            except Exception:
+                return False
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            return sum(executor.map(connect, range(connections)))
+
+    def wait_warm(self, timeout: Optional[float] = None) -> None:
+        '''
+        Wait for the connections opened by `eager_connect` during construction.
+        '''
+        if self._warmup_thread is not None:
+            self._warmup_thread.join(timeout)
+
+    def close(self) -> None:
+        '''
+        Close the pooled connections and shut down the worker processes used to decode results, if any.
+        '''
+        self.transport.close()
+        if self._decode_executor is not None:
+            self._decode_executor.shutdown()
+            self._decode_executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    async def _call_async(self, method: Callable, *args, **kwargs) -> Any:
+        '''
+        Run a coalesced method in the default executor, handling errors like `requests_error_handler`.
+        '''
+        try:
+            return await method.__wrapped__.run_async(self, *args, **kwargs)
+        except Exception as e:
+            print(f"Request Failed: {e}")
+            return None
 
     def _trim_base_url(self) -> None:
         '''
@@ -121,18 +222,80 @@ class OmniAPI:
         
         # URL encode the query parameter
         encoded_query = urllib.parse.urlencode({'job_ids': json.dumps(remaining_job_ids)})
-        response = requests.get(f"{url}?{encoded_query}", headers=self.headers)
+        response = self.transport.get(f"{url}?{encoded_query}", headers=self.headers)
         
         if response.status_code == 200:
             # Parse NDJSON response
-            response_json = ndjson.loads(response.text)
+            with self.profiler.phase('ndjson_parse'):
+                response_json = ndjson.loads(response.text)
             footer = response_json[-1]
             done = footer['timed_out'] == 'false'
             return response_json, done
         else:
             response.raise_for_status()
 
+    def _run_query_payload(self, body: dict, version:str='v1') -> dict:
+        """
+        Run a query, wait for its completion and return the NDJSON entry holding the result.
+        Raises:
+            ValueError: If no result is found in the response.
+            requests.exceptions.RequestException: If the API request fails.
+        """
+        url = f"{self.base_url}/api/{version}/query/run"
+        response = self.transport.post(url, headers=self.headers, json=body)
+        response.raise_for_status()
+        # Parse NDJSON response
+        with self.profiler.phase('ndjson_parse'):
+            response_json = ndjson.loads(response.text)
+        footer = response_json[-1]
+        done = footer['timed_out'] == 'false'
+        while not done:
+            response_json, done = self.wait_query_blocking(footer['remaining_job_ids'])
+        data_payload = next((data_payload for data_payload in response_json if "result" in data_payload), None)
+        if data_payload is None:
+            raise ValueError("No result found in the response.")
+        return data_payload
+
+    def _decode_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._decode_executor is None:
+                self._decode_executor = ProcessPoolExecutor(max_workers=self.decode_processes)
+            return self._decode_executor
+
+    def _decode_result(self, base64_data: str) -> pa.Table:
+        """
+        Decode a base64 encoded Arrow IPC stream into a table, in a worker process
+        when decode_processes is set, or spilled to disk when it exceeds the memory budget.
+        """
+        if self.decode_processes:
+            with self.profiler.phase('decode_worker'):
+                path = self._decode_pool().submit(decode_to_file, base64_data, self.decode_dir).result()
+            with self.profiler.phase('arrow_decode'):
+                return map_table(path)
+        if self.memory_budget is None:
+            return self._decode_in_memory(base64_data)
+        with self.memory_budget.reserve(estimated_size(base64_data)) as fits:
+            if fits:
+                # decode into Arrow's memory pool, where the budget accounts for the table
+                with self.profiler.phase('base64_decode'):
+                    buffer = decode_to_buffer(base64_data)
+                with self.profiler.phase('arrow_decode'):
+                    return ipc.open_stream(buffer).read_all()
+        # decode batch by batch into a file and map it, so the table is not held in memory
+        with self.profiler.phase('spill'):
+            return map_table(decode_to_file(base64_data, self.spill_dir))
+
+    def _decode_in_memory(self, base64_data: str) -> pa.Table:
+        with self.profiler.phase('base64_decode'):
+            raw_arrow_data = base64.b64decode(base64_data)
+        # Read Arrow table from raw data
+        with self.profiler.phase('arrow_decode'):
+            buffer = io.BytesIO(raw_arrow_data)
+            reader = ipc.open_stream(buffer)
+            return reader.read_all()
+
     @requests_error_handler
+    @coalesced
     def run_query_blocking(self, body: dict, version:str='v1') -> Tuple[pa.Table, List[dict]]:
         """
         Run a query and wait for its completion.
@@ -144,29 +307,134 @@ class OmniAPI:
             ValueError: If no result is found in the response.
             requests.exceptions.RequestException: If the API request fails.
         """
-        url = f"{self.base_url}/api/{version}/query/run"
-        response = requests.post(url, headers=self.headers, json=body)
-    
-        if response.status_code == 200:
-            # Parse NDJSON response
-            response_json = ndjson.loads(response.text)
-            footer = response_json[-1]
-            done = footer['timed_out'] == 'false'
-            while not done:
-                response_json, done = self.wait_query_blocking(footer['remaining_job_ids'])
-            data_payload = next((data_payload for data_payload in response_json if "result" in data_payload), None)
-            if data_payload is not None:
-                base64_data = data_payload['result']
-                raw_arrow_data = base64.b64decode(base64_data)
-                # Read Arrow table from raw data
-                buffer = io.BytesIO(raw_arrow_data)
-                reader = ipc.open_stream(buffer)
-                table = reader.read_all()
-                return table, data_payload['summary']['fields']
-            else:
-                raise ValueError("No result found in the response.")
-        else:
-            response.raise_for_status()
+        data_payload = self._run_query_payload(body, version)
+        return self._decode_result(data_payload['result']), data_payload['summary']['fields']
+
+    async def run_query_blocking_async(self, body: dict, version:str='v1') -> Tuple[pa.Table, List[dict]]:
+        """
+        Asyncio variant of `run_query_blocking`, run in the event loop's default executor.
+        """
+        return await self._call_async(OmniAPI.run_query_blocking, body, version)
+
+    @requests_error_handler
+    def run_query(self, body: dict, ordered: bool = True, labels: bool = False, cast: bool = False, optimize: bool = False, version:str='v1') -> QueryResult:
+        """
+        Run a query and return its result as a QueryResult backed by the Arrow table.
+        Column selection, renaming and casting are applied on the Arrow table without copying data.
+        Args:
+            body (dict): The query body.
+            ordered (bool): Select and order the columns as listed in the query fields. Defaults to True.
+            labels (bool): Rename columns to their labels from the result metadata. Defaults to False.
+            cast (bool): Cast columns to the types given by the result metadata. Defaults to False.
+            optimize (bool): Reduce the memory of the table, see `QueryResult.optimize`. Defaults to False.
+        Returns:
+            QueryResult: The result table together with its field metadata.
+        Raises:
+            ValueError: If no result is found in the response.
+            requests.exceptions.RequestException: If the API request fails.
+        """
+        data_payload = self._run_query_payload(body, version)
+        result = QueryResult(self._decode_result(data_payload['result']), data_payload['summary']['fields'])
+        if cast:
+            result = result.cast_types()
+        if ordered:
+            result = result.select(QueryResult.query_fields(body))
+        if labels:
+            result = result.with_labels()
+        if optimize:
+            result = result.optimize()
+        return result
+
+    @requests_error_handler
+    def run_query_to_file(self, body: dict, path: Union[str, BinaryIO], format: str = 'csv', ordered: bool = True, labels: bool = False, row_group_size: Optional[int] = None, compression: Optional[str] = None, version:str='v1') -> int:
+        """
+        Run a query and stream its result into a file one record batch at a time,
+        without building the full table, a DataFrame or the whole output in memory.
+        Args:
+            body (dict): The query body.
+            path (Union[str, BinaryIO]): A file path, or a writable binary file object which is flushed but left open.
+            format (str): One of 'csv', 'parquet', 'arrow' (IPC file) or 'ndjson'. Defaults to 'csv'.
+            ordered (bool): Write the columns in the order of the query fields. Defaults to True.
+            labels (bool): Rename columns to their labels from the result metadata. Defaults to False.
+            row_group_size (int, optional): Rows per parquet row group.
+            compression (str, optional): Parquet or Arrow IPC codec (e.g. 'zstd', 'snappy'), or 'gzip' for csv and ndjson.
+        Returns:
+            int: The number of rows written.
+        Raises:
+            ValueError: If no result is found in the response or the format is not supported.
+            requests.exceptions.RequestException: If the API request fails.
+        """
+        data_payload = self._run_query_payload(body, version)
+        columns = QueryResult.query_fields(body) if ordered else None
+        with self.profiler.phase('export'):
+            return export_result(data_payload['result'], data_payload['summary']['fields'], path, format, columns, labels, row_group_size, compression)
+
+    def _run_partition(self, body: dict, version:str='v1') -> Tuple[pa.Table, List[dict]]:
+        data_payload = self._run_query_payload(body, version)
+        return self._decode_result(data_payload['result']), data_payload['summary']['fields']
+
+    def iter_query_partitions(self, body: dict, partitions: List[Dict[str, dict]], max_workers: int = 4, version:str='v1') -> Iterator[Tuple[pa.Table, List[dict]]]:
+        """
+        Run one query per partition concurrently and yield the results in partition order.
+        Partition filters are combined with the query's filters on the same field, and
+        partitions that cannot match any row of the query are skipped. Each partition
+        keeps the query's limit.
+        Args:
+            body (dict): The query body.
+            partitions (List[Dict[str, dict]]): Filters keyed by field name to add to each
+                partition's query, e.g. from `partition.value_partitions`, `range_partitions`
+                or `date_partitions`.
+            max_workers (int): The number of partitions run at once. Defaults to 4.
+        Yields:
+            Tuple[pa.Table, List[dict]]: The result table and field information of each partition.
+        Raises:
+            ValueError: If no result is found in a response, or a partition filter cannot
+                be combined with the query's filter on the same field.
+            requests.exceptions.RequestException: If an API request fails.
+        """
+        bodies = [partition_body(body, partition) for partition in partitions]
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [executor.submit(self._run_partition, partition, version) for partition in bodies if partition is not None]
+            for future in futures:
+                yield future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @requests_error_handler
+    def run_query_partitioned(self, body: dict, partitions: List[Dict[str, dict]], max_workers: int = 4, version:str='v1') -> Tuple[pa.Table, List[dict]]:
+        """
+        Split a query into partitions, run them concurrently and concatenate the results.
+        Each partition downloads and decodes a smaller result, which avoids timeouts on very
+        large results and overlaps the downloads. The concatenated result is sorted again by
+        the query's sorts. A partition never widens the query: filters on the partition field
+        are combined with the query's filter. Every partition keeps the query's limit and the
+        sorted result is cut to it, so a sorted query returns the same rows as unpartitioned
+        (up to ties); without sorts any `limit` rows are kept.
+        Args:
+            body (dict): The query body.
+            partitions (List[Dict[str, dict]]): Filters keyed by field name to add to each
+                partition's query, e.g. from `partition.value_partitions`, `range_partitions`
+                or `date_partitions`.
+            max_workers (int): The number of partitions run at once. Defaults to 4.
+        Returns:
+            Tuple[pa.Table, List[dict]]: The concatenated result table and field information.
+        Raises:
+            ValueError: If no result is found in a response.
+            requests.exceptions.RequestException: If an API request fails.
+        """
+        tables, fields = [], []
+        for table, partition_fields in self.iter_query_partitions(body, partitions, max_workers, version):
+            tables.append(table)
+            fields = fields or partition_fields
+        if not tables:
+            raise ValueError("No partition can match a row of the query.")
+        # empty partitions may infer different (e.g. null) column types
+        table = sort_table(pa.concat_tables(tables, promote_options='default'), body)
+        limit = body.get('query', body).get('limit')
+        if limit is not None and table.num_rows > int(limit):
+            table = table.slice(0, int(limit))
+        return table, fields
 
     @requests_error_handler
     def create_user(self, body: dict, version:str='v2') -> requests.Response:
@@ -180,7 +448,7 @@ class OmniAPI:
             requests.exceptions.RequestException: If the API request fails.
         """
         url = f"{self.base_url}/api/scim/{version}/users"
-        response = requests.post(url, headers=self.headers, json=body)
+        response = self.transport.post(url, headers=self.headers, json=body)
         response.raise_for_status()
         return response
 
@@ -197,11 +465,12 @@ class OmniAPI:
             requests.exceptions.RequestException: If the API request fails.
         """
         url = f"{self.base_url}/api/scim/{version}/users/{id}"
-        response = requests.put(url, headers=self.headers, json=body)
+        response = self.transport.put(url, headers=self.headers, json=body)
         response.raise_for_status()
         return response
 
     @requests_error_handler
+    @coalesced
     def find_user_by_email(self, email: str, version:str='v2') -> requests.Response:
         """
         Find a user by email.
@@ -213,10 +482,89 @@ class OmniAPI:
             requests.exceptions.RequestException: If the API request fails.
         """
         url = f"{self.base_url}/api/scim/{version}/users"
-        response = requests.get(url, headers=self.headers, params={'filter': f'userName eq "{email}"'})
+        response = self.transport.get(url, headers=self.headers, params={'filter': f'userName eq "{email}"'})
         response.raise_for_status()
         return response
-    
+
+    async def find_user_by_email_async(self, email: str, version:str='v2') -> requests.Response:
+        """
+        Asyncio variant of `find_user_by_email`, run in the event loop's default executor.
+        """
+        return await self._call_async(OmniAPI.find_user_by_email, email, version)
+
+    @classmethod
+    def user_filters(cls, emails: List[str], max_filter_length: int = 2000, max_emails: int = 50) -> List[Tuple[List[str], str]]:
+        """
+        Pack emails into `or` combined SCIM `userName eq` filters of bounded length.
+        Args:
+            emails (List[str]): The emails to look up.
+            max_filter_length (int): Maximum length of a filter, which is sent in the query string. Defaults to 2000.
+            max_emails (int): Maximum number of emails in a filter. Defaults to 50.
+        Returns:
+            List[Tuple[List[str], str]]: The emails in each filter and the filter.
+        """
+        chunks = []
+        chunk, length = [], 0
+        for email in emails:
+            clause = f'userName eq {json.dumps(email)}'
+            added = len(clause) + (len(' or ') if chunk else 0)
+            if chunk and (length + added > max_filter_length or len(chunk) == max_emails):
+                chunks.append(chunk)
+                chunk, length, added = [], 0, len(clause)
+            chunk.append(clause)
+            length += added
+        if chunk:
+            chunks.append(chunk)
+        return [([json.loads(clause[len('userName eq '):]) for clause in chunk], ' or '.join(chunk)) for chunk in chunks]
+
+    @requests_error_handler
+    def _find_users(self, filter: str, count: int, version: str = 'v2') -> List[dict]:
+        url = f"{self.base_url}/api/scim/{version}/users"
+        users = []
+        startIndex = 1
+        while True:
+            response = self.transport.get(url, headers=self.headers, params={'filter': filter, 'count': count, 'startIndex': startIndex})
+            response.raise_for_status()
+            page = response.json()
+            users.extend(page['Resources'])
+            if not page['Resources'] or len(users) >= page.get('totalResults', 0):
+                return users
+            startIndex += len(page['Resources'])
+
+    def find_users_by_emails(self, emails: List[str], max_filter_length: int = 2000, max_emails: int = 50, max_workers: int = 4, version: str = 'v2') -> Dict[str, dict]:
+        """
+        Find many users by email with `or` combined SCIM filters, sending the filters
+        concurrently, so N emails take about N / max_emails requests.
+        Args:
+            emails (List[str]): The emails of the users to find.
+            max_filter_length (int): Maximum length of a filter. Defaults to 2000.
+            max_emails (int): Maximum number of emails in a filter. Defaults to 50.
+            max_workers (int): Maximum number of concurrent requests. Defaults to 4.
+        Returns:
+            Dict[str, dict]: The user of each email that matches exactly one user, keyed by the
+                email as given. Emails without a user, with several users or whose request
+                failed are left out.
+        """
+        unique = list(dict.fromkeys(email.lower() for email in emails))
+        chunks = self.user_filters(unique, max_filter_length, max_emails)
+        if not chunks:
+            return {}
+        matches: Dict[str, List[dict]] = {email: [] for email in unique}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+            results = executor.map(lambda chunk: self._find_users(chunk[1], 2 * len(chunk[0]), version), chunks)
+            for users in results:
+                for user in users or []:
+                    # SCIM matches userName case insensitively
+                    matches.get(user.get('userName', '').lower(), []).append(user)
+        found = {}
+        for email in emails:
+            users = matches[email.lower()]
+            if len(users) == 1:
+                found[email] = users[0]
+            elif len(users) > 1:
+                print(f"Found {len(users)} users for {email}")
+        return found
+
     def return_user_by_email(self, email: str) -> dict:
         """
         Find a user by email and return object
@@ -310,8 +658,10 @@ class OmniAPI:
             requests.Response: The response object from the delete operation.
         """
         url = f"{self.base_url}/api/scim/{version}/users"
-        response = requests.delete(f"{url}/{id}", headers=self.headers)
+        response = self.transport.delete(f"{url}/{id}", headers=self.headers)
         response.raise_for_status()
+        if self.membership is not None:
+            self.membership.remove_user(id)
         return response
 
     @requests_error_handler
@@ -324,7 +674,7 @@ class OmniAPI:
             dict: The exported document data as a dictionary.
         """
         url = f"{self.base_url}/api/{version}/documents/{id}/export"
-        response = requests.get(url,headers=self.headers)
+        response = self.transport.get(url,headers=self.headers)
         response.raise_for_status()
         return response.json()
 
@@ -338,7 +688,7 @@ class OmniAPI:
             requests.Response: The response object from the import operation.
         """
         url = f"{self.base_url}/api/{version}/documents/import"
-        response = requests.post(url,headers=self.headers, json=body)
+        response = self.transport.post(url,headers=self.headers, json=body)
         response.raise_for_status()
         return response
 
@@ -352,7 +702,7 @@ class OmniAPI:
             dict: A dictionary containing the list of folders.
         """
         url = f"{self.base_url}/api/{version}/folders"
-        response = requests.get(url, 
+        response = self.transport.get(url, 
                                 headers=self.headers, 
                                 params={
                                     'path': path,
@@ -371,7 +721,7 @@ class OmniAPI:
             dict: A dictionary containing the list of documents.
         """
         url = f"{self.base_url}/api/{version}/documents"
-        response = requests.get(url, 
+        response = self.transport.get(url, 
                                 headers=self.headers, 
                                 params={
                                     'folderId': folderId if folderId else None,
@@ -391,7 +741,7 @@ class OmniAPI:
             dict: A dictionary containing the list of folders.
         """
         url = f"{self.base_url}/api/scim/{version}/groups"
-        response = requests.get(url, 
+        response = self.transport.get(url, 
                                 headers=self.headers, 
                                 params={
                                     'count': count,
@@ -399,7 +749,8 @@ class OmniAPI:
                                     }
                                 )
         response.raise_for_status()
-        return response.json()
+        with self.profiler.phase('json_parse'):
+            return response.json()
     
     @requests_error_handler
     def generate_embed_url(self,body:dict) -> dict:
@@ -411,9 +762,44 @@ class OmniAPI:
             requests.Response: The response object containing the generated embed URL.
         """
         url = f"{self.base_url}/embed/sso/generate-url"
-        response = requests.post(url, headers=self.headers, json=body)
+        response = self.transport.post(url, headers=self.headers, json=body)
         response.raise_for_status()
         return response
+
+    def generate_embed_urls(self, bodies: List[dict], max_workers: int = 8, cache: Optional[EmbedUrlCache] = None) -> List[Optional[str]]:
+        """
+        Generate many embed URLs concurrently. Identical bodies are only sent once, and
+        URLs found in the cache are not requested again.
+        Args:
+            bodies (List[dict]): Request bodies as accepted by `generate_embed_url`.
+            max_workers (int): Maximum number of concurrent requests. Defaults to 8.
+            cache (EmbedUrlCache, optional): Cache of previously generated URLs to read and update.
+        Returns:
+            List[Optional[str]]: The URL for each body, in order, or None where generation failed.
+        """
+        keys = [embed_url_key(body) for body in bodies]
+        urls: Dict[str, Optional[str]] = {}
+        pending: Dict[str, dict] = {}
+        for key, body in zip(keys, bodies):
+            if key in urls or key in pending:
+                continue
+            url = cache.get(key) if cache is not None else None
+            if url is not None:
+                urls[key] = url
+            else:
+                pending[key] = body
+
+        def generate(body: dict) -> Optional[str]:
+            response = self.generate_embed_url(body)
+            return response.json().get('url') if response is not None else None
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as executor:
+                for key, url in zip(pending, executor.map(generate, pending.values())):
+                    urls[key] = url
+                    if url is not None and cache is not None:
+                        cache.put(key, url)
+        return [urls[key] for key in keys]
     
     @classmethod
     def listify(cls, d:dict) -> dict:
@@ -432,24 +818,42 @@ class OmniAPI:
                 out.update({k:v})
         return out
     
-    @memoized
-    def get_all_groups(self) -> List[dict]:
+    def list_all_groups(self) -> Optional[List[dict]]:
         """
-        Get all groups.
+        Get all groups, paging through `list_groups`. Unlike `get_all_groups` the listing
+        is not memoized, so every call reflects the current groups.
         Returns:
-            List[dict]: A list of dictionaries containing group information.
+            Optional[List[dict]]: A list of dictionaries containing group information, or None
+                if a page failed to load.
         """
         groups = []
         count = 100
         startIndex = 1
-        while True:
-            response = self.list_groups(count, startIndex)
-            groups.extend(response['Resources'])
-            if response['totalResults'] <= startIndex:
-                break
-            startIndex += count
+        with self.profiler.phase('pagination'):
+            while True:
+                response = self.list_groups(count, startIndex)
+                if response is None:
+                    return None
+                groups.extend(response['Resources'])
+                if response['totalResults'] <= startIndex:
+                    break
+                startIndex += count
         return groups
-    
+
+    @memoized
+    def get_all_groups(self) -> List[dict]:
+        """
+        Get all groups, listed once for the life of the client, see `list_all_groups`.
+        Returns:
+            List[dict]: A list of dictionaries containing group information.
+        Raises:
+            ValueError: If a page failed to load.
+        """
+        groups = self.list_all_groups()
+        if groups is None:
+            raise ValueError("Listing groups failed, see the error printed above.")
+        return groups
+
     @memoized
     def get_group_id(self, group_name:str) -> Union[str,None]:
         """
@@ -464,6 +868,7 @@ class OmniAPI:
         return group['id'] if group else None
     
     @requests_error_handler
+    @coalesced
     def get_group(self, group_id:str, version:str='v2') -> dict:
         """
         Get a group by its ID.
@@ -473,9 +878,15 @@ class OmniAPI:
             dict: The group information.
         """
         url = f"{self.base_url}/api/scim/{version}/groups/{group_id}"
-        response = requests.get(url, headers=self.headers)
+        response = self.transport.get(url, headers=self.headers)
         response.raise_for_status()
         return response.json()
+
+    async def get_group_async(self, group_id:str, version:str='v2') -> dict:
+        """
+        Asyncio variant of `get_group`, run in the event loop's default executor.
+        """
+        return await self._call_async(OmniAPI.get_group, group_id, version)
     
     @requests_error_handler
     def update_group(self, group_id:str, body:dict, version:str='v2') -> requests.Response:
@@ -488,7 +899,7 @@ class OmniAPI:
             requests.Response: The response object from the update operation.
         """
         url = f"{self.base_url}/api/scim/{version}/groups/{group_id}"
-        response = requests.put(url, headers=self.headers, json=body)
+        response = self.transport.put(url, headers=self.headers, json=body)
         response.raise_for_status()
         return response
     
@@ -510,7 +921,10 @@ class OmniAPI:
             "display": '',
             "value": user_id
         })
-        return self.update_group(group_id, group)
+        response = self.update_group(group_id, group)
+        if response is not None and self.membership is not None:
+            self.membership.set_group(group)
+        return response
     
     @requests_error_handler
     def remove_user_from_group(self, group_name:str, user_id:str) -> requests.Response:
@@ -527,7 +941,24 @@ class OmniAPI:
             raise ValueError(f"Group '{group_name}' not found.")
         group = self.get_group(group_id)
         group['members'] = [member for member in group['members'] if member['value'] != user_id]
-        return self.update_group(group_id, group)
+        response = self.update_group(group_id, group)
+        if response is not None and self.membership is not None:
+            self.membership.set_group(group)
+        return response
+
+    def build_membership_index(self, max_workers: int = 8) -> GroupMembershipIndex:
+        """
+        Build an index of which users are in which groups from a fresh group listing and
+        keep it in `membership`, where the client's own membership changes update it.
+        Args:
+            max_workers (int): Maximum number of concurrent requests for group members. Defaults to 8.
+        Returns:
+            GroupMembershipIndex: The index.
+        Raises:
+            ValueError: If the groups cannot be fetched.
+        """
+        self.membership = GroupMembershipIndex.build(self, max_workers)
+        return self.membership
     
     @requests_error_handler
     def create_model(self, connection_id: str, modelName:str, modelKind:str='SHARED', baseModelId:str=None, version:str='v1') -> dict:
@@ -548,7 +979,7 @@ class OmniAPI:
         body["modelName"] = modelName
         if baseModelId:
             body["baseModelId"] = baseModelId
-        response = requests.post(url, headers=self.headers, json=body)
+        response = self.transport.post(url, headers=self.headers, json=body)
         response.raise_for_status()
         return response.json()
     
@@ -567,7 +998,7 @@ class OmniAPI:
             requests.exceptions.RequestException: If the API request fails.
         """
         url = f"{self.base_url}/api/{version}/models"
-        response = requests.get(url, headers=self.headers, params={
+        response = self.transport.get(url, headers=self.headers, params={
             'name': name if name else None,
             'connectionId': connectionId if connectionId else None,
             'baseModelId': baseModelId if baseModelId else None,
@@ -576,6 +1007,23 @@ class OmniAPI:
         response.raise_for_status()
         return response.json()
 
+    @requests_error_handler
+    def get_topic(self, model_id:str, topic_name:str, version='v1') -> dict:
+        """
+        Get a topic definition, including its views, fields and relationships.
+        Args:
+            model_id (str): The ID of the model containing the topic.
+            topic_name (str): The name of the topic.
+        Returns:
+            dict: The topic definition.
+        Raises:
+            requests.exceptions.RequestException: If the API request fails.
+        """
+        url = f"{self.base_url}/api/{version}/models/{model_id}/topic/{urllib.parse.quote(topic_name)}"
+        response = self.transport.get(url, headers=self.headers)
+        response.raise_for_status()
+        return response.json()
+
     @requests_error_handler
     def yamlw(self, model_id:str, body:dict, version='unstable') -> dict:
         """
@@ -586,7 +1034,7 @@ class OmniAPI:
             dict: A dictionary containing the YAML representation of the input.
         """
         url = f"{self.base_url}/api/{version}/models/{model_id}/yaml"
-        response = requests.post(url, headers=self.headers, json=body)
+        response = self.transport.post(url, headers=self.headers, json=body)
         response.raise_for_status()
         return response.json()
 
@@ -600,6 +1048,6 @@ class OmniAPI:
             dict: A dictionary containing the YAML representation of the input.
         """
         url = f"{self.base_url}/api/{version}/models/{model_id}/yaml"
-        response = requests.get(url, headers=self.headers, params=body)
+        response = self.transport.get(url, headers=self.headers, params=body)
         response.raise_for_status()
         return response.json()
\ No newline at end of file
@@ -0,0 +1,215 @@
+import collections
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+
+def model_records(response) -> List[dict]:
+    """
+    Normalize a list_models response to a list of model dictionaries.
+    Args:
+        response: The JSON returned by `OmniAPI.list_models`, either a list of models
+            or a page object with a `records` key.
+    Returns:
+        List[dict]: The model records, empty if the request failed.
+    """
+    if response is None:
+        return []
+    if isinstance(response, dict):
+        return response.get('records', [])
+    return response
+
+
+class ModelCatalog:
+    """
+    Cached, indexed view of the models returned by `OmniAPI.list_models`.
+
+    Models are loaded once and indexed by id, name, connectionId, modelKind and
+    baseModelId. Once the TTL expires the next lookup re-lists the models and only
+    re-indexes the records that were added, changed or removed. When listing fails the
+    previous state is kept and the catalog waits for the TTL before trying again.
+    Example Use:
+        catalog = ModelCatalog(api, ttl=300)
+        model = catalog.get_by_name('Sales')
+        branches = catalog.branches(model['id'])
+    """
+    INDEXED_KEYS = ('name', 'connectionId', 'modelKind', 'baseModelId')
+
+    def __init__(self, api, ttl: float = 300, **filters):
+        """
+        Args:
+            api (OmniAPI): The client used to list models.
+            ttl (float): Seconds before the catalog is refreshed on the next lookup.
+            **filters: Extra keyword arguments passed to `list_models` (e.g. modelKind).
+        """
+        self.api = api
+        self.ttl = ttl
+        self.filters = filters
+        self._models: Dict[str, dict] = {}
+        self._indexes: Dict[str, Dict[str, Dict[str, None]]] = {key: {} for key in self.INDEXED_KEYS}
+        # time of the last listing attempt, successful or not
+        self._checked_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def _index(self, model: dict) -> None:
+        for key in self.INDEXED_KEYS:
+            value = model.get(key)
+            if value:
+                self._indexes[key].setdefault(value, {})[model['id']] = None
+
+    def _unindex(self, model: dict) -> None:
+        for key in self.INDEXED_KEYS:
+            value = model.get(key)
+            ids = self._indexes[key].get(value)
+            if ids is not None:
+                ids.pop(model['id'], None)
+                if not ids:
+                    del self._indexes[key][value]
+
+    def refresh(self) -> bool:
+        """
+        Re-list the models and update the indexes for the records that changed.
+        Returns:
+            bool: True if the listing succeeded, False if the previous state was kept.
+        """
+        response = self.api.list_models(**self.filters)
+        if response is None:
+            with self._lock:
+                self._checked_at = time.monotonic()
+            return False
+        records = {model['id']: model for model in model_records(response)}
+        with self._lock:
+            for model_id in [model_id for model_id in self._models if model_id not in records]:
+                self._unindex(self._models.pop(model_id))
+            for model_id, model in records.items():
+                cached = self._models.get(model_id)
+                if cached == model:
+                    continue
+                if cached is not None:
+                    self._unindex(cached)
+                self._models[model_id] = model
+                self._index(model)
+            self._checked_at = time.monotonic()
+        return True
+
+    def invalidate(self) -> None:
+        """
+        Force a refresh on the next lookup.
+        """
+        with self._lock:
+            self._checked_at = None
+
+    def _stale(self) -> bool:
+        return self._checked_at is None or time.monotonic() - self._checked_at >= self.ttl
+
+    def _ensure_fresh(self) -> None:
+        if self._stale():
+            with self._lock:
+                if self._stale():
+                    self.refresh()
+
+    def _lookup(self, key: str, value: str) -> List[dict]:
+        self._ensure_fresh()
+        with self._lock:
+            return [self._models[model_id] for model_id in self._indexes[key].get(value, {})]
+
+    def __len__(self) -> int:
+        self._ensure_fresh()
+        with self._lock:
+            return len(self._models)
+
+    def __iter__(self) -> Iterator[dict]:
+        self._ensure_fresh()
+        with self._lock:
+            return iter(list(self._models.values()))
+
+    def __contains__(self, model_id: str) -> bool:
+        return self.get(model_id) is not None
+
+    def get(self, model_id: str) -> Optional[dict]:
+        """
+        Get a model by its ID.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            return self._models.get(model_id)
+
+    def find_by_name(self, name: str) -> List[dict]:
+        """
+        Get all models with the given name.
+        """
+        return self._lookup('name', name)
+
+    def get_by_name(self, name: str, modelKind: Optional[str] = None) -> Optional[dict]:
+        """
+        Get the single model with the given name, optionally restricted to a model kind.
+        Returns:
+            Optional[dict]: The model, or None if there is no match or the name is ambiguous.
+        """
+        models = [model for model in self.find_by_name(name) if not modelKind or model.get('modelKind') == modelKind]
+        return models[0] if len(models) == 1 else None
+
+    def by_connection(self, connection_id: str) -> List[dict]:
+        """
+        Get all models built on a connection.
+        """
+        return self._lookup('connectionId', connection_id)
+
+    def by_kind(self, modelKind: str) -> List[dict]:
+        """
+        Get all models of a kind (SCHEMA, SHARED, SHARED_EXTENSION, BRANCH, ...).
+        """
+        return self._lookup('modelKind', modelKind)
+
+    def children(self, model_id: str) -> List[dict]:
+        """
+        Get the models whose baseModelId is the given model (branches, extensions, workbooks).
+        """
+        return self._lookup('baseModelId', model_id)
+
+    def branches(self, model_id: str) -> List[dict]:
+        """
+        Get the branches of a model.
+        """
+        return [model for model in self.children(model_id) if model.get('modelKind') == 'BRANCH']
+
+    def extensions(self, model_id: str) -> List[dict]:
+        """
+        Get the shared extensions of a model.
+        """
+        return [model for model in self.children(model_id) if model.get('modelKind') == 'SHARED_EXTENSION']
+
+    def parent(self, model_id: str) -> Optional[dict]:
+        """
+        Get the base model of a model, if it is loaded.
+        """
+        model = self.get(model_id)
+        return self.get(model['baseModelId']) if model and model.get('baseModelId') else None
+
+    def ancestors(self, model_id: str) -> List[dict]:
+        """
+        Get the chain of base models from the direct parent up to the root.
+        """
+        chain = []
+        seen = {model_id}
+        parent = self.parent(model_id)
+        while parent is not None and parent['id'] not in seen:
+            chain.append(parent)
+            seen.add(parent['id'])
+            parent = self.parent(parent['id'])
+        return chain
+
+    def descendants(self, model_id: str) -> List[dict]:
+        """
+        Walk the branch/extension tree below a model, breadth first.
+        """
+        result = []
+        seen = {model_id}
+        queue = collections.deque([model_id])
+        while queue:
+            for child in self.children(queue.popleft()):
+                if child['id'] not in seen:
+                    seen.add(child['id'])
+                    result.append(child)
+                    queue.append(child['id'])
+        return result
@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import BinaryIO, Dict, List, Optional
+from .daemon import CommandContext, DaemonConnectionLost, default_socket_path, forward
+
+# The `omni-sdk` command line. Commands are forwarded to the background daemon when it
+# is running (`omni-sdk daemon start`) and run in the calling process otherwise. Only the
+# standard library is imported until a command has to run locally.
+
+FORMATS = ('csv', 'parquet', 'arrow', 'ndjson')
+
+
+class CommandError(Exception):
+    """
+    A command failed; the message is shown to the user.
+    """
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='omni-sdk', description='Command line client for the Omni API.')
+    parser.add_argument('--api-key', help='Omni API key, OMNI_API_KEY by default')
+    parser.add_argument('--base-url', help='Omni instance URL, OMNI_BASE_URL by default')
+    parser.add_argument('--env-file', default='.env', help='file to read OMNI_API_KEY and OMNI_BASE_URL from')
+    parser.add_argument('--socket', default=default_socket_path(), help='the daemon socket')
+    parser.add_argument('--no-daemon', action='store_true', help='run in this process even if the daemon is running')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    query = commands.add_parser('query', help='run a query and write its result')
+    query.add_argument('body', help="the query JSON, or '-' to read it from stdin")
+    query.add_argument('--format', choices=FORMATS, default='csv')
+    query.add_argument('--output', help='file to write, stdout by default')
+    query.add_argument('--labels', action='store_true', help='name columns by their labels')
+
+    commands.add_parser('groups', help='list all groups')
+    group_id = commands.add_parser('group-id', help='get the id of a group by name')
+    group_id.add_argument('name')
+    user = commands.add_parser('user', help='find a user by email')
+    user.add_argument('email')
+    models = commands.add_parser('models', help='list models')
+    models.add_argument('--name')
+    models.add_argument('--kind')
+    models.add_argument('--connection')
+    topic = commands.add_parser('topic', help='get a topic of a model')
+    topic.add_argument('model_id')
+    topic.add_argument('topic_name')
+
+    daemon = commands.add_parser('daemon', help='manage the background daemon')
+    daemon.add_argument('action', choices=('start', 'stop', 'status'))
+    daemon.add_argument('--ttl', type=float, default=60, help='seconds the daemon reuses groups, models and query results')
+    return parser
+
+
+def _write_json(value, out: BinaryIO) -> None:
+    out.write((json.dumps(value, indent=2) + '\n').encode('utf-8'))
+
+
+def _required(value, message: str):
+    if value is None:
+        raise CommandError(message)
+    return value
+
+
+def _list_models(api) -> Optional[List[dict]]:
+    from .catalog import model_records
+    response = api.list_models()
+    return None if response is None else model_records(response)
+
+
+def run_command(argv: List[str], context: CommandContext, out: BinaryIO) -> int:
+    """
+    Run a command with the context's client, writing its output to `out`.
+    Returns:
+        int: The exit status.
+    Raises:
+        CommandError: If the command fails.
+    """
+    args = build_parser().parse_args(argv)
+    api = context.api
+    if args.command == 'query':
+        # `main` has read a body given as '-' from stdin and made the output path absolute
+        body = json.loads(args.body)
+        target = args.output or out
+        if context.ttl > 0:
+            from .export import write_batches
+            from .local import query_hash
+            result = context.cached(('query', query_hash(body), args.labels), lambda: api.run_query(body, labels=args.labels), size=lambda result: result.table.nbytes)
+            _required(result, "The query failed.")
+            write_batches(iter(result.table.to_batches()), result.table.schema, target, args.format)
+        else:
+            _required(api.run_query_to_file(body, target, args.format, labels=args.labels), "The query failed.")
+    elif args.command == 'groups':
+        _write_json(_required(context.cached('groups', api.list_all_groups), "Listing groups failed."), out)
+    elif args.command == 'group-id':
+        groups = _required(context.cached('groups', api.list_all_groups), "Listing groups failed.")
+        group = next((group for group in groups if group['displayName'] == args.name), None)
+        _write_json(_required(group, f"No group named '{args.name}'.")['id'], out)
+    elif args.command == 'user':
+        response = _required(api.find_user_by_email(args.email), "Finding the user failed.")
+        _write_json(response.json().get('Resources', []), out)
+    elif args.command == 'models':
+        models = _required(context.cached('models', lambda: _list_models(api)), "Listing models failed.")
+        filters = {'name': args.name, 'modelKind': args.kind, 'connectionId': args.connection}
+        _write_json([model for model in models if all(value is None or model.get(key) == value for key, value in filters.items())], out)
+    elif args.command == 'topic':
+        topic = context.cached(('topic', args.model_id, args.topic_name), lambda: api.get_topic(args.model_id, args.topic_name))
+        _write_json(_required(topic, "Getting the topic failed."), out)
+    else:
+        raise CommandError(f"Unknown command '{args.command}'.")
+    return 0
+
+
+def _credentials(args: argparse.Namespace) -> Dict[str, str]:
+    api_key = args.api_key or os.getenv('OMNI_API_KEY')
+    base_url = args.base_url or os.getenv('OMNI_BASE_URL')
+    if not (api_key and base_url) and os.path.exists(args.env_file):
+        from dotenv import dotenv_values
+        values = dotenv_values(args.env_file)
+        api_key = api_key or values.get('OMNI_API_KEY')
+        base_url = base_url or values.get('OMNI_BASE_URL')
+    return {'api_key': api_key or '', 'base_url': base_url or ''}
+
+
+def _wait(condition, timeout: float = 10) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def _daemon(args: argparse.Namespace) -> int:
+    try:
+        status, error = forward(['daemon', 'status' if args.action == 'start' else args.action], {}, args.socket, sys.stdout.buffer, timeout=5)
+        if args.action == 'start':
+            print("omni-sdk daemon is already running", file=sys.stderr)
+        elif args.action == 'stop':
+            _wait(lambda: not os.path.exists(args.socket))
+        return status
+    except (OSError, DaemonConnectionLost):
+        # a daemon that is shutting down may accept the connection and drop it
+        if args.action != 'start':
+            print("omni-sdk daemon is not running", file=sys.stderr)
+            return 0 if args.action == 'stop' else 1
+    log_path = f"{args.socket}.log"
+    with open(log_path, 'ab') as log:
+        subprocess.Popen(
+            [sys.executable, '-m', 'omni_python_sdk.daemon', args.socket, str(args.ttl)],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, start_new_session=True,
+        )
+    if _wait(lambda: os.path.exists(args.socket)):
+        print(f"omni-sdk daemon started on {args.socket}, logging to {log_path}", file=sys.stderr)
+        return 0
+    print(f"omni-sdk daemon did not start, see {log_path}", file=sys.stderr)
+    return 1
+
+
+def _command_argv(args: argparse.Namespace, argv: List[str]) -> List[str]:
+    # resolve what depends on the calling process (stdin, working directory), so the
+    # command runs the same in the daemon
+    if args.command != 'query':
+        return argv
+    command = ['query', sys.stdin.read() if args.body == '-' else args.body, '--format', args.format]
+    if args.output:
+        command += ['--output', os.path.abspath(args.output)]
+    if args.labels:
+        command.append('--labels')
+    return command
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    args = build_parser().parse_args(argv)
+    if args.command == 'daemon':
+        return _daemon(args)
+    credentials = _credentials(args)
+    argv = _command_argv(args, argv)
+    out = sys.stdout.buffer
+    sys.stdout.flush()
+    if not args.no_daemon and os.path.exists(args.socket):
+        try:
+            status, error = forward(argv, credentials, args.socket, out)
+        except DaemonConnectionLost as e:
+            # the command may have run, running it again could repeat its output
+            status, error = 1, str(e)
+        except OSError:
+            # stale socket, run the command here
+            status, error = None, None
+        if status is not None:
+            out.flush()
+            if error:
+                print(error, file=sys.stderr)
+            return status
+    from .api import OmniAPI
+    with OmniAPI(credentials['api_key'], credentials['base_url'], env_file=args.env_file) as api:
+        try:
+            status = run_command(argv, CommandContext(api), out)
+        except CommandError as e:
+            print(e, file=sys.stderr)
+            status = 1
+    out.flush()
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,264 @@
+import io
+import json
+import os
+import socket
+import socketserver
+import struct
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+# Background daemon for the `omni-sdk` command line. It listens on a Unix socket and runs
+# the commands of thin clients with warm state: one OmniAPI (and connection pool) per API
+# key and base URL, and time-limited caches of groups, models and query results.
+#
+# A client sends its arguments and credentials as one JSON line. The daemon answers with
+# frames of a 1 byte type and a 4 byte length: b'O' frames carry the command's output and
+# the final b'X' frame carries the exit status and error message as JSON.
+#
+# This module only imports the standard library at the top, so the thin client starts fast.
+
+FRAME_HEADER = struct.Struct('!cI')
+
+
+def default_socket_path() -> str:
+    """
+    The daemon socket, in the user's runtime directory when there is one.
+    """
+    directory = os.getenv('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(directory, f'omni-sdk-{os.getuid()}.sock')
+
+
+class FrameWriter(io.RawIOBase):
+    """
+    Writable binary stream sending everything written to it as output frames.
+    """
+
+    def __init__(self, connection: socket.socket):
+        self._connection = connection
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        if data:
+            self._connection.sendall(FRAME_HEADER.pack(b'O', len(data)) + data)
+        return len(data)
+
+
+def send_exit(connection: socket.socket, status: int, error: Optional[str] = None) -> None:
+    payload = json.dumps({'status': status, 'error': error}).encode('utf-8')
+    connection.sendall(FRAME_HEADER.pack(b'X', len(payload)) + payload)
+
+
+class DaemonConnectionLost(Exception):
+    """
+    The daemon accepted a command but the connection broke before its exit status arrived.
+    """
+
+
+def _read_exactly(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise ConnectionError("The omni-sdk daemon closed the connection.")
+    return data
+
+
+def forward(argv: List[str], credentials: Dict[str, str], socket_path: str, out: BinaryIO, timeout: Optional[float] = None) -> Tuple[int, Optional[str]]:
+    """
+    Run a command in the daemon, copying its output to `out`.
+    Returns:
+        Tuple[int, Optional[str]]: The exit status and error message of the command.
+    Raises:
+        OSError: If the daemon is not running, i.e. connecting fails.
+        DaemonConnectionLost: If the connection breaks once the command was sent; the
+            command may have run and written part of its output.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        connection.connect(socket_path)
+        try:
+            request = json.dumps({'argv': argv, **credentials}) + '\n'
+            connection.sendall(request.encode('utf-8'))
+            stream = connection.makefile('rb')
+            while True:
+                kind, size = FRAME_HEADER.unpack(_read_exactly(stream, FRAME_HEADER.size))
+                data = _read_exactly(stream, size)
+                if kind == b'X':
+                    result = json.loads(data)
+                    return result['status'], result['error']
+                out.write(data)
+        except OSError as e:
+            raise DaemonConnectionLost(f"Lost the connection to the omni-sdk daemon: {e}") from e
+
+
+class CommandContext:
+    """
+    A client and the caches commands may use. Without a TTL nothing is cached, which
+    is what a one-off command run in its own process wants. The least recently used
+    entries are dropped beyond `maxsize` entries or `max_bytes` of sized values.
+    """
+
+    def __init__(self, api, ttl: float = 0, maxsize: int = 256, max_bytes: int = 256 << 20):
+        """
+        Args:
+            api (OmniAPI): The client commands run with.
+            ttl (float): Seconds a cached value is reused for. Defaults to 0, no caching.
+            maxsize (int): Maximum number of cached values. Defaults to 256.
+            max_bytes (int): Maximum total size of the values cached with a size, e.g.
+                query results. Defaults to 256 MiB.
+        """
+        self.api = api
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.cached_bytes = 0
+        # key -> (expiry, value, size)
+        self._cache: 'OrderedDict[Any, Tuple[float, Any, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def cached(self, key: Any, load: Callable[[], Any], size: Optional[Callable[[Any], int]] = None) -> Any:
+        """
+        Return the cached value for the key if it is younger than the TTL, otherwise load it.
+        Values that failed to load (None) and values larger than `max_bytes` are not cached.
+        Args:
+            key: The cache key.
+            load (Callable[[], Any]): Loads the value.
+            size (Callable[[Any], int], optional): The size of a loaded value in bytes,
+                counted against `max_bytes`. Values without one count as 0 bytes.
+        """
+        if self.ttl <= 0:
+            return load()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > now:
+                self._cache.move_to_end(key)
+                return entry[1]
+        value = load()
+        if value is None:
+            return value
+        value_size = size(value) if size else 0
+        with self._lock:
+            self._pop(key)
+            if value_size <= self.max_bytes:
+                self._cache[key] = (now + self.ttl, value, value_size)
+                self.cached_bytes += value_size
+            while self._cache and (len(self._cache) > self.maxsize or self.cached_bytes > self.max_bytes):
+                self._pop(next(iter(self._cache)))
+        return value
+
+    def _pop(self, key: Any) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self.cached_bytes -= entry[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.cached_bytes = 0
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, run: Callable, ttl: float = 60, client: Optional[Callable] = None, max_bytes: int = 256 << 20):
+        """
+        Args:
+            socket_path (str): The Unix socket to listen on, replaced if it exists.
+            run (Callable): Runs a command: `run(argv, context, out) -> int`.
+            ttl (float): Seconds cached groups, models and query results are reused for.
+            client (Callable, optional): Creates the client for an API key and base URL, a
+                warm OmniAPI by default.
+            max_bytes (int): Maximum size of the query results cached per client. Defaults to 256 MiB.
+        """
+        self.client = client or self._default_client
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.run = run
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.contexts: Dict[Tuple[str, str], CommandContext] = {}
+        self._lock = threading.Lock()
+        # bind under a umask so the socket is never open to other users, not even
+        # before the chmod
+        umask = os.umask(0o077)
+        try:
+            super().__init__(socket_path, DaemonHandler)
+        finally:
+            os.umask(umask)
+        os.chmod(socket_path, 0o600)
+
+    @staticmethod
+    def _default_client(api_key: str, base_url: str):
+        from .api import OmniAPI
+        return OmniAPI(api_key, base_url, coalesce=True, eager_connect=1)
+
+    def context(self, api_key: str, base_url: str) -> CommandContext:
+        with self._lock:
+            context = self.contexts.get((api_key, base_url))
+            if context is None:
+                context = self.contexts[(api_key, base_url)] = CommandContext(self.client(api_key, base_url), self.ttl, max_bytes=self.max_bytes)
+            return context
+
+    def server_close(self) -> None:
+        super().server_close()
+        for context in self.contexts.values():
+            context.api.close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        argv = request.get('argv') or []
+        if argv[:2] == ['daemon', 'stop']:
+            send_exit(self.connection, 0)
+            threading.Thread(target=self.server.shutdown).start()
+            return
+        if argv[:2] == ['daemon', 'status']:
+            status = f"omni-sdk daemon running on {self.server.server_address} with {len(self.server.contexts)} client(s)\n"
+            FrameWriter(self.connection).write(status.encode('utf-8'))
+            send_exit(self.connection, 0)
+            return
+        api_key, base_url = request.get('api_key'), request.get('base_url')
+        if not (api_key and base_url):
+            # the client resolves the credentials, the daemon's own environment and
+            # working directory are not the caller's
+            send_exit(self.connection, 1, "No Omni API key or base URL: pass --api-key and --base-url, or set OMNI_API_KEY and OMNI_BASE_URL.")
+            return
+        out = io.BufferedWriter(FrameWriter(self.connection), buffer_size=1 << 16)
+        status, error = 1, None
+        try:
+            context = self.server.context(api_key, base_url)
+            status = self.server.run(argv, context, out)
+            out.flush()
+        except (Exception, SystemExit) as e:
+            status, error = 1, str(e) or type(e).__name__
+            try:
+                out.flush()
+            except (OSError, ValueError):
+                pass
+        # the exit frame is always sent, it is how the client knows the command finished
+        send_exit(self.connection, status, error)
+
+
+def serve(socket_path: str, ttl: float = 60) -> None:
+    """
+    Run the daemon in the foreground until it is stopped with `omni-sdk daemon stop`.
+    """
+    from .cli import run_command
+    with DaemonServer(socket_path, run_command, ttl) as server:
+        server.serve_forever()
+
+
+if __name__ == '__main__':
+    serve(sys.argv[1] if len(sys.argv) > 1 else default_socket_path(), float(sys.argv[2]) if len(sys.argv) > 2 else 60)
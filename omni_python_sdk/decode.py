@@ -0,0 +1,129 @@
+import contextlib
+import os
+import tempfile
+import threading
+import weakref
+import pyarrow as pa
+import pyarrow.ipc as ipc
+from typing import Iterator, Optional
+from .export import Base64Reader, open_result_stream
+
+# Decoding of query results in worker processes. A worker decodes the base64 Arrow
+# stream and writes it as an Arrow IPC file, preferably on a shared memory filesystem;
+# the calling process then memory-maps that file and reads the table without copying
+# the buffers. Base64 decoding and IPC parsing no longer hold the caller's GIL.
+
+
+def default_decode_dir() -> Optional[str]:
+    """
+    Use the shared memory filesystem when available, otherwise the default temp directory.
+    """
+    return '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
+
+
+def decode_to_file(base64_data: str, directory: Optional[str] = None) -> str:
+    """
+    Decode a base64 encoded Arrow IPC stream into an Arrow IPC file. Runs in a worker process.
+    Returns:
+        str: The path of the written file.
+    """
+    fd, path = tempfile.mkstemp(prefix='omni-result-', suffix='.arrow', dir=directory)
+    os.close(fd)
+    try:
+        reader = open_result_stream(base64_data)
+        with pa.OSFile(path, 'wb') as sink, ipc.new_file(sink, reader.schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def map_table(path: str) -> pa.Table:
+    """
+    Memory-map an Arrow IPC file and read it as a table backed by the mapping.
+    The file is removed once it is no longer needed.
+    """
+    with pa.memory_map(path, 'r') as source:
+        table = ipc.open_file(source).read_all()
+    try:
+        # the mapping stays valid after the name is removed on POSIX systems
+        os.unlink(path)
+    except OSError:
+        weakref.finalize(table, _remove, path)
+    return table
+
+
+def estimated_size(base64_data: str) -> int:
+    """
+    Estimate the decoded size of a base64 encoded Arrow IPC stream, which is about the
+    size of the table it holds when the stream is not compressed.
+    """
+    return len(base64_data) * 3 // 4
+
+
+def decode_to_buffer(base64_data: str) -> pa.Buffer:
+    """
+    Decode base64 data chunk by chunk into a buffer allocated by Arrow's memory pool, so
+    tables read from it count towards `pa.total_allocated_bytes()`.
+    """
+    size = estimated_size(base64_data) - base64_data[-2:].count('=')
+    buffer = pa.allocate_buffer(max(size, 0))
+    view = memoryview(buffer).cast('B')
+    reader = Base64Reader(base64_data)
+    written = 0
+    while written < size:
+        n = reader.readinto(view[written:])
+        if not n:
+            break
+        written += n
+    return buffer if written == size else buffer.slice(0, written)
+
+
+class MemoryBudget:
+    """
+    Limit on the Arrow memory of decoded results. Decoding reserves the estimated size of
+    its result; results that do not fit next to the memory allocated by Arrow's memory
+    pool (which holds the results decoded within the budget) and the other reservations
+    are spilled to disk instead. One budget can be shared by several clients.
+    Example Use:
+        budget = MemoryBudget(4 << 30)
+        api = OmniAPI(api_key, base_url, memory_budget=budget)
+    """
+
+    def __init__(self, limit: int):
+        """
+        Args:
+            limit (int): The budget in bytes.
+        """
+        self.limit = limit
+        self.reserved = 0
+        self.spills = 0
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def reserve(self, nbytes: int) -> Iterator[bool]:
+        """
+        Reserve memory for the duration of the block, yielding whether it fits in the budget.
+        Nothing is reserved when it does not fit.
+        """
+        with self._lock:
+            fits = pa.total_allocated_bytes() + self.reserved + nbytes <= self.limit
+            if fits:
+                self.reserved += nbytes
+            else:
+                self.spills += 1
+        try:
+            yield fits
+        finally:
+            if fits:
+                with self._lock:
+                    self.reserved -= nbytes
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+
+def embed_url_key(body: dict) -> str:
+    """
+    Key of an embed URL request: the sha256 of its canonical JSON body, so that equal
+    requests share a key regardless of key order and no secret is kept in the key.
+    """
+    canonical = json.dumps(body, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class EmbedUrlCache:
+    """
+    Time-limited cache of generated embed URLs keyed by `embed_url_key`.
+
+    Every request with the same body gets the same URL for `ttl` seconds, so the
+    window must be shorter than the lifetime of the generated URLs. The least recently
+    used entries are dropped beyond `maxsize`.
+    Example Use:
+        cache = EmbedUrlCache(ttl=30)
+        urls = api.generate_embed_urls(bodies, cache=cache)
+    """
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 10000, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttl (float): Seconds a generated URL is reused for. Defaults to 60.
+            maxsize (int): Maximum number of cached URLs. Defaults to 10000.
+            clock (Callable[[], float]): Time source, `time.monotonic` by default.
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached URL for the key, or None if there is none or it has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, url: str) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, url)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
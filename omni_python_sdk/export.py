@@ -0,0 +1,171 @@
+import base64
+import io
+import json
+import os
+import pyarrow as pa
+import pyarrow.ipc as ipc
+from typing import Dict, Iterator, List, Optional, Union, BinaryIO
+
+FORMATS = ('csv', 'parquet', 'arrow', 'ndjson')
+
+
+class Base64Reader(io.RawIOBase):
+    """
+    Read-only binary stream that decodes a base64 string chunk by chunk, so an Arrow
+    IPC stream can be read from a query result without decoding all of it up front.
+    """
+
+    def __init__(self, data: str, chunk_size: int = 1 << 20):
+        self._data = data
+        self._position = 0
+        # decode whole base64 quanta
+        self._chunk_size = max(4, chunk_size - chunk_size % 4)
+        self._buffer = memoryview(b'')
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer and self._position < len(self._data):
+            end = self._position + self._chunk_size
+            self._buffer = memoryview(base64.b64decode(self._data[self._position:end]))
+            self._position = end
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+class _CallerOwnedWriter(io.RawIOBase):
+    """
+    Writable stream over a file object owned by the caller: closing it flushes the
+    file object but leaves it open.
+    """
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._file.write(b)
+        return len(b)
+
+    def flush(self) -> None:
+        if not self.closed:
+            self._file.flush()
+
+
+def open_sink(path: Union[str, BinaryIO], compression: Optional[str] = None) -> pa.NativeFile:
+    """
+    Open an output stream for a path, or over a caller's file object which is flushed
+    but not closed when the stream is closed.
+    """
+    if isinstance(path, (str, os.PathLike)):
+        return pa.output_stream(path, compression=compression)
+    return pa.output_stream(_CallerOwnedWriter(path), compression=compression)
+
+
+def open_result_stream(base64_data: str) -> ipc.RecordBatchStreamReader:
+    """
+    Open the base64 encoded Arrow IPC stream of a query result as a record batch reader.
+    """
+    return ipc.open_stream(io.BufferedReader(Base64Reader(base64_data)))
+
+
+def project_batches(batches: Iterator[pa.RecordBatch], schema: pa.Schema, columns: List[str], names: List[str]) -> Iterator[pa.RecordBatch]:
+    """
+    Select, order and rename the columns of every batch without copying data.
+    """
+    indices = [schema.get_field_index(column) for column in columns]
+    for batch in batches:
+        yield pa.RecordBatch.from_arrays([batch.column(i) for i in indices], names=names)
+
+
+def write_batches(batches: Iterator[pa.RecordBatch], schema: pa.Schema, path: Union[str, BinaryIO], format: str = 'csv', row_group_size: Optional[int] = None, compression: Optional[str] = None) -> int:
+    """
+    Write record batches to a file one batch at a time.
+    Args:
+        batches: The record batches to write.
+        schema (pa.Schema): The schema of the batches.
+        path: A file path, or a writable binary file object which is flushed but left open.
+        format (str): One of 'csv', 'parquet', 'arrow' (IPC file) or 'ndjson'.
+        row_group_size (int, optional): Rows per parquet row group. Batches are buffered
+            until a row group is full; other formats write each batch as it arrives.
+        compression (str, optional): Parquet or Arrow IPC compression codec (e.g. 'zstd',
+            'snappy', 'lz4'), or a stream codec such as 'gzip' for csv and ndjson.
+    Returns:
+        int: The number of rows written.
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unsupported format '{format}', expected one of {', '.join(FORMATS)}.")
+    rows = 0
+    if format == 'parquet':
+        import pyarrow.parquet as pq
+        with pq.ParquetWriter(path, schema, compression=compression or 'snappy') as writer:
+            pending: List[pa.RecordBatch] = []
+            pending_rows = 0
+            for batch in batches:
+                if row_group_size is None:
+                    writer.write_batch(batch)
+                else:
+                    pending.append(batch)
+                    pending_rows += batch.num_rows
+                    if pending_rows >= row_group_size:
+                        # write full row groups and carry the remainder over
+                        table = pa.Table.from_batches(pending, schema)
+                        full = pending_rows - pending_rows % row_group_size
+                        writer.write_table(table.slice(0, full), row_group_size=row_group_size)
+                        pending = table.slice(full).to_batches()
+                        pending_rows -= full
+                rows += batch.num_rows
+            if pending:
+                writer.write_table(pa.Table.from_batches(pending, schema), row_group_size=row_group_size)
+        return rows
+
+    if format == 'arrow':
+        options = ipc.IpcWriteOptions(compression=compression)
+        with open_sink(path) as sink, ipc.new_file(sink, schema, options=options) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        return rows
+
+    with open_sink(path, compression) as sink:
+        if format == 'csv':
+            import pyarrow.csv as csv
+            with csv.CSVWriter(sink, schema) as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+        else:
+            for batch in batches:
+                lines = ''.join(json.dumps(row, default=str) + '\n' for row in batch.to_pylist())
+                sink.write(lines.encode('utf-8'))
+                rows += batch.num_rows
+    return rows
+
+
+def export_result(base64_data: str, fields: Dict[str, dict], path: Union[str, BinaryIO], format: str = 'csv', columns: Optional[List[str]] = None, labels: bool = False, row_group_size: Optional[int] = None, compression: Optional[str] = None) -> int:
+    """
+    Stream a base64 encoded query result into a file, selecting and renaming columns on the way.
+    Args:
+        base64_data (str): The `result` of a query response.
+        fields (Dict[str, dict]): The `summary.fields` metadata keyed by field name.
+        columns (List[str], optional): Columns to write, in order. Missing columns are skipped.
+        labels (bool): Rename columns to their labels from the field metadata.
+    Returns:
+        int: The number of rows written.
+    """
+    reader = open_result_stream(base64_data)
+    schema = reader.schema
+    selected = [column for column in (columns or []) if column in schema.names] or schema.names
+    names = [(fields.get(column, {}).get('label') or column) if labels else column for column in selected]
+    batches = iter(reader)
+    if selected != schema.names or names != schema.names:
+        batches = project_batches(batches, schema, selected, names)
+        schema = pa.schema([schema.field(column).with_name(name) for column, name in zip(selected, names)])
+    return write_batches(batches, schema, path, format, row_group_size, compression)
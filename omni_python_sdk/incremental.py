@@ -0,0 +1,148 @@
+import datetime
+import os
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+from typing import Any, Callable, Optional, Union
+from .partition import on_or_after_filter, partition_body, sort_table
+
+
+class IncrementalQuery:
+    """
+    Keeps the result of a time-series query and refreshes it incrementally.
+
+    The first refresh runs the full query. Later refreshes only query the rows on or after
+    the watermark (the latest date fetched) minus an overlap for late arriving data, and
+    replace that window of the kept table with the fetched rows. The date field must be a
+    date: a date column or ISO date strings. With a path the table is kept in an Arrow IPC
+    file, so separate runs of a job share it.
+    Example Use:
+        daily_sales = IncrementalQuery(api, query, 'order_items.created_at[date]', overlap=2, path='daily_sales.arrow')
+        table = daily_sales.refresh()
+    """
+
+    def __init__(self, api, body: dict, date_field: str, overlap: Union[int, datetime.timedelta] = 1, path: Optional[str] = None, filter_field: Optional[str] = None, window_filter: Callable[[str], dict] = on_or_after_filter):
+        """
+        Args:
+            api (OmniAPI): The client running the queries.
+            body (dict): The query body, with or without the top level "query" key.
+            date_field (str): The date dimension of the result, e.g. "order_items.created_at[date]".
+            overlap (int | timedelta): Days (or a timedelta) before the watermark to query again. Defaults to 1.
+            path (str, optional): Arrow IPC file to load the kept table from and save it to.
+            filter_field (str, optional): The field to filter the window on, `date_field` by default.
+                It must select the same rows as `date_field`, e.g. the same dimension at another
+                timeframe. A range filter of the query on it is intersected with the window.
+            window_filter (Callable[[str], dict]): Builds the window filter from the ISO start date.
+        """
+        self.api = api
+        self.body = body
+        self.date_field = date_field
+        self.overlap = datetime.timedelta(days=overlap) if isinstance(overlap, int) else overlap
+        self.path = path
+        self.filter_field = filter_field or date_field
+        self.window_filter = window_filter
+        self.table: Optional[pa.Table] = None
+        # rows fetched by the last refresh
+        self.fetched_rows = 0
+        if path and os.path.exists(path):
+            with pa.memory_map(path, 'r') as source:
+                table = ipc.open_file(source).read_all()
+            self._check_dates(table)
+            self.table = table
+
+    @property
+    def watermark(self) -> Any:
+        """
+        The latest value of the date field in the kept table, or None.
+        """
+        if self.table is None or self.table.num_rows == 0:
+            return None
+        return pc.max(self.table.column(self.date_field)).as_py()
+
+    def _check_dates(self, table: pa.Table) -> None:
+        # the window is computed in days, so the date field must hold dates and not
+        # numbers or timestamps; checked before anything is kept or queried again
+        if self.date_field not in table.column_names:
+            raise ValueError(f"The result has no {self.date_field!r} column to take the watermark from.")
+        column = table.column(self.date_field)
+        if pa.types.is_date(column.type):
+            return
+        if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+            value = pc.max(column).as_py()
+            try:
+                if value is not None:
+                    datetime.date.fromisoformat(value[:10])
+                return
+            except ValueError:
+                pass
+            raise ValueError(f"The {self.date_field!r} column holds {value!r}, not ISO dates.")
+        raise ValueError(
+            f"The {self.date_field!r} column is {column.type}, not a date. "
+            "Use the [date] timeframe of the dimension, e.g. 'order_items.created_at[date]'."
+        )
+
+    def _window_start(self, watermark: Any) -> Any:
+        if isinstance(watermark, str):
+            # ISO dates and timestamps compare correctly as strings
+            start = datetime.date.fromisoformat(watermark[:10]) - self.overlap
+            return start.isoformat()
+        return watermark - self.overlap
+
+    def _run(self, body: dict) -> pa.Table:
+        result = self.api.run_query_blocking(body)
+        if result is None:
+            raise ValueError("The query failed, see the error printed above.")
+        table = result[0]
+        self._check_dates(table)
+        return table
+
+    def _merge(self, kept: pa.Table, fetched: Optional[pa.Table], start: Any) -> pa.Table:
+        # the fetched rows replace the whole window, including rows deleted since
+        dates = kept.column(self.date_field)
+        kept = kept.filter(pc.less(dates, start if isinstance(start, str) else pa.scalar(start, type=dates.type)))
+        if fetched is None:
+            return kept
+        return pa.concat_tables([kept, fetched.select(kept.column_names).cast(kept.schema)])
+
+    def refresh(self, full: bool = False) -> pa.Table:
+        """
+        Query the rows after the watermark (or everything on the first run) and merge them
+        into the kept table.
+        Args:
+            full (bool): Run the full query again and replace the kept table. Defaults to False.
+        Returns:
+            pa.Table: The merged table.
+        Raises:
+            ValueError: If the query fails, the date field is not a date, or the query filters
+                the window's field in a way the window cannot be combined with.
+        """
+        watermark = None if full else self.watermark
+        if watermark is None:
+            table = self._run(self.body)
+            self.fetched_rows = table.num_rows
+        else:
+            start = self._window_start(watermark)
+            start_value = start if isinstance(start, str) else start.isoformat()
+            body = partition_body(self.body, {self.filter_field: self.window_filter(start_value)})
+            # None when the query's own filter ends before the window
+            fetched = self._run(body) if body is not None else None
+            self.fetched_rows = fetched.num_rows if fetched is not None else 0
+            table = self._merge(self.table, fetched, start)
+        self.table = sort_table(table, self.body)
+        if self.path:
+            self.save()
+        return self.table
+
+    def save(self) -> None:
+        """
+        Write the kept table to the path, replacing the file atomically.
+        """
+        temp_path = f"{self.path}.tmp"
+        try:
+            with pa.OSFile(temp_path, 'wb') as sink, ipc.new_file(sink, self.table.schema) as writer:
+                writer.write_table(self.table)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
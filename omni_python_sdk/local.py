@@ -0,0 +1,140 @@
+import hashlib
+import json
+import threading
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+
+def query_hash(body: dict) -> str:
+    """
+    Name for a query's result: a hash of the canonical JSON query body.
+    """
+    canonical = json.dumps(body, sort_keys=True, separators=(',', ':'), default=str)
+    return 'q_' + hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+class LocalQueryEngine:
+    """
+    Runs follow-up queries locally against fetched results instead of querying Omni again.
+
+    Tables are registered by name, or by the hash of the query that produced them, and
+    queried with SQL through DuckDB (optional dependency, `pip install omni_python_sdk[local]`)
+    or with the vectorized filter, group by and join of pyarrow's Acero engine. DuckDB
+    scans the registered Arrow tables in place and every result is returned as Arrow.
+    Column names keep the field names of the results, e.g. "order_items.status", which
+    have to be double quoted in SQL.
+    Example Use:
+        engine = LocalQueryEngine(api)
+        orders = engine.fetch(query)
+        engine.sql(f'SELECT "order_items.status", SUM("order_items.sale_price") FROM {orders} GROUP BY 1')
+        engine.group_by(orders, ['order_items.status'], [('order_items.sale_price', 'sum')])
+    """
+
+    def __init__(self, api=None):
+        """
+        Args:
+            api (OmniAPI, optional): Client used by `fetch` to run queries.
+        """
+        self.api = api
+        self.tables: Dict[str, pa.Table] = {}
+        self._connection = None
+        self._lock = threading.RLock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.tables
+
+    def _duckdb(self):
+        if self._connection is None:
+            try:
+                import duckdb
+            except ImportError as e:
+                raise ImportError("SQL queries require duckdb: pip install omni_python_sdk[local]") from e
+            self._connection = duckdb.connect()
+            for name, table in self.tables.items():
+                self._connection.register(name, table)
+        return self._connection
+
+    def register(self, name: str, table: pa.Table) -> str:
+        """
+        Register a table under a name, replacing any table with the same name.
+        """
+        with self._lock:
+            self.tables[name] = table
+            if self._connection is not None:
+                self._connection.register(name, table)
+        return name
+
+    def register_result(self, body: dict, table: pa.Table) -> str:
+        """
+        Register the result of a query under its `query_hash`, and return the name.
+        """
+        return self.register(query_hash(body), table)
+
+    def fetch(self, body: dict, name: Optional[str] = None, refresh: bool = False) -> str:
+        """
+        Run a query with the client unless its result is already registered.
+        Args:
+            body (dict): The query body.
+            name (str, optional): Name to register the result under, its `query_hash` by default.
+            refresh (bool): Run the query again even if it is registered. Defaults to False.
+        Returns:
+            str: The name of the registered result.
+        Raises:
+            ValueError: If there is no client or the query fails.
+        """
+        name = name or query_hash(body)
+        if name in self.tables and not refresh:
+            return name
+        if self.api is None:
+            raise ValueError("LocalQueryEngine needs an OmniAPI client to fetch queries.")
+        result = self.api.run_query_blocking(body)
+        if result is None:
+            raise ValueError("The query failed, see the error printed above.")
+        return self.register(name, result[0])
+
+    def drop(self, name: str) -> None:
+        with self._lock:
+            self.tables.pop(name, None)
+            if self._connection is not None:
+                self._connection.unregister(name)
+
+    def table(self, name: str) -> pa.Table:
+        return self.tables[name]
+
+    def sql(self, query: str) -> pa.Table:
+        """
+        Run a SQL query with DuckDB over the registered tables and return the result as Arrow.
+        """
+        with self._lock:
+            result = self._duckdb().execute(query)
+            # fetch_arrow_table was renamed to to_arrow_table in duckdb 1.4
+            return result.to_arrow_table() if hasattr(result, 'to_arrow_table') else result.fetch_arrow_table()
+
+    def filter(self, name: str, expression: pc.Expression, columns: Optional[List[str]] = None) -> pa.Table:
+        """
+        Filter a registered table with a pyarrow compute expression.
+        Example Use:
+            engine.filter(orders, pc.field('order_items.status') == 'Complete')
+        """
+        table = self.tables[name].filter(expression)
+        return table.select(columns) if columns else table
+
+    def group_by(self, name: str, keys: Union[str, List[str]], aggregations: Sequence[Tuple[str, str]]) -> pa.Table:
+        """
+        Group a registered table and aggregate columns with pyarrow's hash aggregate
+        functions, e.g. [('order_items.sale_price', 'sum'), ('order_items.id', 'count_distinct')].
+        """
+        return self.tables[name].group_by(keys).aggregate(list(aggregations))
+
+    def join(self, left: str, right: str, keys: Union[str, List[str]], right_keys: Union[str, List[str], None] = None, join_type: str = 'inner') -> pa.Table:
+        """
+        Join two registered tables, see `pa.Table.join` for the join types.
+        """
+        return self.tables[left].join(self.tables[right], keys, right_keys, join_type=join_type)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,127 @@
+import threading
+import pyarrow as pa
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set
+
+
+class GroupMembershipIndex:
+    """
+    Index of group membership in both directions: group id -> member user ids and
+    user id -> group ids, so "which groups is this user in" is a dictionary lookup
+    instead of a scan of every group's members.
+
+    Built once from the group listing, fetching the members of groups listed without
+    them concurrently. `OmniAPI.add_user_to_group` and `remove_user_from_group` update the
+    index the client holds in `membership`, and `delete_user_by_id` (which `delete_user`
+    calls) removes deleted users from it.
+    Example Use:
+        index = api.build_membership_index()
+        index.groups_of(user['id'])
+        audit = index.to_arrow()
+    """
+
+    def __init__(self):
+        self.group_names: Dict[str, str] = {}
+        self.members: Dict[str, Set[str]] = {}
+        self.user_groups: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, api, max_workers: int = 8) -> 'GroupMembershipIndex':
+        """
+        Build the index from a fresh listing of the client's groups (`list_all_groups`).
+        Args:
+            api (OmniAPI): The client to list groups with.
+            max_workers (int): Maximum number of concurrent member requests. Defaults to 8.
+        Returns:
+            GroupMembershipIndex: The index.
+        Raises:
+            ValueError: If the groups or a group's members cannot be fetched.
+        """
+        groups = api.list_all_groups()
+        if groups is None:
+            raise ValueError("Listing groups failed, see the error printed above.")
+        index = cls()
+        listed = [group for group in groups if 'members' in group]
+        missing = [group['id'] for group in groups if 'members' not in group]
+        for group in listed:
+            index.set_group(group)
+        if missing:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as executor:
+                for group_id, group in zip(missing, executor.map(api.get_group, missing)):
+                    if group is None:
+                        raise ValueError(f"Getting group '{group_id}' failed, see the error printed above.")
+                    index.set_group(group)
+        return index
+
+    def set_group(self, group: dict) -> None:
+        """
+        Replace the members of a group with those of a SCIM group.
+        """
+        group_id = group['id']
+        members = {member['value'] for member in group.get('members') or []}
+        with self._lock:
+            self.group_names[group_id] = group.get('displayName', '')
+            for user_id in self.members.get(group_id, set()) - members:
+                self._discard(user_id, group_id)
+            for user_id in members:
+                self.user_groups.setdefault(user_id, set()).add(group_id)
+            self.members[group_id] = members
+
+    def _discard(self, user_id: str, group_id: str) -> None:
+        groups = self.user_groups.get(user_id)
+        if groups is not None:
+            groups.discard(group_id)
+            if not groups:
+                del self.user_groups[user_id]
+
+    def add(self, group_id: str, user_id: str) -> None:
+        with self._lock:
+            self.members.setdefault(group_id, set()).add(user_id)
+            self.user_groups.setdefault(user_id, set()).add(group_id)
+
+    def remove(self, group_id: str, user_id: str) -> None:
+        with self._lock:
+            self.members.get(group_id, set()).discard(user_id)
+            self._discard(user_id, group_id)
+
+    def remove_user(self, user_id: str) -> None:
+        """
+        Remove a user from every group, e.g. once the user is deleted.
+        """
+        with self._lock:
+            for group_id in self.user_groups.pop(user_id, set()):
+                self.members.get(group_id, set()).discard(user_id)
+
+    def remove_group(self, group_id: str) -> None:
+        with self._lock:
+            for user_id in self.members.pop(group_id, set()):
+                self._discard(user_id, group_id)
+            self.group_names.pop(group_id, None)
+
+    def groups_of(self, user_id: str) -> Set[str]:
+        """
+        The ids of the groups a user is a member of.
+        """
+        return set(self.user_groups.get(user_id, ()))
+
+    def members_of(self, group_id: str) -> Set[str]:
+        """
+        The user ids of a group's members.
+        """
+        return set(self.members.get(group_id, ()))
+
+    def group_names_of(self, user_id: str) -> List[str]:
+        return sorted(self.group_names.get(group_id, group_id) for group_id in self.groups_of(user_id))
+
+    def to_arrow(self) -> pa.Table:
+        """
+        One row per membership with the columns group_id, group_name and user_id.
+        """
+        with self._lock:
+            rows = [(group_id, self.group_names.get(group_id, ''), user_id) for group_id, members in self.members.items() for user_id in sorted(members)]
+        return pa.table({
+            'group_id': pa.array([row[0] for row in rows], pa.string()),
+            'group_name': pa.array([row[1] for row in rows], pa.string()),
+            'user_id': pa.array([row[2] for row in rows], pa.string()),
+        })
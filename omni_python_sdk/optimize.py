@@ -0,0 +1,138 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Dict, Optional, Tuple
+
+# Memory optimization of decoded results. Every column is rewritten with vectorized Arrow
+# compute kernels only when the result is exactly equal in value:
+#   - repeated strings of dimensions are dictionary-encoded with the narrowest index type
+#   - integers are downcast to the narrowest type holding their min and max
+#   - float64 columns become float32 when every value survives the round trip
+#   - timestamp and date strings are parsed, 64-bit dates become 32-bit dates
+#   - timestamps are normalized to microseconds
+
+INTEGER_TYPES = (pa.int8(), pa.int16(), pa.int32(), pa.int64())
+INDEX_TYPES = (pa.int8(), pa.int16(), pa.int32())
+TEMPORAL_DATA_TYPES = {
+    'TIMESTAMP': pa.timestamp('us'),
+    'DATE': pa.date32(),
+}
+
+
+INTEGER_BOUNDS = {type: (-(1 << (type.bit_width - 1)), (1 << (type.bit_width - 1)) - 1) for type in INTEGER_TYPES}
+
+
+def _narrowest_integer(low: int, high: int, types=INTEGER_TYPES) -> Optional[pa.DataType]:
+    for type in types:
+        if INTEGER_BOUNDS[type][0] <= low and high <= INTEGER_BOUNDS[type][1]:
+            return type
+    return None
+
+
+def _dictionary_encode(column: pa.ChunkedArray, max_cardinality: float) -> Optional[pa.ChunkedArray]:
+    if len(column) == 0:
+        return None
+    distinct = pc.count_distinct(column, mode='all').as_py()
+    if distinct > max_cardinality * len(column):
+        return None
+    index_type = _narrowest_integer(0, distinct, INDEX_TYPES)
+    encoded = pc.dictionary_encode(column).cast(pa.dictionary(index_type, column.type))
+    return encoded if encoded.nbytes < column.nbytes else None
+
+
+def _downcast_integer(column: pa.ChunkedArray) -> Optional[pa.ChunkedArray]:
+    bounds = pc.min_max(column)
+    low, high = bounds['min'].as_py(), bounds['max'].as_py()
+    if low is None:
+        return None
+    type = _narrowest_integer(low, high)
+    if type is None or type.bit_width >= column.type.bit_width:
+        return None
+    return column.cast(type)
+
+
+def _downcast_float(column: pa.ChunkedArray) -> Optional[pa.ChunkedArray]:
+    narrow = column.cast(pa.float32(), safe=False)
+    # NaN never equals itself, so compare NaN positions separately
+    same = pc.or_kleene(pc.equal(narrow.cast(pa.float64()), column), pc.and_(pc.is_nan(narrow), pc.is_nan(column)))
+    if not pc.all(same).as_py():
+        return None
+    return narrow
+
+
+def _normalize_temporal(column: pa.ChunkedArray, data_type: Optional[str]) -> Optional[pa.ChunkedArray]:
+    current = column.type
+    if pa.types.is_string(current) or pa.types.is_large_string(current):
+        target = TEMPORAL_DATA_TYPES.get(data_type)
+        if target is None:
+            return None
+        try:
+            return column.cast(target)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            return None
+    if pa.types.is_date64(current):
+        return column.cast(pa.date32())
+    if pa.types.is_timestamp(current) and current.unit != 'us':
+        try:
+            return column.cast(pa.timestamp('us', current.tz))
+        except pa.ArrowInvalid:
+            # out of range or sub-microsecond values are kept as they are
+            return None
+    return None
+
+
+def optimize_column(column: pa.ChunkedArray, field: dict, max_cardinality: float = 0.5) -> Optional[pa.ChunkedArray]:
+    """
+    Return a smaller or pandas-friendlier equivalent of the column, or None to keep it.
+    Args:
+        column (pa.ChunkedArray): The column.
+        field (dict): The field metadata of the column, may be empty.
+        max_cardinality (float): Dictionary-encode strings with at most this ratio of distinct
+            values to rows. Defaults to 0.5.
+    """
+    type = column.type
+    data_type = field.get('data_type')
+    temporal = _normalize_temporal(column, data_type)
+    if temporal is not None:
+        return temporal
+    if pa.types.is_string(type) or pa.types.is_large_string(type):
+        # measures are aggregates and rarely repeat
+        if field.get('is_dimension', True):
+            return _dictionary_encode(column, max_cardinality)
+        return None
+    if pa.types.is_integer(type):
+        return _downcast_integer(column)
+    if pa.types.is_float64(type):
+        return _downcast_float(column)
+    return None
+
+
+def optimize_table(table: pa.Table, fields: Dict[str, dict], max_cardinality: float = 0.5) -> Tuple[pa.Table, Dict[str, dict]]:
+    """
+    Reduce the memory of a result table using its field metadata, see `optimize_column`.
+    Args:
+        table (pa.Table): The result table.
+        fields (Dict[str, dict]): The `summary.fields` metadata keyed by column name.
+        max_cardinality (float): Dictionary-encode strings with at most this ratio of distinct
+            values to rows. Defaults to 0.5.
+    Returns:
+        Tuple[pa.Table, Dict[str, dict]]: The optimized table and, for every changed column,
+            its old and new type and the bytes saved.
+    Example Use:
+        table, fields = api.run_query_blocking(query)
+        table, report = optimize_table(table, fields)
+    """
+    report = {}
+    for i, name in enumerate(table.column_names):
+        column = table.column(i)
+        optimized = optimize_column(column, (fields or {}).get(name) or {}, max_cardinality)
+        if optimized is None:
+            continue
+        table = table.set_column(i, name, optimized)
+        report[name] = {
+            'from': str(column.type),
+            'to': str(optimized.type),
+            'bytes_saved': column.nbytes - optimized.nbytes,
+        }
+    if any(pa.types.is_dictionary(type) for type in table.schema.types):
+        table = table.unify_dictionaries()
+    return table, report
@@ -0,0 +1,280 @@
+import copy
+import datetime
+import pyarrow as pa
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+# Helpers to split one query body into several bodies that each return a slice of
+# the result. A partition is a mapping of field name -> filter that is merged into
+# the query's "filters". A partition never widens the query: when the query already
+# filters the same field the two filters are combined, see `combine_filters`.
+#
+# Range filters bound a field from below, above or both. BETWEEN includes both sides.
+RANGE_KINDS = {
+    # kind: (bounded side, inclusive)
+    'GREATER_THAN_OR_EQUAL': ('low', True),
+    'GREATER_THAN': ('low', False),
+    'ON_OR_AFTER': ('low', True),
+    'LESS_THAN_OR_EQUAL': ('high', True),
+    'LESS_THAN': ('high', False),
+    'BEFORE': ('high', False),
+}
+
+Bound = Optional[Tuple[Any, bool]]
+
+
+def _is_number(type: str) -> bool:
+    return type == 'number'
+
+
+def _bound_value(value: Any, type: str) -> Any:
+    # numbers may be given as strings, compare them as numbers
+    if _is_number(type) and isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
+    return value
+
+
+def _range_bounds(filter: dict) -> Optional[Tuple[Bound, Bound]]:
+    # (low, high) bounds of a range filter as (value, inclusive), None for other filters
+    if filter.get('is_negative'):
+        return None
+    kind, type = filter.get('kind'), filter.get('type')
+    if kind == 'BETWEEN':
+        return (_bound_value(filter['left_side'], type), True), (_bound_value(filter['right_side'], type), True)
+    if kind not in RANGE_KINDS:
+        return None
+    side, inclusive = RANGE_KINDS[kind]
+    bound = (_bound_value(filter['left_side'], type), inclusive)
+    return (bound, None) if side == 'low' else (None, bound)
+
+
+def _step(value: Any, type: str, step: int) -> Any:
+    # the next (step 1) or previous (step -1) value of an integer or ISO date bound
+    if _is_number(type) and isinstance(value, int) and not isinstance(value, bool):
+        return value + step
+    if not _is_number(type) and isinstance(value, str) and len(value) == 10:
+        return (datetime.date.fromisoformat(value) + datetime.timedelta(days=step)).isoformat()
+    raise ValueError(f"Cannot make the exclusive bound {value!r} inclusive; only integer and ISO date bounds can be.")
+
+
+def range_filter(low: Bound, high: Bound, type: str = 'number') -> dict:
+    """
+    Build the range filter matching values between the bounds.
+    Args:
+        low (Tuple[Any, bool], optional): The lower bound and whether it is included.
+        high (Tuple[Any, bool], optional): The upper bound and whether it is included.
+        type (str): 'number', or the date type of the field, e.g. 'date'. Defaults to 'number'.
+    Raises:
+        ValueError: If the bounds cannot be expressed by a single filter.
+    """
+    filter = {'type': type, 'is_negative': False}
+    if low is not None and high is not None:
+        # BETWEEN includes both sides
+        left = low[0] if low[1] else _step(low[0], type, 1)
+        right = high[0] if high[1] else _step(high[0], type, -1)
+        return {**filter, 'kind': 'BETWEEN', 'left_side': left, 'right_side': right}
+    if low is not None:
+        if _is_number(type):
+            return {**filter, 'kind': 'GREATER_THAN_OR_EQUAL' if low[1] else 'GREATER_THAN', 'left_side': low[0]}
+        return {**filter, 'kind': 'ON_OR_AFTER', 'left_side': low[0] if low[1] else _step(low[0], type, 1)}
+    if high is not None:
+        if _is_number(type):
+            return {**filter, 'kind': 'LESS_THAN_OR_EQUAL' if high[1] else 'LESS_THAN', 'left_side': high[0]}
+        return {**filter, 'kind': 'BEFORE', 'left_side': _step(high[0], type, 1) if high[1] else high[0]}
+    raise ValueError("A range filter needs a lower or an upper bound.")
+
+
+def _tighter(first: Bound, second: Bound, side: str) -> Bound:
+    if first is None or second is None:
+        return first or second
+    if first[0] == second[0]:
+        return first if not first[1] else second
+    higher = first if first[0] > second[0] else second
+    return higher if side == 'low' else (second if higher is first else first)
+
+
+def _intersect_ranges(existing: dict, added: dict) -> Optional[dict]:
+    (existing_low, existing_high), (added_low, added_high) = _range_bounds(existing), _range_bounds(added)
+    try:
+        low = _tighter(existing_low, added_low, 'low')
+        high = _tighter(existing_high, added_high, 'high')
+        if low is not None and high is not None and (low[0] > high[0] or (low[0] == high[0] and not (low[1] and high[1]))):
+            return None
+    except TypeError:
+        raise ValueError(f"Cannot compare the bounds of the {existing.get('kind')} and {added.get('kind')} filters.")
+    return range_filter(low, high, added.get('type') or existing.get('type') or 'number')
+
+
+def combine_filters(existing: dict, added: dict) -> Optional[dict]:
+    """
+    Combine a query's filter with a partition filter on the same field, so the result
+    only matches rows matching both.
+    Args:
+        existing (dict): The query's filter.
+        added (dict): The partition's filter.
+    Returns:
+        Optional[dict]: The combined filter, or None if no value can match both.
+    Raises:
+        ValueError: If the filters cannot be combined. EQUALS filters (negated or not)
+            are combined with each other and range filters (BETWEEN, ON_OR_AFTER, BEFORE,
+            GREATER_THAN, ...) with each other; any other pair must be identical.
+    """
+    if existing == added:
+        return added
+    if _range_bounds(existing) is not None and _range_bounds(added) is not None:
+        return _intersect_ranges(existing, added)
+    if existing.get('kind') != 'EQUALS' or added.get('kind') != 'EQUALS':
+        raise ValueError(
+            f"Cannot combine a {added.get('kind')} partition with the query's {existing.get('kind')} filter "
+            "on the same field; partition on another field or remove the filter."
+        )
+    existing_values, added_values = existing.get('values') or [], added.get('values') or []
+    if existing.get('is_negative') and added.get('is_negative'):
+        return {**added, 'values': list(dict.fromkeys(existing_values + added_values))}
+    if existing.get('is_negative'):
+        values = [value for value in added_values if value not in existing_values]
+    elif added.get('is_negative'):
+        values = [value for value in existing_values if value not in added_values]
+    else:
+        values = [value for value in added_values if value in existing_values]
+    return {**added, 'values': values, 'is_negative': False} if values else None
+
+
+def partition_body(body: dict, partition: Dict[str, dict]) -> Optional[dict]:
+    """
+    Return a copy of the query body with the partition's filters applied, combined
+    with the query's filters on the same fields.
+    Args:
+        body (dict): The query body, with or without the top level "query" key.
+        partition (Dict[str, dict]): Filters keyed by field name.
+    Returns:
+        Optional[dict]: A new query body, or None if the partition cannot match any row
+            of the query. The original is not modified.
+    Raises:
+        ValueError: If a partition filter cannot be combined with the query's filter.
+    """
+    body = copy.deepcopy(body)
+    query = body.get('query', body)
+    filters = dict(query.get('filters') or {})
+    for field, added in partition.items():
+        combined = combine_filters(filters[field], added) if field in filters else added
+        if combined is None:
+            return None
+        filters[field] = combined
+    query['filters'] = filters
+    return body
+
+
+def equals_filter(values: Sequence[Any], type: str = 'string') -> dict:
+    """
+    Build an EQUALS filter matching any of the values.
+    """
+    return {'kind': 'EQUALS', 'type': type, 'values': list(values), 'is_negative': False}
+
+
+def on_or_after_filter(value: str, type: str = 'date') -> dict:
+    """
+    Build a filter matching values on or after a date or timestamp given in ISO format.
+    """
+    return range_filter((value, True), None, type)
+
+
+def _spans(low: int, high: int, partitions: int) -> List[Tuple[int, int]]:
+    # split [low, high] into at most `partitions` inclusive spans of roughly equal width
+    width = high - low + 1
+    partitions = max(1, min(partitions, width))
+    size, extra = divmod(width, partitions)
+    spans, start = [], low
+    for i in range(partitions):
+        end = start + size + (1 if i < extra else 0)
+        spans.append((start, end - 1))
+        start = end
+    return spans
+
+
+def range_partitions(field: str, low: int, high: int, partitions: int, include_others: bool = True) -> List[Dict[str, dict]]:
+    """
+    Split an integer range of a numeric field into partitions of roughly equal width.
+    Rows where the field is null are in no partition.
+    Args:
+        field (str): The field to partition on, e.g. "order_items.id".
+        low (int): The lowest value of the first partition.
+        high (int): The highest value of the last partition.
+        partitions (int): The number of range partitions.
+        include_others (bool): Add partitions for the values below `low` and above `high`,
+            so rows outside the range are not lost. Defaults to True.
+    Returns:
+        List[Dict[str, dict]]: The partitions, usable with `OmniAPI.run_query_partitioned`.
+    """
+    result = [{field: range_filter((start, True), (end, True))} for start, end in _spans(low, high, partitions)] if low <= high else []
+    if include_others:
+        result.insert(0, {field: range_filter(None, (low, False))})
+        result.append({field: range_filter((high, False), None)})
+    return result
+
+
+def date_partitions(field: str, start: Union[str, datetime.date], end: Union[str, datetime.date], partitions: int, type: str = 'date', include_others: bool = True) -> List[Dict[str, dict]]:
+    """
+    Split the days from `start` to `end` (both included) into date windows of roughly
+    equal length. Partition on the [date] timeframe of a dimension. Rows where the field
+    is null are in no partition.
+    Args:
+        field (str): The date dimension to partition on, e.g. "order_items.created_at[date]".
+        start (str | date): The first day of the first window, as a date or in ISO format.
+        end (str | date): The last day of the last window, as a date or in ISO format.
+        partitions (int): The number of date windows.
+        type (str): The filter type of the dimension. Defaults to 'date'.
+        include_others (bool): Add partitions for the days before `start` and after `end`,
+            so rows outside the range are not lost. Defaults to True.
+    Returns:
+        List[Dict[str, dict]]: The partitions, usable with `OmniAPI.run_query_partitioned`.
+    """
+    start, end = (datetime.date.fromisoformat(day) if isinstance(day, str) else day for day in (start, end))
+    day = lambda ordinal: datetime.date.fromordinal(ordinal).isoformat()
+    spans = _spans(start.toordinal(), end.toordinal(), partitions) if start <= end else []
+    result = [{field: range_filter((day(first), True), (day(last), True), type)} for first, last in spans]
+    if include_others:
+        result.insert(0, {field: range_filter(None, (start.isoformat(), False), type)})
+        result.append({field: range_filter((end.isoformat(), False), None, type)})
+    return result
+
+
+def sort_table(table: pa.Table, body: dict) -> pa.Table:
+    """
+    Sort a table by the sorts of a query body, skipping sorts on columns the table does not have.
+    """
+    query = body.get('query', body)
+    keys = [
+        (sort['column_name'], 'descending' if sort.get('sort_descending') else 'ascending')
+        for sort in query.get('sorts') or [] if sort.get('column_name') in table.column_names
+    ]
+    return table.sort_by(keys) if keys else table
+
+
+def value_partitions(field: str, values: Sequence[Any], partitions: int, type: str = 'string', include_others: bool = True) -> List[Dict[str, dict]]:
+    """
+    Split the known values of a dimension into partitions of roughly equal size.
+    Args:
+        field (str): The dimension to partition on, e.g. "order_items.status".
+        values (Sequence[Any]): The distinct values of the dimension.
+        partitions (int): The number of value partitions.
+        type (str): The filter type of the dimension. Defaults to 'string'.
+        include_others (bool): Add a final partition excluding every listed value, so rows
+            with values that are not listed are not lost. Defaults to True.
+    Returns:
+        List[Dict[str, dict]]: The partitions, usable with `OmniAPI.run_query_partitioned`.
+    """
+    values = list(values)
+    partitions = max(1, min(partitions, len(values)))
+    size, extra = divmod(len(values), partitions)
+    result, start = [], 0
+    for i in range(partitions):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            result.append({field: equals_filter(values[start:end], type)})
+        start = end
+    if include_others:
+        result.append({field: {**equals_filter(values, type), 'is_negative': True}})
+    return result
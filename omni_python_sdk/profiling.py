@@ -0,0 +1,151 @@
+import collections
+import contextlib
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+# Opt-in profiling of the SDK's hot paths. OmniAPI times its phases (HTTP wait, body read,
+# JSON serialization, NDJSON parse, base64 and Arrow decode, pagination) with a Profiler;
+# phases can nest, e.g. the pagination loop includes the HTTP calls it makes.
+# Profiling is enabled with OmniAPI(profile=True) or the OMNI_SDK_PROFILE=1 environment variable.
+
+PROFILE_ENV = 'OMNI_SDK_PROFILE'
+
+
+def profile_from_env() -> bool:
+    return os.getenv(PROFILE_ENV, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class Profiler:
+    """
+    Accumulates the wall and CPU time of named phases across threads.
+    Example Use:
+        api = OmniAPI(api_key, base_url, profile=True)
+        api.run_query_blocking(query)
+        print(api.profiler.format())
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._stats: Dict[str, List[float]] = collections.defaultdict(lambda: [0, 0.0, 0.0])
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            with self._lock:
+                stats = self._stats[name]
+                stats[0] += 1
+                stats[1] += wall
+                stats[2] += cpu
+
+    def phase(self, name: str):
+        """
+        Context manager timing a phase. Does nothing when the profiler is disabled.
+        """
+        return self._timed(name) if self.enabled else contextlib.nullcontext()
+
+    def report(self) -> Dict[str, dict]:
+        """
+        Return the calls, wall seconds and CPU seconds of every phase, slowest first.
+        """
+        with self._lock:
+            stats = sorted(self._stats.items(), key=lambda item: item[1][1], reverse=True)
+        return {name: {'calls': calls, 'wall': wall, 'cpu': cpu} for name, (calls, wall, cpu) in stats}
+
+    def format(self) -> str:
+        lines = [f"{'phase':<16} {'calls':>7} {'wall s':>10} {'cpu s':>10}"]
+        for name, stats in self.report().items():
+            lines.append(f"{name:<16} {stats['calls']:>7} {stats['wall']:>10.4f} {stats['cpu']:>10.4f}")
+        return '\n'.join(lines)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def sample(self, interval: float = 0.005, all_threads: bool = True) -> 'SamplingProfiler':
+        """
+        Sampling profiler for a block of calls, usable whether or not phases are timed.
+        Example Use:
+            with api.profiler.sample() as sampler:
+                api.get_all_groups()
+            sampler.write('groups.collapsed')  # flamegraph.pl groups.collapsed > groups.svg
+        """
+        return SamplingProfiler(interval, all_threads)
+
+
+NULL_PROFILER = Profiler(enabled=False)
+
+
+class SamplingProfiler:
+    """
+    Samples the Python stacks of running threads from a background thread and counts
+    them in the collapsed-stack format read by flamegraph.pl, speedscope and similar tools.
+    """
+
+    def __init__(self, interval: float = 0.005, all_threads: bool = True):
+        """
+        Args:
+            interval (float): Seconds between samples. Defaults to 0.005.
+            all_threads (bool): Sample every thread, otherwise only the thread that started
+                sampling. Defaults to True.
+        """
+        self.interval = interval
+        self.all_threads = all_threads
+        self.stacks: Dict[str, int] = collections.Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._target: Optional[int] = None
+
+    def __enter__(self) -> 'SamplingProfiler':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self) -> None:
+        self._target = None if self.all_threads else threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='omni-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            names.update((thread.ident, thread.name) for thread in threading.enumerate())
+            for ident, frame in sys._current_frames().items():
+                if ident == own or (self._target is not None and ident != self._target):
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                frames.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(frames))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """
+        Return the samples as collapsed stacks, one `frame;frame;frame count` line per stack.
+        """
+        return ''.join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def write(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.collapsed())
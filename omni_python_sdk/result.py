@@ -0,0 +1,175 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Dict, List, Optional
+from .optimize import optimize_table
+
+# Arrow types to cast to for the data types reported in a result's field metadata,
+# NUMBER columns are cast by `_number_type`
+DATA_TYPE_CASTS = {
+    'TIMESTAMP': pa.timestamp('us'),
+    'BOOLEAN': pa.bool_(),
+}
+# the largest decimal precision that always fits an int64
+INT64_DECIMAL_PRECISION = 18
+
+
+class QueryResult:
+    """
+    The result of a query as an Arrow table together with the field metadata from
+    the result summary.
+
+    Column selection, renaming and casting return new QueryResults that share the
+    underlying Arrow buffers. Conversions to pandas, polars or numpy only happen
+    when asked for.
+    Example Use:
+        result = api.run_query(query, labels=True)
+        df = result.to_pandas()
+    """
+
+    def __init__(self, table: pa.Table, fields: Dict[str, dict]):
+        """
+        Args:
+            table (pa.Table): The result table, with one column per field name.
+            fields (Dict[str, dict]): The `summary.fields` metadata keyed by field name.
+        """
+        self.table = table
+        self.fields = fields
+        # bytes saved per column by `optimize`
+        self.savings: Dict[str, dict] = {}
+
+    @staticmethod
+    def query_fields(body: dict) -> List[str]:
+        """
+        Get the requested field names from a query body, with or without the top level "query" key.
+        """
+        return body.get('query', body).get('fields', [])
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def __repr__(self) -> str:
+        return f"QueryResult({self.table.num_rows} rows, columns={self.table.column_names})"
+
+    @property
+    def column_names(self) -> List[str]:
+        return self.table.column_names
+
+    def select(self, columns: List[str]) -> 'QueryResult':
+        """
+        Select and order columns. Columns missing from the table are skipped, and an
+        empty selection keeps the table as is.
+        """
+        names = set(self.table.column_names)
+        columns = [column for column in columns if column in names]
+        if not columns or columns == self.table.column_names:
+            return self
+        return QueryResult(self.table.select(columns), self.fields)
+
+    def with_labels(self) -> 'QueryResult':
+        """
+        Rename columns to the labels from the field metadata, keeping the field
+        metadata available under the new names.
+        """
+        labels = [self.fields.get(name, {}).get('label') or name for name in self.table.column_names]
+        fields = {label: self.fields[name] for name, label in zip(self.table.column_names, labels) if name in self.fields}
+        return QueryResult(self.table.rename_columns(labels), fields)
+
+    def cast_types(self) -> 'QueryResult':
+        """
+        Cast columns whose Arrow type does not match the data type in the field metadata,
+        e.g. numeric strings to numbers, whole decimals to int64 and timestamp strings to
+        timestamps. Numbers stay exact: numeric strings become int64 or a decimal, and only
+        strings no decimal can hold (NaN, inf, more than 38 digits) become float64.
+        Columns that cannot be cast safely are left unchanged.
+        """
+        table = self.table
+        for i, name in enumerate(table.column_names):
+            data_type = self.fields.get(name, {}).get('data_type')
+            column = table.column(i)
+            if data_type == 'NUMBER':
+                cast = self._cast_number(column)
+            else:
+                target = DATA_TYPE_CASTS.get(data_type)
+                cast = self._cast(column, target) if target is not None and self._is_string(column.type) else None
+            if cast is not None:
+                table = table.set_column(i, name, cast)
+        return self if table is self.table else QueryResult(table, self.fields)
+
+    @staticmethod
+    def _is_string(type: pa.DataType) -> bool:
+        return pa.types.is_string(type) or pa.types.is_large_string(type)
+
+    @staticmethod
+    def _cast(column: pa.ChunkedArray, target: pa.DataType) -> Optional[pa.ChunkedArray]:
+        try:
+            return pc.cast(column, target)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            return None
+
+    @classmethod
+    def _cast_number(cls, column: pa.ChunkedArray) -> Optional[pa.ChunkedArray]:
+        type = column.type
+        if pa.types.is_decimal(type):
+            # whole decimals that fit become int64, other decimals are already exact
+            if type.scale == 0 and type.precision <= INT64_DECIMAL_PRECISION:
+                return cls._cast(column, pa.int64())
+            return None
+        if not cls._is_string(type):
+            return None
+        integers = cls._cast(column, pa.int64())
+        if integers is not None:
+            return integers
+        # the scale is the most digits after a decimal point in the column
+        fractions = pc.replace_substring_regex(column, r'^[^.]*\.?', '')
+        scale = pc.max(pc.utf8_length(fractions)).as_py() or 0
+        decimals = cls._cast(column, pa.decimal128(38, scale)) if scale < 38 else None
+        return decimals if decimals is not None else cls._cast(column, pa.float64())
+
+    def optimize(self, max_cardinality: float = 0.5) -> 'QueryResult':
+        """
+        Reduce memory use without changing any value: dictionary-encode repeated dimension
+        strings, downcast numbers and parse timestamp strings. The returned result's
+        `savings` maps each changed column to its old and new type and the bytes saved.
+        Args:
+            max_cardinality (float): Dictionary-encode strings with at most this ratio of
+                distinct values to rows. Defaults to 0.5.
+        """
+        table, savings = optimize_table(self.table, self.fields, max_cardinality)
+        if not savings:
+            return self
+        result = QueryResult(table, self.fields)
+        result.savings = savings
+        return result
+
+    def to_arrow(self) -> pa.Table:
+        return self.table
+
+    def to_pandas(self, **kwargs):
+        """
+        Convert to a pandas DataFrame. Keyword arguments are passed to `pa.Table.to_pandas`.
+        """
+        return self.table.to_pandas(**kwargs)
+
+    def to_polars(self):
+        """
+        Convert to a polars DataFrame. Requires the optional `polars` package.
+        """
+        import polars as pl
+        return pl.from_arrow(self.table)
+
+    def to_numpy(self, zero_copy_only: bool = False) -> Dict[str, 'numpy.ndarray']:
+        """
+        Convert to a dictionary of numpy arrays keyed by column name.
+        Args:
+            zero_copy_only (bool): Raise instead of copying columns that cannot be viewed
+                without a copy (e.g. with nulls or several chunks). Defaults to False.
+        """
+        result = {}
+        for name, column in zip(self.table.column_names, self.table.columns):
+            if not zero_copy_only:
+                result[name] = column.to_numpy()
+            elif column.num_chunks == 1:
+                result[name] = column.chunk(0).to_numpy(zero_copy_only=True)
+            else:
+                raise pa.ArrowInvalid(f"Column '{name}' has {column.num_chunks} chunks and cannot be viewed without a copy")
+        return result
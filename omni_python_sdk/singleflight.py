@@ -0,0 +1,140 @@
+import asyncio
+import copy
+import functools
+import inspect
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# Coalescing of identical in-flight calls. The first caller of a key runs the call and
+# every caller that arrives while it is running waits for the same result (or error)
+# instead of sending its own request. Nothing is cached once the call has finished.
+# When a call was shared, every caller gets its own copy of mutable results (see
+# `private_copy`), so one caller editing its result cannot affect another.
+
+
+def private_copy(value: Any) -> Any:
+    """
+    Copy of a result for one caller: dicts and lists are deep copied, tuples are copied
+    item by item and anything else (Arrow tables, responses) is shared as is.
+    """
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    if isinstance(value, tuple):
+        return tuple(private_copy(item) for item in value)
+    return value
+
+
+class SingleFlight:
+    """
+    Table of in-flight calls shared by threads and asyncio tasks.
+    Example Use:
+        flight = SingleFlight()
+        group = flight.do(('get_group', group_id), api.get_group, group_id)
+        print(flight.calls, flight.coalesced)
+    """
+
+    def __init__(self, copy_result: Callable[[Any], Any] = private_copy):
+        """
+        Args:
+            copy_result (Callable): Makes each caller's copy of a shared result.
+        """
+        self.copy_result = copy_result
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        # number of calls made through the table, and how many of them joined another call
+        self.calls = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            self.calls += 1
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                future.shared = True
+                return future, False
+            future = Future()
+            future.shared = False
+            # waiters give up on their own, they never cancel the shared call
+            future.set_running_or_notify_cancel()
+            self._calls[key] = future
+            return future, True
+
+    def _run(self, key: Hashable, future: Future, fn: Callable[[], Any]) -> None:
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key)
+            future.set_exception(e)
+        else:
+            self._finish(key)
+            future.set_result(result)
+
+    def _finish(self, key: Hashable) -> None:
+        with self._lock:
+            del self._calls[key]
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Call `fn(*args, **kwargs)` unless a call with the same key is in flight, in which
+        case wait for that call's result. Exceptions are raised to every waiter.
+        """
+        future, leader = self._join(key)
+        if leader:
+            self._run(key, future, functools.partial(fn, *args, **kwargs))
+        return self._result(future, future.result())
+
+    def _result(self, future: Future, result: Any) -> Any:
+        # the waiters are known once the call has finished
+        return self.copy_result(result) if future.shared else result
+
+    async def do_async(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Asyncio variant of `do` for blocking functions. The first caller runs `fn` in the
+        loop's default executor; calls from threads and tasks coalesce with each other.
+        Cancelling a waiting task does not cancel the shared call.
+        """
+        future, leader = self._join(key)
+        if leader:
+            loop = asyncio.get_running_loop()
+            loop.run_in_executor(None, self._run, key, future, functools.partial(fn, *args, **kwargs))
+        result = await asyncio.shield(asyncio.wrap_future(future))
+        return self._result(future, result)
+
+
+def coalesced(func: Callable) -> Callable:
+    """
+    Decorator for methods of objects with a `flight` attribute holding a SingleFlight, or
+    None to disable coalescing. Calls are keyed by the method name and its arguments, with
+    defaults applied and dict arguments compared by their JSON representation.
+    The decorated method gets a `run_async(self, *args, **kwargs)` coroutine function that
+    runs it in the default executor, coalescing with calls from threads.
+    """
+    signature = inspect.signature(func)
+
+    def key(self, args, kwargs) -> Tuple[str, str]:
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = list(bound.arguments.values())[1:]
+        return func.__name__, json.dumps(arguments, sort_keys=True, default=str)
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self.flight is None:
+            return func(self, *args, **kwargs)
+        return self.flight.do(key(self, args, kwargs), func, self, *args, **kwargs)
+
+    async def run_async(self, *args, **kwargs):
+        if self.flight is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, functools.partial(func, self, *args, **kwargs))
+        return await self.flight.do_async(key(self, args, kwargs), func, self, *args, **kwargs)
+
+    wrapper.run_async = run_async
+    return wrapper
@@ -0,0 +1,299 @@
+import abc
+import collections
+import hashlib
+import json as jsonlib
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, Union
+from .profiling import NULL_PROFILER, Profiler
+
+# HTTP transports used by OmniAPI. A transport sends one request and returns a response
+# object with `status_code`, `text`, `content`, `headers`, `json()` and `raise_for_status()`,
+# which `requests.Response` and `httpx.Response` both provide.
+
+
+class Transport(abc.ABC):
+    """
+    Base class of the transports. Subclasses implement `request`, and `close` when they
+    hold connections or files.
+    """
+
+    # transports time the 'http_wait', 'body_read' and 'json_serialize' phases with it,
+    # see `set_profiler`
+    profiler: Profiler = NULL_PROFILER
+
+    def set_profiler(self, profiler: Profiler) -> None:
+        """
+        Time this transport's phases with the profiler. OmniAPI sets its own when profiling.
+        """
+        self.profiler = profiler
+
+    def _serialize(self, headers: Optional[Dict[str, str]], json: Any) -> Tuple[Optional[Dict[str, str]], Optional[bytes]]:
+        """
+        Serialize a JSON body the way requests does, timing it as its own phase.
+        """
+        if json is None:
+            return headers, None
+        with self.profiler.phase('json_serialize'):
+            data = jsonlib.dumps(json, allow_nan=False).encode('utf-8')
+        headers = dict(headers or {})
+        headers.setdefault('Content-Type', 'application/json')
+        return headers, data
+
+    @abc.abstractmethod
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, params: Optional[dict] = None, json: Any = None, timeout: Optional[float] = None):
+        """
+        Send a request and return the response.
+        """
+
+    def get(self, url: str, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url: str, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RequestsTransport(Transport):
+    """
+    HTTP/1.1 transport over a `requests.Session` with a pool of keep-alive connections.
+    Every concurrent request needs a connection of its own.
+    """
+
+    def __init__(self, pool_maxsize: int = 10):
+        """
+        Args:
+            pool_maxsize (int): Connections kept open per host. Defaults to 10.
+        """
+        self.pool_maxsize = pool_maxsize
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, params: Optional[dict] = None, json: Any = None, timeout: Optional[float] = None) -> requests.Response:
+        if not self.profiler.enabled:
+            return self.session.request(method, url, headers=headers, params=params, json=json, timeout=timeout, allow_redirects=method != 'HEAD')
+        headers, data = self._serialize(headers, json)
+        with self.profiler.phase('http_wait'):
+            response = self.session.request(method, url, headers=headers, params=params, data=data, timeout=timeout, allow_redirects=method != 'HEAD', stream=True)
+        with self.profiler.phase('body_read'):
+            response.content
+        return response
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class HTTP2Transport(Transport):
+    """
+    HTTP/2 transport over an `httpx.Client`, multiplexing concurrent requests as streams
+    over a few connections. Requires the optional `httpx[http2]` dependency:
+        pip install omni_python_sdk[http2]
+    Example Use:
+        api = OmniAPI(api_key, base_url, transport=HTTP2Transport())
+    """
+
+    def __init__(self, max_connections: int = 4, timeout: Optional[float] = None, prior_knowledge: bool = False):
+        """
+        Args:
+            max_connections (int): Connections opened per host. Each carries many concurrent
+                streams, as many as the server allows. Defaults to 4.
+            timeout (float, optional): Default timeout in seconds, no timeout by default.
+            prior_knowledge (bool): Speak HTTP/2 without negotiation, needed for plain
+                http:// servers (h2c). HTTPS servers negotiate HTTP/2 with ALPN. Defaults to False.
+        """
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError("HTTP2Transport requires httpx with HTTP/2 support: pip install omni_python_sdk[http2]") from e
+        self.max_connections = max_connections
+        self.client = httpx.Client(
+            http1=not prior_knowledge,
+            http2=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout,
+        )
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, params: Optional[dict] = None, json: Any = None, timeout: Optional[float] = None):
+        kwargs = {'timeout': timeout} if timeout is not None else {}
+        if isinstance(params, dict):
+            # encode query parameters like requests does: skip None and keep Python's bool spelling
+            params = {key: str(value) if isinstance(value, bool) else value for key, value in params.items() if value is not None}
+        if not self.profiler.enabled:
+            return self.client.request(method, url, headers=headers, params=params, json=json, follow_redirects=method != 'HEAD', **kwargs)
+        headers, data = self._serialize(headers, json)
+        request = self.client.build_request(method, url, headers=headers, params=params, content=data, **kwargs)
+        with self.profiler.phase('http_wait'):
+            response = self.client.send(request, follow_redirects=method != 'HEAD', stream=True)
+        with self.profiler.phase('body_read'):
+            try:
+                response.read()
+            finally:
+                response.close()
+        return response
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class TransportResponse:
+    """
+    Response served by the ReplayTransport, with the parts of `requests.Response` the SDK uses.
+    """
+
+    def __init__(self, status_code: int, content: bytes, headers: Optional[Dict[str, str]] = None, url: str = ''):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.url = url
+        self._text = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.content.decode('utf-8')
+        return self._text
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self, **kwargs) -> Any:
+        return jsonlib.loads(self.content, **kwargs)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+def request_key(method: str, url: str, params: Optional[dict] = None, json: Any = None) -> Tuple[str, str, str, Optional[str]]:
+    """
+    Key identifying a request in a cassette. The JSON body is reduced to the sha256 of its
+    canonical form, so request bodies (which may hold secrets) are not written to cassettes.
+    """
+    params = jsonlib.dumps({k: v for k, v in params.items() if v is not None} if isinstance(params, dict) else params, sort_keys=True, default=str)
+    body = None
+    if json is not None:
+        body = hashlib.sha256(jsonlib.dumps(json, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')).hexdigest()
+    return method, url, params, body
+
+
+class RecordingTransport(Transport):
+    """
+    Sends requests through another transport and appends every request/response pair
+    to a JSONL cassette for the ReplayTransport. Request headers, which carry the API
+    key, are not recorded.
+    Example Use:
+        with OmniAPI(api_key, base_url, transport=RecordingTransport(RequestsTransport(), 'omni.jsonl')) as api:
+            api.get_all_groups()
+    """
+
+    def __init__(self, transport: Transport, path: str):
+        """
+        Args:
+            transport (Transport): The transport that sends the requests.
+            path (str): The cassette file, appended to if it exists.
+        """
+        self.transport = transport
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, params: Optional[dict] = None, json: Any = None, timeout: Optional[float] = None):
+        start = time.perf_counter()
+        with self.profiler.phase('http_wait'):
+            response = self.transport.request(method, url, headers=headers, params=params, json=json, timeout=timeout)
+        elapsed = time.perf_counter() - start
+        method, url, params, body = request_key(method, url, params, json)
+        entry = {
+            'request': {'method': method, 'url': url, 'params': params, 'body_sha256': body},
+            'response': {
+                'status_code': response.status_code,
+                'headers': {'Content-Type': response.headers.get('Content-Type', '')},
+                'text': response.content.decode('utf-8'),
+                'elapsed': round(elapsed, 6),
+            },
+        }
+        line = jsonlib.dumps(entry) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Serves the responses of a cassette written by the RecordingTransport from memory.
+    Responses to the same request are served in recorded order and the last one is
+    repeated once they run out, so polling replays as recorded.
+    Example Use:
+        api = OmniAPI('key', base_url, transport=ReplayTransport('omni.jsonl'))
+    """
+
+    def __init__(self, path: str, latency: Union[float, str, Callable[[dict], float]] = 0.0):
+        """
+        Args:
+            path (str): The cassette file.
+            latency: Delay added to every response: seconds as a float, 'recorded' to replay
+                the recorded response times, or a function of the cassette response entry.
+                Defaults to 0.
+        Raises:
+            KeyError: From `request`, when a request is not in the cassette.
+        """
+        self._responses: Dict[Tuple, Deque[dict]] = collections.defaultdict(collections.deque)
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = jsonlib.loads(line)
+                    request = entry['request']
+                    key = (request['method'], request['url'], request['params'], request['body_sha256'])
+                    response = entry['response']
+                    response['content'] = response['text'].encode('utf-8')
+                    self._responses[key].append(response)
+        if latency == 'recorded':
+            self._latency = lambda response: response.get('elapsed', 0.0)
+        elif callable(latency):
+            self._latency = latency
+        else:
+            self._latency = lambda response: latency
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, params: Optional[dict] = None, json: Any = None, timeout: Optional[float] = None) -> TransportResponse:
+        key = request_key(method, url, params, json)
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise KeyError(f"No recorded response for {method} {url}")
+            response = responses.popleft() if len(responses) > 1 else responses[0]
+            self.requests += 1
+        delay = self._latency(response)
+        if delay:
+            with self.profiler.phase('http_wait'):
+                time.sleep(delay)
+        return TransportResponse(response['status_code'], response['content'], response['headers'], url)
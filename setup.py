@@ -16,6 +16,13 @@ setup(
 		'ndjson',
 		'dotenv'
 	],
+	extras_require={
+		'http2': ['httpx[http2]'],
+		'local': ['duckdb'],
+	},
+	entry_points={
+		'console_scripts': ['omni-sdk=omni_python_sdk.cli:main'],
+	},
 	classifiers=[
 		'Programming Language :: Python :: 3',
 		'License :: OSI Approved :: MIT License',